@@ -0,0 +1,456 @@
+"""
+Galaga benchmarks
+Runs the game headless and reports how the engine performs.
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import pygame
+from game.headless import HeadlessRunner, KeyScript
+from game.batch import BatchRunner
+from game.stress import StressScenario, StressSweep
+from game.benchmarks import BulletSweep, ProjectileSweep, SpectatorSweep, StateSweep, EnvSweep, GovernorSweep, SoakRun
+from game.enemy_fire import EnemyFireController
+from game.playfield import Playfield
+from game.assets import AssetManager
+from game.game_engine import GameRenderer
+from game.animation import Animator
+from game.recorder import FrameRecorder
+from game.weapon import WEAPONS
+from game import settings
+
+
+def print_results(results: dict) -> None:
+    """
+    Prints benchmark results one per line.
+    :param results: benchmark results.
+    :return: None.
+    """
+    for key, value in results.items():
+        if isinstance(value, float):
+            print(f'{key:>24}: {value:.3f}')
+        else:
+            print(f'{key:>24}: {value}')
+
+
+def print_row(row: dict, label: str = None) -> None:
+    """
+    Prints benchmark results on one line, as key and value pairs.
+    :param row: benchmark results.
+    :param label: text printed before the results, right-aligned like print_results() keys.
+    :return: None.
+    """
+    text = '  '.join(f'{key} {value:.3f}' if isinstance(value, float) else f'{key} {value}' for key, value in row.items())
+    print(text if label is None else f'{label:>24}: {text}')
+
+
+def print_phases(summary: dict) -> None:
+    """
+    Prints frame profiler statistics one phase per line.
+    :param summary: statistics by phase.
+    :return: None.
+    """
+    for phase, stats in summary.items():
+        print_row(stats, phase)
+
+
+def run_headless(args: argparse.Namespace) -> None:
+    """
+    Runs the uncapped headless throughput benchmark.
+    :param args: command line arguments.
+    :return: None.
+    """
+    runner = HeadlessRunner(args.army, render=args.render, dirty_rects=args.dirty_rects, seed=args.seed,
+                            profile=args.profile)
+    print_results(runner.run(args.ticks, KeyScript(args.script, args.seed)))
+    if runner.profiler:
+        print_phases(runner.profiler.summary())
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    """
+    Runs many seeded headless games across worker processes.
+    :param args: command line arguments.
+    :return: None.
+    """
+    runner = BatchRunner(args.workers)
+    print_results(runner.run(args.games, args.army, args.ticks, args.script, args.seed))
+
+
+def run_sweep(args: argparse.Namespace) -> None:
+    """
+    Measures tick time against the number of enemies.
+    :param args: command line arguments.
+    :return: None.
+    """
+    Animator().enabled = not args.no_animation
+    sweep = StressSweep(args.formation, Playfield(args.width, args.height), args.ticks, args.render,
+                        collision_filtering=not args.no_filtering, spatial_hash=not args.no_spatial_hash)
+    rows = []
+    for enemies in args.counts:
+        rows.append(sweep.measure(enemies))
+        print_row(rows[-1])
+    if args.out:
+        sweep.export(rows, args.out)
+
+
+def run_bullets(args: argparse.Namespace) -> None:
+    """
+    Measures tick time against the number of enemy bullets.
+    :param args: command line arguments.
+    :return: None.
+    """
+    for backend in args.backends:
+        sweep = BulletSweep(backend, args.ticks, args.render)
+        for bullets in args.counts:
+            row = sweep.measure(bullets)
+            print_row(row)
+
+
+def run_projectiles(args: argparse.Namespace) -> None:
+    """
+    Measures tick time with pymunk and kinematic projectiles for every weapon.
+    :param args: command line arguments.
+    :return: None.
+    """
+    sweep = ProjectileSweep(args.enemies, args.ticks, args.render)
+    for weapon in args.weapons:
+        for backend in args.backends:
+            row = sweep.measure(weapon, backend)
+            print_row(row)
+
+
+def run_server(args: argparse.Namespace) -> None:
+    """
+    Measures server tick time and bytes per tick against the number of spectators.
+    :param args: command line arguments.
+    :return: None.
+    """
+    sweep = SpectatorSweep(args.ticks, args.army)
+    rows = []
+    for spectators in args.counts:
+        rows.append(sweep.measure(spectators))
+        print_row(rows[-1])
+    if len(rows) > 1:
+        print(f'About {SpectatorSweep.capacity(rows)} spectators per core at {settings.FRAMES_PER_SECOND} ticks/s')
+
+
+def run_state(args: argparse.Namespace) -> None:
+    """
+    Measures game state size and save and restore time against the number of enemies.
+    :param args: command line arguments.
+    :return: None.
+    """
+    sweep = StateSweep(args.repeats)
+    for enemies in args.counts:
+        row = sweep.measure(enemies)
+        print_row(row)
+
+
+def run_env(args: argparse.Namespace) -> None:
+    """
+    Measures vector environment steps per second against the number of games and worker processes.
+    :param args: command line arguments.
+    :return: None.
+    """
+    sweep = EnvSweep(args.steps, args.army)
+    for workers in args.workers:
+        for envs in args.counts:
+            row = sweep.measure(envs, workers)
+            print_row(row)
+
+
+def run_governor(args: argparse.Namespace) -> None:
+    """
+    Measures simulation speed and rendered frame rate under load with and without the frame governor.
+    :param args: command line arguments.
+    :return: None.
+    """
+    sweep = GovernorSweep(args.enemies, args.frames)
+    for row in sweep.run(args.loads):
+        print_row(row)
+
+
+def run_soak(args: argparse.Namespace) -> None:
+    """
+    Plays a long session and checks that the physics space and resident memory stay bounded.
+    Exits with status 1 if they do not.
+    :param args: command line arguments.
+    :return: None.
+    """
+    soak = SoakRun(args.ticks, args.sample, enemy_fire_backend=args.backend)
+    rows = soak.run(args.seed)
+    for row in rows:
+        print_row(row)
+    failures = soak.check(rows)
+    for failure in failures:
+        print(f'FAIL {failure}')
+    if failures:
+        sys.exit(1)
+    print(f'Soak run held for {args.ticks} ticks')
+
+
+def run_capture(args: argparse.Namespace) -> None:
+    """
+    Measures captured frames per second at full and reduced resolution, against saving every frame as a PNG.
+    :param args: command line arguments.
+    :return: None.
+    """
+    runner = HeadlessRunner(render=True)
+    runner.run(settings.ANIMATION_FRAME_TICKS, KeyScript('fire'))
+    renderer = runner.game_renderer
+
+    def frames_per_second(capture) -> float:
+        capture()
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            capture()
+        return args.frames / (time.perf_counter() - start)
+
+    print_row({
+        'mode': 'png', 'factor': 1,
+        'frames_per_second': frames_per_second(lambda: pygame.image.save(renderer.screen, io.BytesIO(), 'frame.png')),
+    })
+    for factor in args.factors:
+        for grayscale in (False, True):
+            frame = renderer.capture(factor, grayscale)
+            row = {
+                'mode': 'gray' if grayscale else 'rgb',
+                'factor': factor,
+                'shape': 'x'.join(map(str, frame.shape)),
+                'frames_per_second': frames_per_second(lambda: renderer.capture(factor, grayscale)),
+            }
+            print_row(row)
+
+
+def run_recorder(args: argparse.Namespace) -> None:
+    """
+    Measures the main-thread cost of recording every rendered frame, and the frames dropped.
+    Frames are paced at the frame rate unless uncapped.
+    :param args: command line arguments.
+    :return: None.
+    """
+    for frame_format in args.formats:
+        for policy in args.policies:
+            runner = HeadlessRunner(render=True)
+            runner.world.player.invulnerable = True
+            screen = runner.game_renderer.screen
+            with tempfile.TemporaryDirectory() as path:
+                recorder = FrameRecorder(path, screen.get_size(), frame_format, policy, factor=args.factor)
+                frame_time = 0.0 if args.uncapped else 1 / settings.FRAMES_PER_SECOND
+                start = time.perf_counter()
+
+                def capture(tick: int) -> None:
+                    recorder.capture(screen, runner.world.clock.ticks)
+                    # Leave the rest of the frame to the writer, like the capped game loop does
+                    remaining = start + (tick + 1) * frame_time - time.perf_counter()
+                    if remaining > 0:
+                        time.sleep(remaining)
+
+                runner.run(args.frames, KeyScript('strafe'), capture)
+                elapsed = time.perf_counter() - start
+                recorder.close()
+                row = {'format': frame_format, 'policy': policy, 'frames_per_second': args.frames / elapsed,
+                       **recorder.stats()}
+            print_row(row)
+
+
+def run_assets(args: argparse.Namespace) -> None:
+    """
+    Measures startup time and steady-state image loads.
+    :param args: command line arguments.
+    :return: None.
+    """
+    # Import time of the game package in a fresh interpreter
+    command = 'import time; start = time.perf_counter(); import game; print(time.perf_counter() - start)'
+    imports = [float(subprocess.run([sys.executable, '-c', command], capture_output=True, text=True).stdout.split()[-1])
+               for _ in range(args.repeat)]
+
+    runner = HeadlessRunner(render=True)
+    assets = AssetManager()
+    if args.preload:
+        assets.preload(GameRenderer.IMAGES)
+        assets.wait()
+
+    # First frame pays for whatever was not preloaded
+    start = time.perf_counter()
+    runner.run(1, KeyScript('fire'))
+    first_frame = time.perf_counter() - start
+    loads = assets.loads
+
+    # Steady state, including game over frames
+    runner.run(args.ticks, KeyScript('fire'))
+    for _ in range(args.ticks):
+        runner.game_renderer.render_game_over()
+
+    print_results({
+        'import_game_ms': min(imports) * 1000,
+        'first_frame_ms': first_frame * 1000,
+        'startup_loads': loads,
+        'steady_state_loads': assets.loads - loads,
+        **assets.stats(),
+    })
+
+
+def run_atlas(args: argparse.Namespace) -> None:
+    """
+    Measures the cold start of every sprite from PNG files against the texture atlas cache.
+    :param args: command line arguments.
+    :return: None.
+    """
+    setup = (f'import os, time; os.environ["SDL_VIDEODRIVER"] = "{settings.HEADLESS_VIDEO_DRIVER}"; import pygame; '
+             f'pygame.init(); pygame.display.set_mode(({settings.SCREEN_WIDTH}, {settings.SCREEN_HEIGHT})); '
+             'from game.game_engine import GameRenderer; from game.sprite_cache import SpriteCache; '
+             'from game.atlas import TextureAtlas; start = time.perf_counter(); ')
+    files = ('[SpriteCache().get(image, size) for image, size in GameRenderer.SPRITES]; '
+             '[animation.frames(size) for animation, size in GameRenderer.ANIMATIONS]; ')
+    atlas = 'SpriteCache().install(TextureAtlas.cached(GameRenderer.SPRITES, GameRenderer.ANIMATIONS)); '
+    done = 'print(time.perf_counter() - start)'
+
+    def cold_start(code: str) -> float:
+        return min(float(subprocess.run([sys.executable, '-c', setup + code + done],
+                                        capture_output=True, text=True).stdout.split()[-1])
+                   for _ in range(args.repeat))
+
+    # Without a cache file the atlas is built and saved first
+    path = settings.ATLAS_CACHE_PATH
+    built = cold_start(f'os.path.exists("{path}") and os.remove("{path}"); ' + atlas)
+    print_results({
+        'png_files_ms': cold_start(files) * 1000,
+        'atlas_build_ms': built * 1000,
+        'atlas_cached_ms': cold_start(atlas) * 1000,
+        'atlas_bytes': os.path.getsize(path),
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    headless = subparsers.add_parser('headless', help='uncapped-tick throughput benchmark')
+    headless.add_argument('--army', type=int, default=settings.HARD, help='number of files in the enemy army')
+    headless.add_argument('--ticks', type=int, default=settings.BENCHMARK_TICKS, help='maximum number of ticks')
+    headless.add_argument('--script', choices=KeyScript.NAMES, default='strafe', help='scripted player input')
+    headless.add_argument('--render', action='store_true', help='also render every tick to the dummy display')
+    headless.add_argument('--dirty-rects', action='store_true', help='render with dirty-rect updates')
+    headless.add_argument('--seed', type=int, default=0, help='seed of the game')
+    headless.add_argument('--profile', action='store_true', help='time every frame phase')
+    headless.set_defaults(func=run_headless)
+
+    batch = subparsers.add_parser('batch', help='seeded headless games across worker processes')
+    batch.add_argument('--games', type=int, default=64, help='number of games')
+    batch.add_argument('--workers', type=int, default=None, help='worker processes, defaults to the CPU count')
+    batch.add_argument('--army', type=int, default=settings.HARD, help='number of files in the enemy army')
+    batch.add_argument('--ticks', type=int, default=settings.BENCHMARK_TICKS, help='maximum number of ticks per game')
+    batch.add_argument('--script', choices=KeyScript.NAMES, default='random', help='scripted player input')
+    batch.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    batch.set_defaults(func=run_batch)
+
+    sweep = subparsers.add_parser('sweep', help='tick time against stress army size')
+    sweep.add_argument('--counts', type=lambda value: [int(count) for count in value.split(',')],
+                       default=list(settings.STRESS_COUNTS), help='comma separated army sizes')
+    sweep.add_argument('--formation', choices=StressScenario.FORMATIONS, default=StressScenario.GRID)
+    sweep.add_argument('--width', type=int, default=settings.SCREEN_WIDTH, help='virtual playfield width')
+    sweep.add_argument('--height', type=int, default=settings.SCREEN_HEIGHT, help='virtual playfield height')
+    sweep.add_argument('--ticks', type=int, default=settings.STRESS_TICKS, help='ticks per army size')
+    sweep.add_argument('--render', action='store_true', help='also render every tick to the dummy display')
+    sweep.add_argument('--no-filtering', action='store_true', help='let every ship collide with every ship')
+    sweep.add_argument('--no-spatial-hash', action='store_true', help='keep the default bounding box tree broadphase')
+    sweep.add_argument('--no-animation', action='store_true', help='draw static images instead of animations')
+    sweep.add_argument('--out', metavar='PATH', help='export the sweep to a CSV file')
+    sweep.set_defaults(func=run_sweep)
+
+    bullets = subparsers.add_parser('bullets', help='tick time against enemy bullet count')
+    bullets.add_argument('--counts', type=lambda value: [int(count) for count in value.split(',')],
+                         default=list(settings.BULLET_SWEEP_COUNTS), help='comma separated bullet caps')
+    bullets.add_argument('--backends', type=lambda value: value.split(','), default=list(EnemyFireController.BACKENDS),
+                         help='comma separated enemy fire backends')
+    bullets.add_argument('--ticks', type=int, default=settings.BULLET_SWEEP_TICKS, help='ticks per bullet cap')
+    bullets.add_argument('--render', action='store_true', help='also render every tick to the dummy display')
+    bullets.set_defaults(func=run_bullets)
+
+    projectiles = subparsers.add_parser('projectiles', help='tick time with pymunk against kinematic projectiles')
+    projectiles.add_argument('--weapons', type=lambda value: value.split(','), default=list(WEAPONS),
+                             help='comma separated weapon names')
+    projectiles.add_argument('--backends', type=lambda value: value.split(','),
+                             default=list(ProjectileSweep.BACKENDS), help='comma separated projectile backends')
+    projectiles.add_argument('--enemies', type=int, default=settings.KINEMATIC_SWEEP_ENEMIES,
+                             help='number of enemies')
+    projectiles.add_argument('--ticks', type=int, default=settings.STRESS_TICKS, help='ticks per weapon and backend')
+    projectiles.add_argument('--render', action='store_true', help='also render every tick to the dummy display')
+    projectiles.set_defaults(func=run_projectiles)
+
+    server = subparsers.add_parser('server', help='server tick time and bytes per tick against spectator count')
+    server.add_argument('--counts', type=lambda value: [int(count) for count in value.split(',')],
+                        default=list(settings.NET_SWEEP_SPECTATORS), help='comma separated spectator counts')
+    server.add_argument('--ticks', type=int, default=settings.NET_SWEEP_TICKS, help='server ticks per count')
+    server.add_argument('--army', type=int, default=settings.HARD, help='number of files in the enemy army')
+    server.set_defaults(func=run_server)
+
+    state = subparsers.add_parser('state', help='game state size and save and restore time against army size')
+    state.add_argument('--counts', type=lambda value: [int(count) for count in value.split(',')],
+                       default=list(settings.STRESS_COUNTS), help='comma separated army sizes')
+    state.add_argument('--repeats', type=int, default=settings.STATE_SWEEP_REPEATS, help='saves and restores to time')
+    state.set_defaults(func=run_state)
+
+    env = subparsers.add_parser('env', help='vector environment steps per second against games and workers')
+    env.add_argument('--counts', type=lambda value: [int(count) for count in value.split(',')],
+                     default=list(settings.ENV_SWEEP_ENVS), help='comma separated numbers of games')
+    env.add_argument('--workers', type=lambda value: [int(count) for count in value.split(',')], default=[0],
+                     help='comma separated worker process counts, 0 for in-process')
+    env.add_argument('--steps', type=int, default=settings.ENV_SWEEP_STEPS, help='vector steps per measurement')
+    env.add_argument('--army', type=int, default=settings.HARD, help='number of files in the enemy army')
+    env.set_defaults(func=run_env)
+
+    governor = subparsers.add_parser('governor', help='simulation speed under load with and without the governor')
+    governor.add_argument('--loads', type=lambda value: [float(load) for load in value.split(',')],
+                          default=list(settings.GOVERNOR_SWEEP_LOADS), help='comma separated busy ms per frame')
+    governor.add_argument('--enemies', type=int, default=settings.GOVERNOR_SWEEP_ENEMIES, help='number of enemies')
+    governor.add_argument('--frames', type=int, default=settings.GOVERNOR_SWEEP_FRAMES, help='frames per load')
+    governor.set_defaults(func=run_governor)
+
+    soak = subparsers.add_parser('soak', help='long session with bounded physics space and resident memory')
+    soak.add_argument('--ticks', type=int, default=settings.SOAK_TICKS, help='ticks to play')
+    soak.add_argument('--sample', type=int, default=settings.SOAK_SAMPLE_TICKS, help='ticks between samples')
+    soak.add_argument('--seed', type=int, default=0, help='seed of the world and the key script')
+    soak.add_argument('--backend', choices=EnemyFireController.BACKENDS, default=settings.ENEMY_FIRE_BACKEND,
+                      help='enemy fire backend')
+    soak.set_defaults(func=run_soak)
+
+    capture = subparsers.add_parser('capture', help='captured frames per second at full and reduced resolution')
+    capture.add_argument('--factors', type=lambda value: [int(factor) for factor in value.split(',')],
+                         default=list(settings.CAPTURE_FACTORS), help='comma separated downsampling factors')
+    capture.add_argument('--frames', type=int, default=settings.CAPTURE_FRAMES, help='captures per measurement')
+    capture.set_defaults(func=run_capture)
+
+    recorder = subparsers.add_parser('recorder', help='main-thread cost and dropped frames of the video recorder')
+    recorder.add_argument('--formats', type=lambda value: value.split(','), default=list(FrameRecorder.FORMATS),
+                          help='comma separated frame formats')
+    recorder.add_argument('--policies', type=lambda value: value.split(','), default=list(FrameRecorder.POLICIES),
+                          help='comma separated drop policies')
+    recorder.add_argument('--frames', type=int, default=settings.CAPTURE_FRAMES, help='rendered frames to record')
+    recorder.add_argument('--factor', type=int, default=settings.RECORDER_FACTOR, help='downsampling factor')
+    recorder.add_argument('--uncapped', action='store_true', help='render as fast as possible instead of at the frame rate')
+    recorder.set_defaults(func=run_recorder)
+
+    assets = subparsers.add_parser('assets', help='startup time and steady-state image loads')
+    assets.add_argument('--ticks', type=int, default=600, help='steady-state ticks and game over frames')
+    assets.add_argument('--repeat', type=int, default=5, help='fresh interpreters to time the import in')
+    assets.add_argument('--preload', action='store_true', help='preload images before the first frame')
+    assets.set_defaults(func=run_assets)
+
+    atlas = subparsers.add_parser('atlas', help='sprite cold start from PNG files against the texture atlas cache')
+    atlas.add_argument('--repeat', type=int, default=5, help='fresh interpreters to time each cold start in')
+    atlas.set_defaults(func=run_atlas)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
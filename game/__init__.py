@@ -6,3 +6,27 @@ from .singleton import *
 from .game_engine import *
 from .settings import *
 from .projectile import *
+from .headless import *
+from .sprite_cache import *
+from .projectile_pool import *
+from .formation import *
+from .world import *
+from .batch import *
+from .clock import *
+from .replay import *
+from .profiler import *
+from .playfield import *
+from .stress import *
+from .benchmarks import *
+from .assets import *
+from .animation import *
+from .entity_store import *
+from .bullet_pattern import *
+from .kinematic import *
+from .enemy_fire import *
+from .game_state import *
+from .network import *
+from .vector_env import *
+from .governor import *
+from .recorder import *
+from .lifecycle import *
@@ -0,0 +1,85 @@
+"""
+This module contains the Animation and Animator classes.
+Animations play the sprite sheets under assets/_Foozle. Their frames are sliced and scaled once
+and shared by every entity; the animator advances all of them once per rendered frame.
+"""
+import itertools
+import pygame
+from game.singleton import SingletonMeta
+from game.sprite_cache import SpriteCache
+from game import settings
+
+
+class Animation:
+    """
+    Looping sprite-sheet animation.
+    Overlay images, such as the ship an engine flame belongs to, are baked into every frame.
+    """
+    def __init__(self, sheet: str, frame_ticks: int = settings.ANIMATION_FRAME_TICKS, flip: bool = False,
+                 overlays: tuple[str, ...] = ()):
+        self.sheet = sheet
+        self.frame_ticks = frame_ticks
+        self.flip = flip
+        self.overlays = overlays
+
+    def frames(self, size: tuple[float, float]) -> list[pygame.Surface]:
+        """
+        Returns the frames of the animation scaled to a given size.
+        :param size: target size in pixels.
+        :return: frames.
+        """
+        return SpriteCache().get_frames(self.sheet, size, self.flip, self.overlays)
+
+
+class Animator(metaclass=SingletonMeta):
+    """
+    Animator singleton class.
+    Instead of a timer per entity, every animation picks its current frame once per rendered frame
+    for each of a few phases; entities are spread over the phases so they do not all flicker in step.
+    """
+    def __init__(self):
+        self.enabled = True
+        self.tick = 0
+        self.current = {}
+        self.phases = itertools.count()
+
+    def next_phase(self) -> int:
+        """
+        Returns the phase for a new entity.
+        :return: phase index.
+        """
+        return next(self.phases) % settings.ANIMATION_PHASES
+
+    def advance(self) -> None:
+        """
+        Advances every animation in use by one rendered frame.
+        :return: None
+        """
+        self.tick += 1
+        for animation, size in self.current:
+            self.current[(animation, size)] = self.__pick(animation, size)
+
+    def frame(self, animation: Animation, size: tuple[float, float], phase: int) -> pygame.Surface:
+        """
+        Returns the current frame of an animation.
+        :param animation: animation to play.
+        :param size: target size in pixels.
+        :param phase: phase of the entity.
+        :return: frame.
+        """
+        frames = self.current.get((animation, size))
+        if frames is None:
+            frames = self.current[(animation, size)] = self.__pick(animation, size)
+        return frames[phase]
+
+    def __pick(self, animation: Animation, size: tuple[float, float]) -> list[pygame.Surface]:
+        """
+        Picks the current frame of an animation for every phase.
+        :param animation: animation to play.
+        :param size: target size in pixels.
+        :return: one frame per phase.
+        """
+        frames = animation.frames(size)
+        step = self.tick // animation.frame_ticks
+        return [frames[(step + phase * len(frames) // settings.ANIMATION_PHASES) % len(frames)]
+                for phase in range(settings.ANIMATION_PHASES)]
@@ -0,0 +1,105 @@
+"""
+This module contains the AssetManager class.
+The asset manager loads every image once, on first use, instead of when modules are imported.
+"""
+import threading
+import time
+import pygame
+from game.singleton import SingletonMeta
+
+
+class AssetManager(metaclass=SingletonMeta):
+    """
+    Asset manager singleton class.
+    Images loaded before the display exists are converted to its format on the first request after it does.
+    """
+    def __init__(self):
+        self.images = {}
+        self.unconverted = set()
+        self.lock = threading.Lock()
+        self.preload_thread = None
+
+        # Asset statistics
+        self.loads = 0
+        self.hits = 0
+        self.load_time = 0.0
+
+    def get(self, path: str) -> pygame.Surface:
+        """
+        Returns an image, loading it from disk only on the first request.
+        :param path: image path.
+        :return: image.
+        """
+        image = self.images.get(path)
+        if image is None:
+            image = self.__load(path)
+        else:
+            self.hits += 1
+
+        if path in self.unconverted and self.__display_ready():
+            image = image.convert_alpha()
+            self.images[path] = image
+            self.unconverted.discard(path)
+        return image
+
+    def preload(self, paths: list[str], background: bool = True) -> None:
+        """
+        Loads images ahead of their first use.
+        :param paths: image paths.
+        :param background: whether to load on a background thread.
+        :return: None
+        """
+        if not background:
+            for path in paths:
+                self.__load(path)
+            return
+        self.preload_thread = threading.Thread(target=self.preload, args=(paths, False), daemon=True)
+        self.preload_thread.start()
+
+    def wait(self) -> None:
+        """
+        Waits for a background preload to finish.
+        :return: None
+        """
+        if self.preload_thread is not None:
+            self.preload_thread.join()
+            self.preload_thread = None
+
+    def stats(self) -> dict:
+        """
+        Returns the asset load statistics.
+        :return: asset statistics.
+        """
+        return {
+            'asset_loads': self.loads,
+            'asset_hits': self.hits,
+            'asset_load_ms': self.load_time * 1000,
+        }
+
+    def __load(self, path: str) -> pygame.Surface:
+        """
+        Loads an image from disk unless another thread already did.
+        :param path: image path.
+        :return: image.
+        """
+        with self.lock:
+            image = self.images.get(path)
+            if image is not None:
+                return image
+
+            start = time.perf_counter()
+            image = pygame.image.load(path)
+            self.load_time += time.perf_counter() - start
+            self.loads += 1
+
+            self.images[path] = image
+            self.unconverted.add(path)
+            return image
+
+    @staticmethod
+    def __display_ready() -> bool:
+        """
+        Returns True once a display surface exists to convert images to.
+        :return: True if images can be converted, False otherwise.
+        """
+        return pygame.display.get_init() and pygame.display.get_surface() is not None
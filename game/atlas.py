@@ -0,0 +1,156 @@
+"""
+This module contains the TextureAtlas class.
+The texture atlas packs every sprite and animation frame, already scaled and composited, into one image
+and caches its raw pixels on disk, so a cold start maps one file instead of decoding and scaling every PNG.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import pygame
+from game.animation import Animation
+from game.sprite_cache import SpriteCache
+from game import settings
+
+
+class TextureAtlas:
+    """
+    Texture atlas class.
+    Holds the atlas surface and the area of every sprite and animation frame on it.
+    Sprites are keyed like in the SpriteCache: (image path, size) and (sheet path, size, flip, overlays).
+    """
+    # Format Magic Numbers
+    MAGIC = b'GGAT'
+    VERSION = 1
+    DIGEST_SIZE = 16
+    HEADER = struct.Struct(f'<4sHII{DIGEST_SIZE}sI')  # magic, version, width, height, digest, index size
+    PIXEL_FORMAT = 'RGBA'
+
+    def __init__(self, surface: pygame.Surface, sprites: dict, frames: dict, digest: bytes, buffer=None):
+        self.surface = surface
+        self.sprites = sprites
+        self.frames = frames
+        self.digest = digest
+        # Memory map the surface pixels live in, kept open as long as the atlas
+        self.buffer = buffer
+
+    @staticmethod
+    def source_digest(sprites: list[tuple[str, tuple]], animations: list[tuple[Animation, tuple]]) -> bytes:
+        """
+        Hashes the source images and the sizes they are packed at.
+        :param sprites: image paths and sizes.
+        :param animations: animations and frame sizes.
+        :return: digest.
+        """
+        digest = hashlib.blake2b(digest_size=TextureAtlas.DIGEST_SIZE)
+        digest.update(str(pygame.version.ver).encode())
+        keys = [(path, size) for path, size in sprites] + \
+               [(animation.sheet, size, animation.flip, animation.overlays) for animation, size in animations]
+        digest.update(repr(keys).encode())
+        paths = sorted({path for path, _ in sprites} |
+                       {path for animation, _ in animations for path in (animation.sheet, *animation.overlays)})
+        for path in paths:
+            with open(path, 'rb') as file:
+                digest.update(hashlib.blake2b(file.read(), digest_size=TextureAtlas.DIGEST_SIZE).digest())
+        return digest.digest()
+
+    @classmethod
+    def build(cls, sprites: list[tuple[str, tuple]], animations: list[tuple[Animation, tuple]],
+              width: int = settings.ATLAS_WIDTH) -> 'TextureAtlas':
+        """
+        Scales every sprite and animation frame and packs them in shelves, tallest first.
+        :param sprites: image paths and sizes.
+        :param animations: animations and frame sizes.
+        :param width: width of the atlas in pixels.
+        :return: texture atlas.
+        """
+        cache = SpriteCache()
+        images = [((path, size), None, cache.get(path, size)) for path, size in sprites]
+        for animation, size in animations:
+            key = (animation.sheet, size, animation.flip, animation.overlays)
+            images.extend((key, index, frame) for index, frame in enumerate(animation.frames(size)))
+
+        # Shelf packing
+        rects = []
+        x = y = shelf = 0
+        for _, _, image in sorted(images, key=lambda item: -item[2].get_height()):
+            w, h = image.get_size()
+            if x + w > width:
+                x, y, shelf = 0, y + shelf, 0
+            rects.append((image, pygame.Rect(x, y, w, h)))
+            x += w
+            shelf = max(shelf, h)
+        rect_of = {id(image): rect for image, rect in rects}
+
+        surface = pygame.Surface((width, y + shelf), pygame.SRCALPHA, 32)
+        sprite_rects, frame_rects = {}, {}
+        for key, index, image in images:
+            rect = rect_of[id(image)]
+            surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            if index is None:
+                sprite_rects[key] = rect
+            else:
+                frame_rects.setdefault(key, []).append(rect)
+        return cls(surface, sprite_rects, frame_rects, cls.source_digest(sprites, animations))
+
+    def save(self, path: str) -> None:
+        """
+        Writes the rect index and the raw atlas pixels to a file.
+        :param path: file path.
+        :return: None
+        """
+        index = json.dumps({
+            'sprites': [[image, size, tuple(rect)] for (image, size), rect in self.sprites.items()],
+            'frames': [[sheet, size, flip, overlays, [tuple(rect) for rect in rects]]
+                       for (sheet, size, flip, overlays), rects in self.frames.items()],
+        }).encode()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, *self.surface.get_size(), self.digest, len(index)))
+            file.write(index)
+            file.write(pygame.image.tobytes(self.surface, self.PIXEL_FORMAT))
+
+    @classmethod
+    def load(cls, path: str, digest: bytes = None) -> 'TextureAtlas':
+        """
+        Maps an atlas file into memory and wraps its pixels in a surface without copying them.
+        :param path: file path.
+        :param digest: expected source digest, or None to accept any.
+        :return: texture atlas, or None if the file is missing or stale.
+        """
+        try:
+            with open(path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(buffer) < cls.HEADER.size:
+            return None
+        magic, version, width, height, stored_digest, size = cls.HEADER.unpack_from(buffer)
+        if magic != cls.MAGIC or version != cls.VERSION or (digest is not None and stored_digest != digest):
+            return None
+
+        index = json.loads(buffer[cls.HEADER.size:cls.HEADER.size + size])
+        offset = cls.HEADER.size + size
+        pixels = memoryview(buffer)[offset:offset + width * height * 4]
+        surface = pygame.image.frombuffer(pixels, (width, height), cls.PIXEL_FORMAT)
+        sprites = {(image, tuple(size)): pygame.Rect(rect) for image, size, rect in index['sprites']}
+        frames = {(sheet, tuple(size), flip, tuple(overlays)): [pygame.Rect(rect) for rect in rects]
+                  for sheet, size, flip, overlays, rects in index['frames']}
+        return cls(surface, sprites, frames, stored_digest, buffer)
+
+    @classmethod
+    def cached(cls, sprites: list[tuple[str, tuple]], animations: list[tuple[Animation, tuple]],
+               path: str = settings.ATLAS_CACHE_PATH) -> 'TextureAtlas':
+        """
+        Loads the atlas from its cache file, rebuilding the file if any source image changed.
+        :param sprites: image paths and sizes.
+        :param animations: animations and frame sizes.
+        :param path: cache file path.
+        :return: texture atlas.
+        """
+        atlas = cls.load(path, cls.source_digest(sprites, animations))
+        if atlas is None:
+            cls.build(sprites, animations).save(path)
+            atlas = cls.load(path)
+        return atlas
@@ -0,0 +1,92 @@
+"""
+This module handles batch simulation of the game.
+It spreads seeded headless games over worker processes and merges their results.
+"""
+import functools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from game.headless import HeadlessRunner, KeyScript
+from game.profiler import percentile
+from game import settings
+
+
+def play_game(seed: int, difficulty: int = settings.HARD, ticks: int = settings.BENCHMARK_TICKS,
+              script: str = 'random') -> dict:
+    """
+    Plays one seeded headless game.
+    Module-level so worker processes can unpickle it.
+    :param seed: seed of the game, which drives its key script.
+    :param difficulty: number of files in the enemy army.
+    :param ticks: maximum number of ticks.
+    :param script: name of the key script.
+    :return: game results.
+    """
+    results = HeadlessRunner(difficulty, seed=seed).run(ticks, KeyScript(script, seed))
+    results['seed'] = seed
+    return results
+
+
+class BatchRunner:
+    """
+    Batch runner class for playing many headless games across processes.
+    """
+    def __init__(self, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, games: int, difficulty: int = settings.HARD, ticks: int = settings.BENCHMARK_TICKS,
+            script: str = 'random', first_seed: int = 0) -> dict:
+        """
+        Plays a number of games with consecutive seeds and merges their results.
+        :param games: number of games.
+        :param difficulty: number of files in the enemy army.
+        :param ticks: maximum number of ticks per game.
+        :param script: name of the key script.
+        :param first_seed: seed of the first game.
+        :return: merged results.
+        """
+        seeds = range(first_seed, first_seed + games)
+        play = functools.partial(play_game, difficulty=difficulty, ticks=ticks, script=script)
+        chunksize = max(1, games // (self.workers * 4))
+
+        start = time.perf_counter()
+        if self.workers == 1:
+            results = [play(seed) for seed in seeds]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(play, seeds, chunksize=chunksize))
+        elapsed = time.perf_counter() - start
+
+        return self.merge(results, elapsed)
+
+    def merge(self, results: list[dict], elapsed: float) -> dict:
+        """
+        Merges per-game results into batch statistics.
+        :param results: per-game results.
+        :param elapsed: wall time of the whole batch.
+        :return: merged results.
+        """
+        games = len(results)
+        outcomes = [result['outcome'] for result in results]
+        game_ticks = sorted(result['ticks'] for result in results)
+        total_ticks = sum(game_ticks)
+        busy = sum(result['elapsed'] for result in results)
+        game_rates = sorted(result['ticks_per_second'] for result in results)
+
+        return {
+            'games': games,
+            'workers': self.workers,
+            'wins': outcomes.count('win'),
+            'losses': outcomes.count('loss'),
+            'timeouts': outcomes.count('running'),
+            'win_rate': outcomes.count('win') / games if games else 0.0,
+            'ticks_p50': percentile(game_ticks, 50),
+            'ticks_mean': total_ticks / games if games else 0.0,
+            'total_ticks': total_ticks,
+            'elapsed': elapsed,
+            'games_per_second': games / elapsed if elapsed else 0.0,
+            'ticks_per_second': total_ticks / elapsed if elapsed else 0.0,
+            'game_ticks_per_second_p50': percentile(game_rates, 50),
+            # Simulation time over wall time; approaches the worker count when scaling is linear
+            'parallelism': busy / elapsed if elapsed else 0.0,
+        }
@@ -0,0 +1,7 @@
+from .bullets import *
+from .projectiles import *
+from .spectators import *
+from .state import *
+from .env import *
+from .governor import *
+from .soak import *
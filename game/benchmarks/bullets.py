@@ -0,0 +1,58 @@
+"""
+This module contains the BulletSweep class.
+The bullet sweep measures how a tick scales with the number of enemy bullets on screen.
+"""
+from game.profiler import FrameProfiler
+from game.headless import HeadlessRunner, KeyScript
+from game.world import World
+from game.bullet_pattern import Spiral
+from game import settings
+
+
+class BulletSweep:
+    """
+    Bullet sweep class.
+    Keeps an invulnerable player under a spiral from the whole army, capped at a given number of bullets,
+    and records how long a tick takes.
+    """
+    def __init__(self, backend: str = settings.ENEMY_FIRE_BACKEND, ticks: int = settings.BULLET_SWEEP_TICKS,
+                 render: bool = False, difficulty: int = settings.HARD):
+        self.backend = backend
+        self.ticks = ticks
+        self.render = render
+        self.difficulty = difficulty
+
+    def measure(self, bullets: int) -> dict:
+        """
+        Measures one bullet cap.
+        :param bullets: maximum number of enemy bullets.
+        :return: tick timings in milliseconds.
+        """
+        world = World(self.difficulty, enemy_fire=Spiral(period=1), enemy_fire_backend=self.backend)
+        world.game_logic.enemy_fire.capacity = bullets
+        world.player.invulnerable = True
+        runner = HeadlessRunner(world=world, render=self.render, profile=True)
+
+        live = []
+        results = runner.run(self.ticks, KeyScript('idle'), lambda tick: live.append(len(world.game_logic.enemy_fire)))
+        phases = runner.profiler.summary()
+        # Skip the ramp-up until the cap is reached
+        steady = live[len(live) // 2:]
+        return {
+            'bullet_cap': bullets,
+            'backend': self.backend,
+            'bullets': sum(steady) / len(steady) if steady else 0.0,
+            'tick_p50_ms': results['latency_p50_ms'],
+            'tick_p99_ms': results['latency_p99_ms'],
+            'space_step_ms': phases[FrameProfiler.SPACE_STEP]['mean_ms'],
+            'render_ms': phases[FrameProfiler.RENDER]['mean_ms'] + phases[FrameProfiler.DISPLAY_FLIP]['mean_ms'],
+            'fits_60_fps': results['latency_p99_ms'] < 1000 / settings.FRAMES_PER_SECOND,
+        }
+
+    def run(self, counts: list[int]) -> list[dict]:
+        """
+        Measures every bullet cap.
+        :param counts: bullet caps.
+        :return: one row of timings per bullet cap.
+        """
+        return [self.measure(bullets) for bullets in counts]
@@ -0,0 +1,55 @@
+"""
+This module contains the EnvSweep class.
+The environment sweep measures how many steps per second a vector environment runs.
+"""
+import time
+import numpy as np
+from game.vector_env import GameEnv, VectorEnv
+from game import settings
+
+
+class EnvSweep:
+    """
+    Environment sweep class.
+    Steps vector environments of growing size with seeded random actions, in this process or over
+    worker processes, and records how many game steps per second they run.
+    """
+    def __init__(self, steps: int = settings.ENV_SWEEP_STEPS, difficulty: int = settings.HARD):
+        self.steps = steps
+        self.difficulty = difficulty
+
+    def measure(self, envs: int, workers: int = 0) -> dict:
+        """
+        Measures one vector environment.
+        :param envs: number of games.
+        :param workers: number of worker processes, 0 to step the games in this process.
+        :return: steps per second of the vector and of all games together.
+        """
+        actions = np.random.default_rng(envs).integers(0, GameEnv.ACTIONS, (self.steps, envs), dtype=np.uint8)
+        with VectorEnv(envs, workers, difficulty=self.difficulty) as env:
+            env.reset()
+            episodes = 0
+            start = time.perf_counter()
+            for step in range(self.steps):
+                _, _, dones = env.step(actions[step])
+                episodes += int(dones.sum())
+            elapsed = time.perf_counter() - start
+
+        return {
+            'envs': envs,
+            'workers': workers,
+            'steps': self.steps,
+            'episodes': episodes,
+            'vector_steps_per_second': self.steps / elapsed,
+            'env_steps_per_second': self.steps * envs / elapsed,
+            'step_ms': elapsed / self.steps * 1000,
+        }
+
+    def run(self, counts: list[int], workers: int = 0) -> list[dict]:
+        """
+        Measures every vector environment size.
+        :param counts: numbers of games.
+        :param workers: number of worker processes, 0 to step the games in this process.
+        :return: one row per size.
+        """
+        return [self.measure(envs, workers) for envs in counts]
@@ -0,0 +1,79 @@
+"""
+This module contains the GovernorSweep class.
+The governor sweep measures how the frame governor holds a loaded game loop to real time.
+"""
+import time
+from game.headless import HeadlessRunner, KeyScript
+from game.world import World
+from game.stress import StressScenario
+from game.governor import FrameGovernor
+from game.clock import FixedTimestep
+from game import settings
+
+
+class GovernorSweep:
+    """
+    Governor sweep class.
+    Runs the main game loop uncapped over a rendered stress army with physics debug drawing, with extra busy
+    time per frame standing in for a loaded CPU, and records how close the simulation stays to real time
+    with and without the frame governor.
+    """
+    def __init__(self, enemies: int = settings.GOVERNOR_SWEEP_ENEMIES, frames: int = settings.GOVERNOR_SWEEP_FRAMES):
+        self.enemies = enemies
+        self.frames = frames
+
+    def measure(self, load_ms: float, governed: bool) -> dict:
+        """
+        Measures one load.
+        :param load_ms: busy time added to every frame, in milliseconds.
+        :param governed: whether the frame governor renders the frames.
+        :return: simulation speed, rendered frame rate and governor statistics.
+        """
+        world = World(seed=self.enemies, scenario=StressScenario(self.enemies), enemy_fire=None)
+        world.player.invulnerable = True
+        runner = HeadlessRunner(world=world, render=True)
+        renderer = runner.game_renderer
+        renderer.debug = True
+        governor = FrameGovernor(renderer) if governed else None
+        timestep = FixedTimestep()
+        script = KeyScript('fire')
+
+        ticks = rendered = 0
+        frame_time = settings.PHYSICS_TIMESTEP
+        start = time.perf_counter()
+        for _ in range(self.frames):
+            frame_start = time.perf_counter()
+            for _ in range(timestep.add(frame_time)):
+                world.update(script.keys(ticks))
+                ticks += 1
+            if governor is not None:
+                rendered += governor.render(world.player, world.enemies, timestep.alpha, frame_start)
+            else:
+                renderer.render(world.player, world.enemies, timestep.alpha)
+                rendered += 1
+            # Stand-in for the rest of a busy machine
+            busy_until = time.perf_counter() + load_ms / 1000
+            while time.perf_counter() < busy_until:
+                pass
+            frame_time = time.perf_counter() - frame_start
+        elapsed = time.perf_counter() - start
+        if governor is not None:
+            governor.close()
+
+        return {
+            'load_ms': load_ms,
+            'governed': governed,
+            'frame_ms': elapsed / self.frames * 1000,
+            'simulation_speed': ticks * settings.PHYSICS_TIMESTEP / elapsed,
+            'rendered_fps': rendered / elapsed,
+            **({key: value for key, value in governor.stats().items() if key != 'governor_frames'}
+               if governor is not None else {}),
+        }
+
+    def run(self, loads: list[float]) -> list[dict]:
+        """
+        Measures every load with and without the governor.
+        :param loads: busy times added to every frame, in milliseconds.
+        :return: one row per load and governor setting.
+        """
+        return [self.measure(load_ms, governed) for load_ms in loads for governed in (False, True)]
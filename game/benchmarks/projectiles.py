@@ -0,0 +1,63 @@
+"""
+This module contains the ProjectileSweep class.
+The projectile sweep measures what the kinematic projectile backend saves for each weapon.
+"""
+from game.profiler import FrameProfiler
+from game.headless import HeadlessRunner, KeyScript
+from game.world import World
+from game.stress import StressScenario
+from game.weapon import WEAPONS
+from game import settings
+
+
+class ProjectileSweep:
+    """
+    Projectile sweep class.
+    Fires one weapon into a stress army, once with pymunk projectiles and once with kinematic ones,
+    and records how long a tick takes and how many enemies the weapon destroyed.
+    """
+    # Projectile backends
+    PYMUNK = 'pymunk'
+    KINEMATIC = 'kinematic'
+    BACKENDS = (PYMUNK, KINEMATIC)
+
+    def __init__(self, enemies: int = settings.KINEMATIC_SWEEP_ENEMIES, ticks: int = settings.STRESS_TICKS,
+                 render: bool = False):
+        self.enemies = enemies
+        self.ticks = ticks
+        self.render = render
+
+    def measure(self, weapon: str, backend: str) -> dict:
+        """
+        Measures one weapon with one projectile backend.
+        :param weapon: weapon name from WEAPONS.
+        :param backend: projectile backend.
+        :return: tick timings in milliseconds and hits.
+        """
+        kinematic_weapons = (weapon,) if backend == self.KINEMATIC else ()
+        world = World(seed=self.enemies, scenario=StressScenario(self.enemies), enemy_fire=None,
+                      kinematic_weapons=kinematic_weapons)
+        world.player.equip_weapon(WEAPONS[weapon])
+        runner = HeadlessRunner(world=world, render=self.render, profile=True)
+
+        results = runner.run(self.ticks, KeyScript('fire'))
+        phases = runner.profiler.summary()
+        return {
+            'weapon': weapon,
+            'backend': backend,
+            'ticks': results['ticks'],
+            'tick_p50_ms': results['latency_p50_ms'],
+            'tick_p99_ms': results['latency_p99_ms'],
+            'space_step_ms': phases[FrameProfiler.SPACE_STEP]['mean_ms'],
+            'peak_space_bodies': results['peak_space_bodies'],
+            'enemies_destroyed': self.enemies - results['enemies'],
+        }
+
+    def run(self, weapons: list[str], backends: list[str] = BACKENDS) -> list[dict]:
+        """
+        Measures every weapon with every projectile backend.
+        :param weapons: weapon names.
+        :param backends: projectile backends.
+        :return: one row of timings per weapon and backend.
+        """
+        return [self.measure(weapon, backend) for weapon in weapons for backend in backends]
@@ -0,0 +1,111 @@
+"""
+This module contains the SoakRun class.
+A soak run plays one world for a long session and checks that the physics space and memory stay bounded.
+"""
+import os
+import sys
+import time
+from game.headless import KeyScript
+from game.world import World
+from game.bullet_pattern import BulletPattern
+from game import settings
+
+
+class SoakRun:
+    """
+    Soak run class.
+    Plays one world for tens of thousands of ticks with seeded random input that also switches weapons,
+    starting a new round from the initial state whenever the game ends, and samples the physics space and
+    the memory of the process. Enemies fire like in the game unless enemy_fire says otherwise.
+    The run holds if the space never keeps a body or shape of an entity the game no longer tracks, and the
+    resident set size stays within a bound of where it was after warm-up.
+    """
+    def __init__(self, ticks: int = settings.SOAK_TICKS, sample: int = settings.SOAK_SAMPLE_TICKS,
+                 warmup: int = settings.SOAK_WARMUP_TICKS, rss_growth_mb: float = settings.SOAK_RSS_GROWTH_MB,
+                 enemy_fire: str | BulletPattern = settings.ENEMY_FIRE_PATTERN, **options):
+        self.ticks = ticks
+        self.sample = sample
+        self.warmup = warmup
+        self.rss_growth_mb = rss_growth_mb
+        self.enemy_fire = enemy_fire
+        self.options = options
+
+    def run(self, seed: int = 0) -> list[dict]:
+        """
+        Plays the soak run.
+        :param seed: seed of the world and the key script.
+        :return: one row per sample.
+        """
+        world = World(seed=seed, enemy_fire=self.enemy_fire, **self.options)
+        game_logic = world.game_logic
+        initial = game_logic.save_state()
+        script = KeyScript('arsenal', seed)
+
+        rows = []
+        rounds = 0
+        start = time.perf_counter()
+        for tick in range(1, self.ticks + 1):
+            if world.update(script.keys(tick)):
+                game_logic.restore_state(initial)
+                rounds += 1
+            if tick % self.sample == 0:
+                elapsed = time.perf_counter() - start
+                rows.append({
+                    'tick': tick,
+                    'rounds': rounds,
+                    'live': self.live(game_logic),
+                    'bodies': len(world.space.bodies),
+                    'shapes': len(world.space.shapes),
+                    'rss_mb': self.resident_mb(),
+                    'tick_ms': elapsed / self.sample * 1000,
+                })
+                start = time.perf_counter()
+        return rows
+
+    def check(self, rows: list[dict]) -> list[str]:
+        """
+        Checks the samples of a soak run against its bounds.
+        :param rows: samples from run().
+        :return: one message per broken bound, empty if the run holds.
+        """
+        failures = [f'{row["bodies"]} bodies and {row["shapes"]} shapes for {row["live"]} live entities '
+                    f'at tick {row["tick"]}' for row in rows
+                    if row['bodies'] > row['live'] or row['shapes'] > row['live']]
+        settled = [row for row in rows if row['tick'] >= self.warmup]
+        if settled:
+            growth = max(row['rss_mb'] for row in settled) - settled[0]['rss_mb']
+            if growth > self.rss_growth_mb:
+                failures.append(f'resident memory grew by {growth:.1f} MB after tick {settled[0]["tick"]}')
+        return failures
+
+    @staticmethod
+    def live(game_logic) -> int:
+        """
+        Counts the entities the game tracks in the physics space: the player, the enemies and the pymunk
+        projectiles, including those destroyed this tick and waiting to be retired.
+        :param game_logic: game logic object.
+        :return: number of entities.
+        """
+        count = 1 + len(game_logic.enemies) + len(game_logic.projectiles)
+        if game_logic.enemy_fire is not None:
+            count += len(game_logic.enemy_fire.projectiles)
+        return count
+
+    @staticmethod
+    def resident_mb() -> float:
+        """
+        Returns the resident set size of the process, or its peak where the current size cannot be read.
+        :return: size in megabytes, 0 if neither can be read.
+        """
+        try:
+            with open('/proc/self/statm') as file:
+                return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+        except (OSError, ValueError, AttributeError):
+            pass
+        try:
+            import resource
+        except ImportError:
+            return 0.0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
@@ -0,0 +1,95 @@
+"""
+This module contains the SpectatorSweep class.
+The spectator sweep measures what each spectator costs the game server.
+"""
+import asyncio
+import numpy as np
+from game.headless import KeyScript
+from game.world import World
+from game.network import Message, GameServer, GameClient
+from game.replay import encode_keys
+from game import settings
+
+
+class SpectatorSweep:
+    """
+    Spectator sweep class.
+    Serves one scripted player and a number of spectators on localhost, with the server ticking uncapped,
+    and records what a tick costs the server and how many bytes it sends.
+    The clients run in the same process and event loop, outside of the timed server work.
+    """
+    def __init__(self, ticks: int = settings.NET_SWEEP_TICKS, difficulty: int = settings.HARD):
+        self.ticks = ticks
+        self.difficulty = difficulty
+
+    def measure(self, spectators: int) -> dict:
+        """
+        Measures one spectator count.
+        :param spectators: number of spectators.
+        :return: server tick timings in milliseconds and bytes sent.
+        """
+        return asyncio.run(self.__serve(spectators))
+
+    async def __serve(self, spectators: int) -> dict:
+        """
+        Plays one server session.
+        :param spectators: number of spectators.
+        :return: server tick timings in milliseconds and bytes sent.
+        """
+        world = World(self.difficulty, enemy_fire=settings.ENEMY_FIRE_PATTERN)
+        world.player.invulnerable = True
+        server = GameServer(self.difficulty, world=world)
+        host, port = await server.start(settings.NET_HOST, 0)
+        player = GameClient(Message.PLAYER)
+        clients = [player, *(GameClient(Message.SPECTATOR) for _ in range(spectators))]
+        for client in clients:
+            await client.connect(host, port)
+        # Let every greeting reach the server
+        for _ in range(len(clients) + 1):
+            await asyncio.sleep(0)
+
+        script = KeyScript('strafe')
+
+        def steer(tick: int) -> None:
+            player.keys = encode_keys(script.keys(tick))
+
+        await server.serve(self.ticks, realtime=False, on_tick=steer)
+        results = server.stats()
+        lag = [server.tick - client.stats()['latest_tick'] for client in clients]
+        for client in clients:
+            client.close()
+        server.close()
+
+        return {
+            'spectators': spectators,
+            'tick_p50_ms': results['tick_p50_ms'],
+            'tick_p99_ms': results['tick_p99_ms'],
+            'update_ms': results['update_ms'],
+            'send_ms': results['send_ms'],
+            'bytes_per_tick': results['bytes_per_tick'],
+            'bytes_per_client': results['bytes_per_tick'] / len(clients),
+            'full_snapshots': results['full_snapshots'],
+            'client_lag_ticks': sum(lag) / len(lag),
+        }
+
+    def run(self, counts: list[int]) -> list[dict]:
+        """
+        Measures every spectator count.
+        :param counts: numbers of spectators.
+        :return: one row of timings per spectator count.
+        """
+        return [self.measure(spectators) for spectators in counts]
+
+    @staticmethod
+    def capacity(rows: list[dict]) -> int:
+        """
+        Estimates how many spectators one core can serve at the tick rate, from a least squares fit of the
+        send time against the number of clients.
+        :param rows: sweep rows, for at least two spectator counts.
+        :return: number of spectators.
+        """
+        clients = np.array([row['spectators'] + 1 for row in rows], dtype=float)
+        send = np.array([row['send_ms'] for row in rows])
+        slope, intercept = np.polyfit(clients, send, 1)
+        budget = 1000 / settings.FRAMES_PER_SECOND - max(row['update_ms'] for row in rows) - intercept
+        return max(int(budget / slope) - 1, 0) if slope > 0 else 0
@@ -0,0 +1,79 @@
+"""
+This module contains the StateSweep class.
+The state sweep measures how long saving and restoring the game state takes.
+"""
+import time
+from game.headless import KeyScript
+from game.world import World
+from game.stress import StressScenario
+from game.replay import state_digest
+from game import settings
+
+
+class StateSweep:
+    """
+    State sweep class.
+    Saves and restores the state of stress armies under fire, records the size of the packed state and how long
+    saving and restoring take, and checks that every tick replayed from a restored state matches the original one.
+    """
+    def __init__(self, repeats: int = settings.STATE_SWEEP_REPEATS, warmup: int = settings.STATE_SWEEP_WARMUP,
+                 rollback: int = settings.STATE_SWEEP_ROLLBACK):
+        self.repeats = repeats
+        self.warmup = warmup
+        self.rollback = rollback
+
+    def measure(self, enemies: int) -> dict:
+        """
+        Measures one army size.
+        :param enemies: number of enemies.
+        :return: state size in bytes and save and restore times in microseconds.
+        """
+        world = World(seed=enemies, scenario=StressScenario(enemies), enemy_fire='spread')
+        world.player.invulnerable = True
+        game_logic = world.game_logic
+        script = KeyScript('fire')
+        for tick in range(self.warmup):
+            world.update(script.keys(tick))
+        state = game_logic.save_state()
+
+        start = time.perf_counter()
+        for _ in range(self.repeats):
+            game_logic.save_state(state)
+        save = (time.perf_counter() - start) / self.repeats
+        start = time.perf_counter()
+        for _ in range(self.repeats):
+            game_logic.restore_state(state)
+        restore = (time.perf_counter() - start) / self.repeats
+
+        # Play on, rewind and play the same ticks again, comparing every tick
+        ticks = range(self.warmup, self.warmup + self.rollback)
+        digests = []
+        for tick in ticks:
+            world.update(script.keys(tick))
+            digests.append(state_digest(world))
+        game_logic.restore_state(state)
+        matched = 0
+        for tick, digest in zip(ticks, digests):
+            world.update(script.keys(tick))
+            if state_digest(world) != digest:
+                break
+            matched += 1
+
+        return {
+            'enemies': len(game_logic.enemies),
+            'projectiles': state.projectiles.bodies.count + state.enemy_projectiles.bodies.count,
+            'bullets': state.bullets.count + state.kinematic.count,
+            'state_bytes': state.size,
+            'save_us': save * 1e6,
+            'restore_us': restore * 1e6,
+            'rollback_ticks_matched': matched,
+            'rollback_matches': matched == self.rollback,
+        }
+
+    def run(self, counts: list[int]) -> list[dict]:
+        """
+        Measures every army size.
+        :param counts: numbers of enemies.
+        :return: one row per army size.
+        """
+        return [self.measure(enemies) for enemies in counts]
@@ -0,0 +1,138 @@
+"""
+This module contains the BulletPattern class and its concrete patterns.
+Concrete patterns are: Aimed, Spread, Spiral, and Volley.
+A pattern decides which enemies fire on a tick and in which directions, for the whole army at once.
+"""
+import math
+import numpy as np
+from game import settings
+
+
+class BulletPattern:
+    """
+    Bullet pattern base class.
+    Every enemy fires once per period, offset by its phase so the army does not fire in unison.
+    Directions are unit vectors in screen coordinates; the base pattern fires straight down.
+    """
+    def __init__(self, speed: float = settings.ENEMY_BULLET_SPEED, period: int = settings.ENEMY_FIRE_PERIOD):
+        self.speed = speed
+        self.period = period
+
+    def firing(self, tick: int, phases: np.ndarray) -> np.ndarray:
+        """
+        Selects the enemies that fire on a tick.
+        :param tick: simulation tick.
+        :param phases: phase of every enemy.
+        :return: boolean mask of the firing enemies.
+        """
+        return (tick + phases) % self.period == 0
+
+    def directions(self, origins: np.ndarray, target: np.ndarray, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the direction of every bullet fired.
+        :param origins: muzzle positions of the firing enemies.
+        :param target: position of the player.
+        :param tick: simulation tick.
+        :return: index of the origin of every bullet, and its unit direction.
+        """
+        owners = np.arange(len(origins))
+        return owners, np.tile((0.0, 1.0), (len(origins), 1))
+
+    def emit(self, origins: np.ndarray, target: np.ndarray, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the bullets fired from the given origins.
+        :param origins: muzzle positions of the firing enemies.
+        :param target: position of the player.
+        :param tick: simulation tick.
+        :return: positions and velocities of the bullets.
+        """
+        owners, directions = self.directions(origins, target, tick)
+        return origins[owners], directions * self.speed
+
+    @staticmethod
+    def aim(origins: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """
+        Returns the angle from every origin to the target, measured from straight down.
+        :param origins: muzzle positions.
+        :param target: position of the player.
+        :return: angles in radians.
+        """
+        offset = target - origins
+        return np.arctan2(offset[:, 0], offset[:, 1])
+
+    @staticmethod
+    def unit(angles: np.ndarray) -> np.ndarray:
+        """
+        Turns angles measured from straight down into unit vectors.
+        :param angles: angles in radians.
+        :return: unit vectors.
+        """
+        return np.column_stack((np.sin(angles), np.cos(angles)))
+
+
+class Aimed(BulletPattern):
+    """
+    Aimed pattern.
+    One bullet at the player.
+    """
+    def directions(self, origins: np.ndarray, target: np.ndarray, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        return np.arange(len(origins)), self.unit(self.aim(origins, target))
+
+
+class Spread(BulletPattern):
+    """
+    Spread pattern.
+    A fan of bullets, centred on the player or straight down.
+    """
+    def __init__(self, count: int = 5, angle: float = math.pi / 3, aimed: bool = True,
+                 speed: float = settings.ENEMY_BULLET_SPEED, period: int = settings.ENEMY_FIRE_PERIOD):
+        super().__init__(speed, period)
+        self.count = count
+        self.angle = angle
+        self.aimed = aimed
+
+    def directions(self, origins: np.ndarray, target: np.ndarray, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        centres = self.aim(origins, target) if self.aimed else np.zeros(len(origins))
+        fan = np.linspace(-self.angle / 2, self.angle / 2, self.count)
+        angles = (centres[:, None] + fan[None, :]).ravel()
+        return np.repeat(np.arange(len(origins)), self.count), self.unit(angles)
+
+
+class Spiral(BulletPattern):
+    """
+    Spiral pattern.
+    Evenly spaced arms that turn a little every tick.
+    """
+    def __init__(self, arms: int = 4, turn: float = 0.15, speed: float = settings.ENEMY_BULLET_SPEED,
+                 period: int = settings.ENEMY_FIRE_PERIOD):
+        super().__init__(speed, period)
+        self.arms = arms
+        self.turn = turn
+
+    def directions(self, origins: np.ndarray, target: np.ndarray, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        arms = tick * self.turn + np.arange(self.arms) * (2 * math.pi / self.arms)
+        return np.repeat(np.arange(len(origins)), self.arms), self.unit(np.tile(arms, len(origins)))
+
+
+class Volley(BulletPattern):
+    """
+    Volley pattern.
+    Fires another pattern a few times in quick succession, then waits for the rest of the period.
+    """
+    def __init__(self, pattern: BulletPattern = None, shots: int = 3, interval: int = 8,
+                 period: int = settings.ENEMY_FIRE_PERIOD):
+        self.pattern = Aimed() if pattern is None else pattern
+        super().__init__(self.pattern.speed, period)
+        self.shots = shots
+        self.interval = interval
+
+    def firing(self, tick: int, phases: np.ndarray) -> np.ndarray:
+        cycle = (tick + phases) % self.period
+        return (cycle < self.shots * self.interval) & (cycle % self.interval == 0)
+
+    def directions(self, origins: np.ndarray, target: np.ndarray, tick: int) -> tuple[np.ndarray, np.ndarray]:
+        return self.pattern.directions(origins, target, tick)
+
+
+# Patterns by name, with their default parameters
+PATTERNS = {'aimed': Aimed, 'spread': Spread, 'spiral': Spiral, 'volley': Volley}
@@ -0,0 +1,73 @@
+"""
+This module contains the SimulationClock and FixedTimestep classes, and the interpolated_position function.
+The simulation clock advances by a fixed step per physics tick, independently of the wall clock.
+The fixed timestep turns rendered frame times into a number of physics ticks to run,
+and rendered positions are interpolated between the last two ticks.
+"""
+import pymunk
+from game import settings
+
+
+def interpolated_position(body: pymunk.Body, alpha: float = 1.0) -> tuple[float, float]:
+    """
+    Returns the position of a body between the previous and the current physics tick.
+    The previous position is recovered from the velocity, which the physics step integrates linearly.
+    :param body: body object.
+    :param alpha: fraction of the way from the previous tick (0) to the current one (1).
+    :return: x and y coordinates.
+    """
+    x, y = body.position
+    vx, vy = body.velocity
+    lag = (1.0 - alpha) * settings.PHYSICS_TIMESTEP
+    return x - vx * lag, y - vy * lag
+
+
+class SimulationClock:
+    """
+    Simulation clock class.
+    Time only moves when the simulation ticks.
+    """
+    def __init__(self, timestep: float = settings.PHYSICS_TIMESTEP):
+        self.timestep = timestep
+        self.ticks = 0
+        self.time = 0.0
+
+    def advance(self) -> None:
+        """
+        Advances the clock by one tick.
+        :return: None
+        """
+        self.ticks += 1
+        self.time = self.ticks * self.timestep
+
+
+class FixedTimestep:
+    """
+    Fixed timestep accumulator class.
+    Collects rendered frame time and hands it out as whole physics ticks.
+    """
+    def __init__(self, timestep: float = settings.PHYSICS_TIMESTEP,
+                 max_steps: int = settings.MAX_STEPS_PER_FRAME):
+        self.timestep = timestep
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def add(self, frame_time: float) -> int:
+        """
+        Adds the duration of a rendered frame.
+        Time beyond max_steps ticks is dropped so a long stall cannot trigger a spiral of catch-up ticks.
+        :param frame_time: frame duration in seconds.
+        :return: number of physics ticks to run this frame.
+        """
+        self.accumulator = min(self.accumulator + frame_time, self.max_steps * self.timestep)
+        steps = int(self.accumulator / self.timestep)
+        self.accumulator -= steps * self.timestep
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """
+        Fraction of a tick left in the accumulator, used to interpolate rendered positions.
+        :return: value between 0 and 1.
+        """
+        return self.accumulator / self.timestep
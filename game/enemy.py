@@ -4,6 +4,7 @@ The Enemy class extends the Ship class.
 """
 import pygame
 from game.ship import Ship
+from game.animation import Animation
 from game import settings
 
 
@@ -16,40 +17,30 @@ class Enemy(Ship):
     # Shape Magic Numbers
     VERTICES = [(0, 0), (settings.SHIP_WIDTH / 2, settings.SHIP_HEIGHT), (settings.SHIP_WIDTH, 0)]
     COLOR = (0, 0, 255, 0)
+    KIND = settings.ENEMY_KIND
+    ENEMY_FIRE = True
 
     # Ship Image
-    ENEMY_IMAGE = pygame.image.load('assets/Enemy/Ship.png')
+    ENEMY_IMAGE = 'assets/Enemy/Ship.png'
+
+    # Engine Animations, flipped to trail behind a ship facing down
+    ENGINE_IDLE = Animation('assets/_Foozle/Main Ship/Main Ship - Engine Effects/PNGs/'
+                            'Main Ship - Engines - Base Engine - Idle.png', flip=True, overlays=(ENEMY_IMAGE,))
+    ENGINE_POWERING = Animation('assets/_Foozle/Main Ship/Main Ship - Engine Effects/PNGs/'
+                                'Main Ship - Engines - Base Engine - Powering.png', flip=True, overlays=(ENEMY_IMAGE,))
 
     def __init__(self, starting_x: int, starting_y: int):
         super().__init__(starting_x, starting_y, self.VERTICES, self.COLOR)
         self.shape.collision_type = settings.ENEMY_COLLISION_TYPE
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
         """
         Draws the enemy.
         :param screen: screen object to draw on.
-        :return: None
-        """
-        adjusted_x = self.body.position.x - settings.SHIP_WIDTH * .5
-        adjusted_y = self.body.position.y - settings.SHIP_HEIGHT * .5
-        super().draw(screen, self.ENEMY_IMAGE, adjusted_x, adjusted_y)
-
-    def move(self) -> None:
-        """
-        If the ship is on an even y, it moves to the right.
-        If the ship is on an odd y, it moves to the left.
-        Once it reaches the end of the screen, it moves down one y.
-
-        Uses Ship.move() to move the ship.
-        :return: None
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: area of the screen drawn on.
         """
-        if settings.is_even_file(self.body.position.y):
-            if self.body.position.x >= settings.SCREEN_WIDTH - settings.PADDING - settings.SHIP_WIDTH:
-                super().move(Ship.THRUST_DOWN)
-            else:
-                super().move(Ship.THRUST_RIGHT)
-        if settings.is_odd_file(self.body.position.y):
-            if self.body.position.x <= settings.PADDING:
-                super().move(Ship.THRUST_DOWN)
-            else:
-                super().move(Ship.THRUST_LEFT)
+        x, y = self.interpolated_position(alpha)
+        adjusted_x = x - settings.SHIP_WIDTH * .5
+        adjusted_y = y - settings.SHIP_HEIGHT * .5
+        return super().draw(screen, self.ENEMY_IMAGE, adjusted_x, adjusted_y)
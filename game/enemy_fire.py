@@ -0,0 +1,158 @@
+"""
+This module contains the EnemyFireController class.
+The enemy fire controller evaluates a bullet pattern for the whole enemy army every tick.
+Its bullets either are kinematic projectiles, integrated and hit-tested in batch, or pooled pymunk Bullets.
+"""
+import numpy as np
+import pygame
+from game.bullet_pattern import BulletPattern
+from game.entity_store import EntityStore
+from game.kinematic import KinematicProjectiles
+from game.projectile import Projectile, Bullet
+from game.projectile_pool import ProjectilePool
+from game.playfield import Playfield
+from game import settings
+
+
+class EnemyFireController:
+    """
+    Enemy fire controller class.
+    The array backend keeps the bullets as KinematicProjectiles; the pymunk backend launches Bullets from the projectile pool, so they collide like the player's.
+    Bullets beyond the capacity are dropped instead of fired.
+    """
+    # Backends
+    ARRAY = 'array'
+    PYMUNK = 'pymunk'
+    BACKENDS = (ARRAY, PYMUNK)
+
+    # Bullets leave an enemy from the tip of its triangle
+    MUZZLE = (settings.SHIP_WIDTH / 2, settings.SHIP_HEIGHT)
+
+    def __init__(self, pattern: BulletPattern, backend: str = settings.ENEMY_FIRE_BACKEND,
+                 projectile_pool: ProjectilePool = None, capacity: int = settings.ENEMY_BULLET_CAPACITY):
+        if backend not in self.BACKENDS:
+            raise ValueError(f'Unknown enemy fire backend: {backend}')
+        self.pattern = pattern
+        self.backend = backend
+        self.projectile_pool = projectile_pool
+        self.capacity = capacity
+
+        # Array backend
+        self.bullets = KinematicProjectiles(capacity=capacity)
+
+        # Pymunk backend
+        self.projectiles = EntityStore()
+
+        # Enemy fire statistics
+        self.fired = 0
+        self.dropped = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self.bullets) if self.backend == self.ARRAY else len(self.projectiles)
+
+    def positions(self) -> np.ndarray:
+        """
+        Returns the positions of the live bullets.
+        :return: array of (x, y) rows.
+        """
+        if self.backend == self.ARRAY:
+            return self.bullets.positions
+        self.projectiles.sync()
+        return self.projectiles.positions
+
+    def fire(self, enemies: EntityStore, player, tick: int) -> None:
+        """
+        Fires the pattern from every enemy whose turn it is.
+        :param enemies: entity store of the enemies, synced with their bodies.
+        :param player: player object, the target of aimed patterns.
+        :param tick: simulation tick.
+        :return: None
+        """
+        count = len(enemies)
+        if not count:
+            return
+        # Slots are stable for the life of an enemy, so they double as firing phases
+        firing = self.pattern.firing(tick, enemies.slot_of[:count]) & enemies.alive[:count]
+        if not firing.any():
+            return
+        origins = enemies.positions[firing] + self.MUZZLE
+        positions, velocities = self.pattern.emit(origins, np.array(player.body.position), tick)
+
+        room = max(self.capacity - len(self), 0)
+        if len(positions) > room:
+            self.dropped += len(positions) - room
+            positions, velocities = positions[:room], velocities[:room]
+        self.fired += len(positions)
+
+        if self.backend == self.ARRAY:
+            self.bullets.spawn(positions, velocities, Bullet)
+            return
+        for (x, y), velocity in zip(positions.tolist(), velocities.tolist()):
+            if self.projectile_pool is None:
+                bullet = Bullet(x, y, Projectile.SHOOT_DOWN, enemy_fire=True)
+            else:
+                bullet = self.projectile_pool.acquire(Bullet, x, y, Projectile.SHOOT_DOWN, enemy_fire=True)
+            bullet.body.velocity = velocity
+            self.projectiles.add(bullet, bullet.KIND)
+
+    def step(self, timestep: float, player) -> None:
+        """
+        Moves the array bullets by one timestep and destroys the player if any of them hits it.
+        Pymunk bullets are moved and hit-tested by the physics step.
+        :param timestep: timestep in seconds.
+        :param player: player object.
+        :return: None
+        """
+        if self.backend != self.ARRAY or not len(self.bullets):
+            return
+        self.bullets.integrate(timestep)
+        position = self.bullets.positions
+
+        # Bullet circles against the bounding box of the player triangle
+        x, y = player.body.position
+        radius = Bullet.RADIUS
+        hit = (position[:, 0] >= x - settings.SHIP_WIDTH - radius) & (position[:, 0] <= x + radius) & \
+              (position[:, 1] >= y - settings.SHIP_HEIGHT - radius) & (position[:, 1] <= y + radius)
+        if hit.any():
+            self.hits += int(hit.sum())
+            player.destroy()
+            self.bullets.keep(~hit)
+
+    def cull(self, playfield: Playfield) -> None:
+        """
+        Destroys the bullets that left the playfield.
+        :param playfield: playfield object.
+        :return: None
+        """
+        if self.backend == self.ARRAY:
+            self.bullets.cull(playfield)
+            return
+        projectiles = self.projectiles
+        projectiles.sync()
+        x, y = projectiles.positions[:, 0], projectiles.positions[:, 1]
+        for index in np.flatnonzero((x < 0) | (x > playfield.width) | (y < 0) | (y > playfield.height)).tolist():
+            projectiles.objects[index].destroy()
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> list[pygame.Rect]:
+        """
+        Draws every bullet, in a single blits call for the array backend.
+        :param screen: screen to draw on.
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: areas of the screen drawn on.
+        """
+        if self.backend == self.ARRAY:
+            return self.bullets.draw(screen, alpha)
+        return [bullet.draw(screen, alpha) for bullet in self.projectiles]
+
+    def stats(self) -> dict:
+        """
+        Returns the enemy fire statistics.
+        :return: enemy fire statistics.
+        """
+        return {
+            'enemy_bullets': len(self),
+            'enemy_bullets_fired': self.fired,
+            'enemy_bullets_dropped': self.dropped,
+            'enemy_bullet_hits': self.hits,
+        }
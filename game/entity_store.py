@@ -0,0 +1,263 @@
+"""
+This module contains the EntityStore class.
+The entity store keeps one group of entities (the enemies, the projectiles of a weapon) densely packed,
+with their positions, velocities, kinds and alive flags in NumPy arrays, so per-tick passes run vectorized
+and removing an entity costs O(1) instead of rebuilding the list.
+"""
+import itertools
+import numpy as np
+
+
+class EntityStore:
+    """
+    Entity store class.
+    Entities are referred to by handles that pack a slot and a generation, so a stale handle to a removed
+    entity never resolves to whatever reused its slot.
+    The live entities are the first len(store) entries of every dense array, in the same order as store.objects.
+    Pymunk bodies stay the source of truth for physics; sync() copies their state into the arrays.
+    """
+    # Handle Magic Numbers
+    SLOT_BITS = 32
+    SLOT_MASK = (1 << SLOT_BITS) - 1
+
+    # Storage Magic Numbers
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        capacity = max(capacity, 1)
+        self.count = 0
+        self.objects = []
+        self.bodies = []
+
+        # Dense arrays, indexed like objects
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.slot_of = np.zeros(capacity, dtype=np.int64)
+
+        # Sparse slots, indexed by handle
+        self.index_of = np.zeros(capacity, dtype=np.int64)
+        self.generation = np.zeros(capacity, dtype=np.int64)
+        self.free_slots = []
+        self.next_slot = 0
+
+        # Handles of entities destroyed since the last reap
+        self.dying = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Positions of the live entities as of the last sync.
+        :return: array of (x, y) rows.
+        """
+        return self.position[:self.count]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """
+        Velocities of the live entities as of the last sync.
+        :return: array of (vx, vy) rows.
+        """
+        return self.velocity[:self.count]
+
+    @property
+    def kinds(self) -> np.ndarray:
+        """
+        Kinds of the live entities.
+        :return: array of settings.*_KIND values.
+        """
+        return self.kind[:self.count]
+
+    def add(self, entity, kind: int) -> int:
+        """
+        Adds an entity and makes it a view over its entry.
+        :param entity: ship or projectile with a pymunk body.
+        :param kind: entity kind, one of the settings.*_KIND values.
+        :return: handle of the entity.
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            slot = self.next_slot
+            self.next_slot += 1
+            if slot == len(self.index_of):
+                self.__grow_slots()
+        index = self.count
+        if index == len(self.position):
+            self.__grow_dense()
+
+        self.index_of[slot] = index
+        self.slot_of[index] = slot
+        self.position[index] = entity.body.position
+        self.velocity[index] = entity.body.velocity
+        self.kind[index] = kind
+        self.alive[index] = True
+        self.objects.append(entity)
+        self.bodies.append(entity.body)
+        self.count += 1
+
+        handle = int(self.generation[slot]) << self.SLOT_BITS | slot
+        entity.store = self
+        entity.entity = handle
+        return handle
+
+    def valid(self, handle: int) -> bool:
+        """
+        Checks if a handle still refers to an entity of the store.
+        :param handle: entity handle.
+        :return: True if the entity has not been removed, False otherwise.
+        """
+        slot = handle & self.SLOT_MASK
+        return slot < self.next_slot and self.generation[slot] == handle >> self.SLOT_BITS
+
+    def get(self, handle: int):
+        """
+        Returns the entity a handle refers to.
+        :param handle: entity handle.
+        :return: entity, or None if it was removed.
+        """
+        if not self.valid(handle):
+            return None
+        return self.objects[self.index_of[handle & self.SLOT_MASK]]
+
+    def kill(self, handle: int) -> None:
+        """
+        Marks an entity as dead; it stays in the store until the next reap.
+        :param handle: entity handle.
+        :return: None
+        """
+        if not self.valid(handle):
+            return
+        index = self.index_of[handle & self.SLOT_MASK]
+        if self.alive[index]:
+            self.alive[index] = False
+            self.dying.append(handle)
+
+    def remove(self, handle: int):
+        """
+        Removes an entity by moving the last entry into its place.
+        :param handle: entity handle.
+        :return: removed entity.
+        """
+        slot = handle & self.SLOT_MASK
+        index = self.index_of[slot]
+        last = self.count - 1
+        entity = self.objects[index]
+        if index != last:
+            moved_slot = self.slot_of[last]
+            self.position[index] = self.position[last]
+            self.velocity[index] = self.velocity[last]
+            self.kind[index] = self.kind[last]
+            self.alive[index] = self.alive[last]
+            self.slot_of[index] = moved_slot
+            self.index_of[moved_slot] = index
+            self.objects[index] = self.objects[last]
+            self.bodies[index] = self.bodies[last]
+        self.objects.pop()
+        self.bodies.pop()
+        self.alive[last] = False
+        self.count = last
+
+        self.generation[slot] += 1
+        self.free_slots.append(slot)
+        entity.store = None
+        entity.entity = None
+        return entity
+
+    def reap(self) -> list:
+        """
+        Removes every entity killed since the last reap, in slot order, so the dense order afterwards does not
+        depend on the order pymunk reported the collisions in.
+        Costs O(k log k) for k killed entities, however many entities are alive.
+        :return: removed entities.
+        """
+        removed = [self.remove(handle) for handle in sorted(self.dying, key=lambda handle: handle & self.SLOT_MASK)
+                   if self.valid(handle)]
+        self.dying.clear()
+        return removed
+
+    def sync(self) -> None:
+        """
+        Copies the positions and velocities of every live body into the dense arrays in one pass.
+        :return: None
+        """
+        count = self.count
+        if not count:
+            return
+        state = np.fromiter(itertools.chain.from_iterable((*body.position, *body.velocity) for body in self.bodies),
+                            dtype=np.float64, count=count * 4).reshape(count, 4)
+        self.position[:count] = state[:, :2]
+        self.velocity[:count] = state[:, 2:]
+
+    def restore(self, objects: list, slot_of: np.ndarray, alive: np.ndarray, index_of: np.ndarray,
+                generation: np.ndarray, free_slots: list[int], dying: list[int], rows: np.ndarray = None) -> None:
+        """
+        Replaces the contents of the store with a saved layout, so handles and slots match the saved ones.
+        :param objects: entities, in dense order.
+        :param slot_of: slot of every entity.
+        :param alive: alive flag of every entity.
+        :param index_of: dense index of every slot in use so far.
+        :param generation: generation of every slot in use so far.
+        :param free_slots: slots free for reuse.
+        :param dying: handles of the entities killed since the last reap.
+        :param rows: positions and velocities of the bodies in dense order, None to read them from the bodies.
+        :return: None
+        """
+        for entity in self.objects:
+            entity.store = None
+            entity.entity = None
+        count = len(objects)
+        while len(self.position) < count:
+            self.__grow_dense()
+        while len(self.index_of) < len(index_of):
+            self.__grow_slots()
+
+        self.count = count
+        self.objects[:] = objects
+        self.bodies[:] = [entity.body for entity in objects]
+        self.kind[:count] = np.fromiter((entity.KIND for entity in objects), dtype=np.int8, count=count)
+        self.alive[:count] = alive
+        self.alive[count:] = False
+        self.slot_of[:count] = slot_of
+        self.next_slot = len(index_of)
+        self.index_of[:self.next_slot] = index_of
+        self.generation[:self.next_slot] = generation
+        self.free_slots[:] = free_slots
+        self.dying[:] = dying
+
+        for entity, handle in zip(objects, (self.generation[slot_of] << self.SLOT_BITS | slot_of).tolist()):
+            entity.store = self
+            entity.entity = handle
+        if rows is None:
+            self.sync()
+        else:
+            self.position[:count] = rows[:, :2]
+            self.velocity[:count] = rows[:, 2:4]
+
+    def __grow_dense(self) -> None:
+        """
+        Doubles the capacity of the dense arrays.
+        :return: None
+        """
+        capacity = len(self.position) * 2
+        self.position = np.resize(self.position, (capacity, 2))
+        self.velocity = np.resize(self.velocity, (capacity, 2))
+        self.kind = np.resize(self.kind, capacity)
+        self.alive = np.resize(self.alive, capacity)
+        self.slot_of = np.resize(self.slot_of, capacity)
+
+    def __grow_slots(self) -> None:
+        """
+        Doubles the number of slots.
+        :return: None
+        """
+        capacity = len(self.index_of) * 2
+        self.index_of = np.resize(self.index_of, capacity)
+        self.generation = np.concatenate((self.generation, np.zeros(capacity - len(self.generation), dtype=np.int64)))
@@ -0,0 +1,57 @@
+"""
+This module contains the FormationController class.
+The formation controller moves a whole enemy army in one vectorized pass.
+"""
+import numpy as np
+from game.entity_store import EntityStore
+from game.ship import Ship
+from game.playfield import Playfield
+from game import settings
+
+
+class FormationController:
+    """
+    Formation controller class.
+    Moves every enemy at once by the formation rules:
+    enemies on an even file move right until they reach the right edge of the playfield,
+    enemies on an odd file move left until they reach the left edge, and at the edge they move down
+    to the next file. Enemies between files keep their velocity until they arrive on one.
+    """
+    # Formation Magic Numbers
+    FIRST_FILE = settings.SCREEN_FILE[0]
+
+    def __init__(self, playfield: Playfield = None):
+        self.playfield = Playfield() if playfield is None else playfield
+
+    def move(self, enemies: EntityStore) -> None:
+        """
+        Moves every enemy of the army.
+        Velocities are only written back for the enemies whose velocity changes.
+        :param enemies: entity store of the enemies to move, synced with their bodies.
+        :return: None
+        """
+        if not len(enemies):
+            return
+        x, y = enemies.positions[:, 0], enemies.positions[:, 1]
+        current = enemies.velocities
+
+        # File lookup by arithmetic instead of scanning settings.SCREEN_FILE
+        file = np.rint((y - self.FIRST_FILE) / settings.SCREEN_FILE_DIFF)
+        on_file = (file >= 0) & (file < self.playfield.total_files) & \
+                  (np.abs(y - (self.FIRST_FILE + file * settings.SCREEN_FILE_DIFF)) <= settings.FILE_TOLERANCE)
+        even = on_file & (file % 2 == 0)
+        odd = on_file & (file % 2 == 1)
+
+        # Pick one of the three thrusts for every enemy on a file
+        velocities = current.copy()
+        velocities[even] = Ship.THRUST_RIGHT
+        velocities[odd] = Ship.THRUST_LEFT
+        velocities[(even & (x >= self.playfield.right_edge)) | (odd & (x <= self.playfield.left_edge))] = \
+            Ship.THRUST_DOWN
+
+        # Write back only what changed
+        changed = np.flatnonzero(on_file & np.any(velocities != current, axis=1))
+        bodies = enemies.bodies
+        for index, velocity in zip(changed.tolist(), velocities[changed].tolist()):
+            bodies[index].velocity = velocity
+        current[changed] = velocities[changed]
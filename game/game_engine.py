@@ -2,19 +2,49 @@
 This module handles the main class of the game:
 GameObjectFactory, GameLogic, GameRenderer, and Engine.
 """
+import contextlib
+import itertools
+import time
+import numpy as np
 import pymunk.pygame_util
 from game.player import Player
 from game.enemy import Enemy
 from game.ship import Ship
+from game.sprite_cache import SpriteCache
+from game.assets import AssetManager
+from game.animation import Animator
+from game.projectile_pool import ProjectilePool
+from game.formation import FormationController
+from game.clock import SimulationClock
+from game.profiler import FrameProfiler
+from game.playfield import Playfield
+from game.entity_store import EntityStore
+from game.enemy_fire import EnemyFireController
+from game.kinematic import KinematicProjectiles
+from game.game_state import GameState
+from game.lifecycle import LifecycleManager
 from game.weapon import *
 
 
 class GameObjectFactory:
     """
     Factory class for creating game objects.
+    Assigns every ship its collision category, so pymunk never pairs shapes the Engine does not handle.
+    The player carries every weapon from the start, all firing into the factory's projectile registry.
     """
-    def __init__(self, space: pymunk.Space):
+    # Collision Filters
+    PLAYER_FILTER = pymunk.ShapeFilter(categories=settings.PLAYER_CATEGORY, mask=settings.PLAYER_MASK)
+    ENEMY_FILTER = pymunk.ShapeFilter(categories=settings.ENEMY_CATEGORY, mask=settings.ENEMY_MASK)
+
+    def __init__(self, space: pymunk.Space, projectile_pool: ProjectilePool = None, clock: SimulationClock = None,
+                 collision_filtering: bool = True, kinematic_projectiles: KinematicProjectiles = None):
         self.space = space
+        self.projectile_pool = ProjectilePool(space, collision_filtering) if projectile_pool is None \
+            else projectile_pool
+        self.projectiles = EntityStore()
+        self.kinematic_projectiles = kinematic_projectiles
+        self.clock = clock
+        self.collision_filtering = collision_filtering
 
     def create_player(self, x: int, y: int) -> Player:
         """
@@ -24,9 +54,18 @@ class GameObjectFactory:
         :return: player object.
         """
         player = Player(x, y)
+        if self.collision_filtering:
+            player.shape.filter = self.PLAYER_FILTER
         # Add player body to physics space
         self.space.add(player.body, player.shape)
-        # Add Gun decorator to player
+        # Share the projectile pool with the player's weapons
+        player.projectile_pool = self.projectile_pool
+        # Weapons selected for the kinematic backend fire into its arrays instead
+        player.kinematic_projectiles = self.kinematic_projectiles
+        # Time the player's weapons with the simulation clock
+        player.clock = self.clock
+        # Create every weapon once, firing into one projectile registry, and start with the Gun
+        player.inventory = WeaponInventory(player, tuple(WEAPONS.values()), self.projectiles)
         player.equip_weapon(Gun)
 
         return player
@@ -39,6 +78,8 @@ class GameObjectFactory:
         :return: enemy object.
         """
         enemy = Enemy(x, y)
+        if self.collision_filtering:
+            enemy.shape.filter = self.ENEMY_FILTER
         # Add enemy body to physics space
         self.space.add(enemy.body, enemy.shape)
 
@@ -65,15 +106,36 @@ class GameObjectFactory:
 class GameLogic:
     """
     Game logic class for updating game state.
+    Enemies and projectiles live in entity stores, so destroyed ones are removed one by one
+    instead of rebuilding their lists every tick, and the lifecycle manager takes them out of the physics space.
+    The whole state can be saved into and restored from a GameState, to roll back or try out ticks.
     """
-    def __init__(self, space: pymunk.Space, player: Player, enemies: list[Enemy]):
+    def __init__(self, space: pymunk.Space, player: Player, enemies: list[Enemy],
+                 projectile_pool: ProjectilePool = None, clock: SimulationClock = None, playfield: Playfield = None,
+                 enemy_fire: EnemyFireController = None, kinematic_projectiles: KinematicProjectiles = None):
         self.space = space
         self.player = player
-        self.enemies = enemies
+        # The whole army, destroyed or not; enemies keep their army position as their store slot
+        self.army = list(enemies)
+        self.ships = [player, *self.army]
+        self.enemies = EntityStore(len(enemies))
+        for enemy in enemies:
+            self.enemies.add(enemy, enemy.KIND)
+        self.projectile_pool = projectile_pool
+        # Every projectile the player fired, whichever weapon is equipped
+        self.projectiles = player.weapon.projectiles
+        self.clock = SimulationClock() if clock is None else clock
+        self.playfield = Playfield() if playfield is None else playfield
+        self.formation = FormationController(self.playfield)
+        self.enemy_fire = enemy_fire
+        self.kinematic_projectiles = kinematic_projectiles
+        self.lifecycle = LifecycleManager(space, projectile_pool)
+        self.profiler = None
 
     def update(self, keys: pygame.key.ScancodeWrapper) -> bool:
         """
-        Updates game state.
+        Updates game state by one fixed physics tick.
+        Each phase is timed while a profiler is attached.
         :param keys: user input.
         :return: True if game over, False otherwise.
         """
@@ -81,17 +143,33 @@ class GameLogic:
         if self.is_game_over():
             return True
 
+        profiler = self.profiler
+        if profiler:
+            start = time.perf_counter()
+
         # Update positions
         self.__update_positions(keys)
+        if profiler:
+            start = profiler.lap(FrameProfiler.UPDATE_POSITIONS, start)
 
         # Destroy objects that are out of bounds
         self.__destroy_out_of_bounds_objects()
+        if profiler:
+            start = profiler.lap(FrameProfiler.DESTROY_OUT_OF_BOUNDS, start)
 
-        # Remove destroyed objects from game
+        # Remove objects destroyed since the last step from game and physics space
         self.__remove_destroyed_objects()
+        if profiler:
+            start = profiler.lap(FrameProfiler.REMOVE_DESTROYED, start)
 
         # Update physics simulation
         self.__update_physics()
+        if profiler:
+            profiler.lap(FrameProfiler.SPACE_STEP, start)
+            profiler.count(enemies=len(self.enemies), projectiles=len(self.projectiles),
+                           enemy_bullets=len(self.enemy_fire) if self.enemy_fire is not None else 0,
+                           kinematic=len(self.kinematic_projectiles) if self.kinematic_projectiles is not None else 0,
+                           bodies=len(self.space.bodies))
 
         return False
 
@@ -106,6 +184,93 @@ class GameLogic:
             return True
         return False
 
+    def save_state(self, state: GameState = None) -> GameState:
+        """
+        Saves the game state.
+        :param state: state to overwrite, None to allocate one.
+        :return: saved state.
+        """
+        if state is None:
+            state = GameState(len(self.ships))
+        state.ticks = self.clock.ticks
+        state.weapon = list(WEAPONS.values()).index(type(self.player.weapon))
+        for row, weapon_type in enumerate(WEAPONS.values()):
+            weapon = self.player.inventory.weapons.get(weapon_type)
+            state.weapons[row] = (weapon.burst_count, weapon.time_since_last_shot) if weapon is not None else 0
+        state.ships.save(self.ships)
+        state.enemies.save(self.enemies)
+        state.projectiles.save(self.projectiles)
+        if self.enemy_fire is not None:
+            state.enemy_projectiles.save(self.enemy_fire.projectiles)
+            state.bullets.save(self.enemy_fire.bullets)
+        if self.kinematic_projectiles is not None:
+            state.kinematic.save(self.kinematic_projectiles)
+        return state
+
+    def restore_state(self, state: GameState) -> None:
+        """
+        Restores a saved game state.
+        Live projectiles of the saved kinds stay where they are, and only the difference goes back to or comes
+        from the projectile pool.
+        :param state: saved state.
+        :return: None
+        """
+        self.clock.ticks = state.ticks
+        self.clock.time = state.ticks * self.clock.timestep
+
+        # Player, weapons and army
+        for weapon_type, (burst_count, time_since_last_shot) in zip(WEAPONS.values(), state.weapons.tolist()):
+            weapon = self.player.inventory.get(weapon_type)
+            weapon.burst_count = int(burst_count)
+            weapon.time_since_last_shot = time_since_last_shot
+        self.player.equip_weapon(list(WEAPONS.values())[state.weapon])
+        state.ships.restore(self.ships, self.space)
+        army = self.army
+        slots = state.enemies.slot_of[:state.enemies.count]
+        # The player is the first ship row, so an enemy's row is one past its slot
+        state.enemies.restore(self.enemies, [army[slot] for slot in slots.tolist()], state.ships.rows[slots + 1])
+
+        # Projectiles
+        self.__restore_projectiles(self.projectiles, state.projectiles, enemy_fire=False)
+        if self.enemy_fire is not None:
+            self.__restore_projectiles(self.enemy_fire.projectiles, state.enemy_projectiles, enemy_fire=True)
+            state.bullets.restore(self.enemy_fire.bullets)
+        if self.kinematic_projectiles is not None:
+            state.kinematic.restore(self.kinematic_projectiles)
+
+    def __restore_projectiles(self, projectiles: EntityStore, state, enemy_fire: bool) -> None:
+        """
+        Fills a projectile store with the saved projectiles, reusing the projectiles already in it.
+        :param projectiles: entity store of projectiles.
+        :param state: saved projectile state.
+        :param enemy_fire: whether enemies fired the projectiles.
+        :return: None
+        """
+        # Live projectiles by type, in store order
+        spare = {}
+        for projectile in reversed(projectiles.objects):
+            spare.setdefault(type(projectile), []).append(projectile)
+
+        objects = []
+        for kind in state.kinds[:state.bodies.count].tolist():
+            projectile_type = PROJECTILES[kind]
+            if spare.get(projectile_type):
+                objects.append(spare[projectile_type].pop())
+            elif self.projectile_pool is None:
+                objects.append(projectile_type(0, 0, (0, 0), space=self.space, enemy_fire=enemy_fire))
+            else:
+                objects.append(self.projectile_pool.acquire(projectile_type, 0, 0, (0, 0), enemy_fire))
+
+        # Live projectiles the state has no place for leave the game
+        for projectile in itertools.chain.from_iterable(spare.values()):
+            if self.projectile_pool is None:
+                projectile.retire()
+            else:
+                self.projectile_pool.release(projectile)
+
+        state.bodies.restore(objects, self.space)
+        state.store.restore(projectiles, objects, state.bodies.rows[:state.bodies.count])
+
     def __update_positions(self, keys: pygame.key.ScancodeWrapper) -> None:
         """
         Updates game object positions.
@@ -115,8 +280,12 @@ class GameLogic:
         self.player.player_key(keys)
 
         # Update enemy positions
-        for enemy in self.enemies:
-            enemy.move()
+        self.enemies.sync()
+        self.formation.move(self.enemies)
+
+        # Fire the enemy bullet pattern
+        if self.enemy_fire is not None:
+            self.enemy_fire.fire(self.enemies, self.player, self.clock.ticks)
 
     def __destroy_out_of_bounds_objects(self) -> None:
         """
@@ -124,93 +293,266 @@ class GameLogic:
         :return: None.
         """
         # Destroy projectiles that are out of bounds
-        for projectile in self.player.weapon.projectiles:
-            if projectile.body.position.y < 0:
-                projectile.destroy()
-        # Destroy enemies that are out of bounds
-        for enemy in self.enemies:
-            if enemy.body.position.x > settings.SCREEN_WIDTH + settings.SHIP_WIDTH \
-                    or enemy.body.position.x < 0:
-                enemy.destroy()
+        projectiles = self.projectiles
+        projectiles.sync()
+        y = projectiles.positions[:, 1]
+        for index in np.flatnonzero((y < 0) | (y > self.playfield.height)).tolist():
+            projectiles.objects[index].destroy()
+        # Destroy enemies that are out of bounds, from the positions synced this tick
+        x = self.enemies.positions[:, 0]
+        for index in np.flatnonzero((x > self.playfield.width + settings.SHIP_WIDTH) | (x < 0)).tolist():
+            self.enemies.objects[index].destroy()
+        # Destroy kinematic projectiles that are out of bounds
+        if self.kinematic_projectiles is not None:
+            self.kinematic_projectiles.cull(self.playfield)
+        # Destroy enemy bullets that are out of bounds
+        if self.enemy_fire is not None:
+            self.enemy_fire.cull(self.playfield)
         # Destroy player if out of bounds
-        if self.player.body.position.x > settings.SCREEN_WIDTH + settings.SHIP_WIDTH \
+        if self.player.body.position.x > self.playfield.width + settings.SHIP_WIDTH \
                 or self.player.body.position.x < 0:
             self.player.destroy()
 
     def __remove_destroyed_objects(self) -> None:
-        self.enemies = [enemy for enemy in self.enemies if not enemy.destroyed]
-        self.player.weapon.projectiles = [projectile for projectile in self.player.weapon.projectiles if
-                                          not projectile.destroyed]
+        """
+        Removes destroyed objects from the game.
+        Runs between two steps, so every object destroyed by a collision callback or out of bounds leaves
+        the physics space here: enemies with their bodies, and projectiles back to the projectile pool.
+        :return: None.
+        """
+        lifecycle = self.lifecycle
+        lifecycle.collect(self.enemies)
+        lifecycle.collect(self.projectiles)
+        if self.enemy_fire is not None:
+            lifecycle.collect(self.enemy_fire.projectiles)
 
     def __update_physics(self) -> None:
         """
-        Updates physics simulation.
+        Updates physics simulation by one fixed timestep.
+        Kinematic projectiles are hit-tested against the enemies as they are before the step, then moved with them.
         :return: None.
         """
-        dt = 1.0 / settings.UPDATES_PER_SECOND
-        for x in range(1):
-            self.space.step(dt)
+        if self.kinematic_projectiles is not None:
+            self.kinematic_projectiles.collide(self.enemies, self.space, self.clock.timestep)
+            self.kinematic_projectiles.integrate(self.clock.timestep)
+        self.space.step(self.clock.timestep)
+        if self.enemy_fire is not None:
+            self.enemy_fire.step(self.clock.timestep, self.player)
+        self.clock.advance()
 
 
 class GameRenderer:
     """
     Game renderer class for rendering game objects.
     """
-    def __init__(self, screen: pygame.Surface, space: pymunk.Space, draw_options: pymunk.pygame_util.DrawOptions, debug: bool = False):
+    # Images
+    GAME_OVER_IMAGE = 'assets/Other/game_over.png'
+    IMAGES = (Player.PLAYER_IMAGE, Enemy.ENEMY_IMAGE, Bullet.BULLET_IMAGE, Rocket.ROCKET_IMAGE, Laser.LASER_IMAGE,
+              GAME_OVER_IMAGE, Player.ENGINE_IMAGE, Player.ENGINE_IDLE.sheet, Player.ENGINE_POWERING.sheet,
+              Bullet.ANIMATION.sheet, Rocket.ANIMATION.sheet, Laser.ANIMATION.sheet)
+
+    # Sprites and animations at the sizes they are drawn at, packed into the texture atlas
+    SPRITES = ((Player.PLAYER_IMAGE, Ship.SPRITE_SIZE), (Enemy.ENEMY_IMAGE, Ship.SPRITE_SIZE),
+               (Bullet.BULLET_IMAGE, (Bullet.RADIUS * 4, Bullet.RADIUS * 4)),
+               (Rocket.ROCKET_IMAGE, (Rocket.RADIUS * 4, Rocket.RADIUS * 4)),
+               (Laser.LASER_IMAGE, (Laser.RADIUS * 4, Laser.RADIUS * 4)))
+    ANIMATIONS = ((Player.ENGINE_IDLE, Ship.SPRITE_SIZE), (Player.ENGINE_POWERING, Ship.SPRITE_SIZE),
+                  (Enemy.ENGINE_IDLE, Ship.SPRITE_SIZE), (Enemy.ENGINE_POWERING, Ship.SPRITE_SIZE),
+                  (Bullet.ANIMATION, (Bullet.RADIUS * 4, Bullet.RADIUS * 4)),
+                  (Rocket.ANIMATION, (Rocket.RADIUS * 4, Rocket.RADIUS * 4)),
+                  (Laser.ANIMATION, (Laser.RADIUS * 4, Laser.RADIUS * 4)))
+
+    def __init__(self, screen: pygame.Surface, space: pymunk.Space, draw_options: pymunk.pygame_util.DrawOptions,
+                 debug: bool = False, dirty_rects: bool = False, enemy_fire: EnemyFireController = None,
+                 kinematic_projectiles: KinematicProjectiles = None):
         self.screen = screen
         self.space = space
         self.draw_options = draw_options
         self.debug = debug
+        self.dirty_rects = dirty_rects
+        self.enemy_fire = enemy_fire
+        self.kinematic_projectiles = kinematic_projectiles
+
+        # Areas drawn on in the previous frame and whether the whole screen must be redrawn
+        self.previous_rects = []
+        self.full_redraw = True
+        self.profiler = None
 
-    def render(self, player: Ship, enemies: list[Ship]) -> None:
+        # Capture buffers by downsampling factor and grayscale, allocated on first use
+        self.captures = {}
+
+    def render(self, player: Ship, enemies: list[Ship], alpha: float = 1.0) -> None:
         """
         Renders game objects.
+        In dirty-rect mode only the areas drawn on in this and the previous frame are cleared and updated.
         :param player: player object.
         :param enemies: list of enemy objects.
+        :param alpha: interpolation between the previous and the current physics tick.
         :return: None.
         """
+        profiler = self.profiler
+        if profiler:
+            start = time.perf_counter()
+
+        # Drop cached sprites if the display format changed
+        SpriteCache().validate(self.screen)
+
+        # Step every animation in use once, for all entities together
+        Animator().advance()
+
+        # Debug drawing is not tracked, so it always needs the full screen
+        partial = self.dirty_rects and not self.debug and not self.full_redraw
+
         # Clear screen
-        self.screen.fill(settings.SCREEN_COLOR)
+        if partial:
+            for rect in self.previous_rects:
+                self.screen.fill(settings.SCREEN_COLOR, rect)
+        else:
+            self.screen.fill(settings.SCREEN_COLOR)
 
         # Draw objects
-        player.draw(self.screen)
+        rects = [player.draw(self.screen, alpha)]
         if player.weapon:
             for projectile in player.weapon.projectiles:
-                projectile.draw(self.screen)
+                rects.append(projectile.draw(self.screen, alpha))
         for enemy in enemies:
-            enemy.draw(self.screen)
-            if enemy.weapon:
-                for projectile in enemy.weapon.projectiles:
-                    projectile.draw(self.screen)
+            rects.append(enemy.draw(self.screen, alpha))
+        if self.kinematic_projectiles is not None:
+            rects.extend(self.kinematic_projectiles.draw(self.screen, alpha))
+        if self.enemy_fire is not None:
+            rects.extend(self.enemy_fire.draw(self.screen, alpha))
 
         # Draw physics debug information
         if self.debug:
             self.space.debug_draw(self.draw_options)
 
+        # Draw profiler overlay
+        if profiler:
+            start = profiler.lap(FrameProfiler.RENDER, start)
+            rects.append(profiler.draw_overlay(self.screen))
+            start = time.perf_counter()
+
         # Update display
-        pygame.display.flip()
+        if partial:
+            self.__update_dirty_rects(self.previous_rects + rects)
+        else:
+            pygame.display.flip()
+        if profiler:
+            profiler.lap(FrameProfiler.DISPLAY_FLIP, start)
+
+        self.previous_rects = rects
+        self.full_redraw = self.debug
+
+    def __update_dirty_rects(self, rects: list[pygame.Rect]) -> None:
+        """
+        Updates the given areas of the display.
+        Falls back to a full flip when they cover too much of the screen.
+        :param rects: areas to update.
+        :return: None.
+        """
+        dirty_area = sum(rect.width * rect.height for rect in rects)
+        if dirty_area > settings.DIRTY_RECT_MAX_AREA * settings.SCREEN_WIDTH * settings.SCREEN_HEIGHT:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
 
     def render_game_over(self) -> None:
         """
         Renders game over screen.
         :return: None.
         """
+        # The next game frame must repaint everything
+        self.full_redraw = True
+
         # Clear screen
         self.screen.fill(settings.SCREEN_COLOR)
 
         # Draw game over image
-        image = pygame.image.load('assets/Other/game_over.png')
+        image = AssetManager().get(self.GAME_OVER_IMAGE)
         self.screen.blit(image, (settings.SCREEN_WIDTH / 2 - image.get_width() / 2, settings.SCREEN_HEIGHT / 2 - image.get_height() / 2))
 
         # Update display
         pygame.display.flip()
 
 
+    @contextlib.contextmanager
+    def pixels(self):
+        """
+        Exposes the screen pixels as a (width, height, 3) array viewing the surface, not a copy.
+        The surface stays locked, and cannot be drawn on, until the block ends.
+        :return: context manager yielding the pixel view.
+        """
+        view = pygame.surfarray.pixels3d(self.screen)
+        try:
+            yield view
+        finally:
+            del view
+
+    def capture(self, factor: int = 1, grayscale: bool = False) -> np.ndarray:
+        """
+        Copies the last rendered frame into a preallocated buffer, keeping every factor-th pixel of every
+        factor-th row, and optionally turning it to grayscale with integer luma weights.
+        The buffer is reused by the next capture with the same factor and grayscale.
+        :param factor: downsampling factor.
+        :param grayscale: whether to keep one luma channel instead of RGB.
+        :return: (height, width, 3) RGB or (height, width) grayscale array of uint8.
+        """
+        buffers = self.captures.get((factor, grayscale))
+        if buffers is None:
+            width, height = self.screen.get_size()
+            shape = (-(-height // factor), -(-width // factor))
+            if grayscale:
+                buffers = (np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint16),
+                           np.empty(shape, dtype=np.uint16))
+            else:
+                buffers = (np.empty((*shape, 3), dtype=np.uint8),)
+            self.captures[(factor, grayscale)] = buffers
+
+        frame = buffers[0]
+        with self.pixels() as view:
+            # The view is indexed (x, y), the buffer (row, column)
+            pixels = view[::factor, ::factor].transpose(1, 0, 2)
+            if not grayscale:
+                # One plane at a time; copying whole pixels against the reversed channel order is far slower
+                for channel in range(3):
+                    frame[..., channel] = pixels[..., channel]
+                return frame
+            luma, channel = buffers[1], buffers[2]
+            np.multiply(pixels[..., 0], settings.CAPTURE_LUMA[0], out=luma, dtype=np.uint16)
+            np.multiply(pixels[..., 1], settings.CAPTURE_LUMA[1], out=channel, dtype=np.uint16)
+            luma += channel
+            np.multiply(pixels[..., 2], settings.CAPTURE_LUMA[2], out=channel, dtype=np.uint16)
+            luma += channel
+        np.right_shift(luma, 8, out=frame, casting='unsafe')
+        return frame
+
+
 class Engine:
     """
     Engine class for housing static methods.
     """
 
+    @staticmethod
+    def register_collision_handlers(space: pymunk.Space) -> None:
+        """
+        Registers the game collision handlers on a physics space.
+        The handlers destroy both objects and skip pymunk's collision response: how simultaneous hits push each
+        other depends on the order pymunk solves them in, which follows shape hash IDs a restored state cannot
+        give back, so the response would make replays from a restored state drift.
+        :param space: space object.
+        :return: None.
+        """
+        player_collision_handler = space.add_collision_handler(settings.PLAYER_COLLISION_TYPE,
+                                                               settings.ENEMY_COLLISION_TYPE)
+        enemies_collision_handler = space.add_collision_handler(settings.ENEMY_COLLISION_TYPE,
+                                                                settings.PROJECTILE_COLLISION_TYPE)
+        # Enemy bullets, only with the pymunk enemy fire backend
+        player_hit_handler = space.add_collision_handler(settings.PLAYER_COLLISION_TYPE,
+                                                         settings.PROJECTILE_COLLISION_TYPE)
+        player_collision_handler.begin = Engine.on_collision_player
+        enemies_collision_handler.begin = Engine.on_collision_enemy
+        player_hit_handler.begin = Engine.on_collision_player
+
     @staticmethod
     def on_collision_player(arbiter, space: pymunk.Space, data) -> bool:
         """
@@ -218,7 +560,7 @@ class Engine:
         :param arbiter: ???
         :param space: space object.
         :param data: ???
-        :return: True if collision handled, False otherwise.
+        :return: False, so pymunk skips the collision response for the two destroyed objects.
         """
         # Get colliding objects
         shape_1, shape_2 = arbiter.shapes
@@ -227,7 +569,7 @@ class Engine:
         shape_1.belonging_object.destroy()
         shape_2.belonging_object.destroy()
 
-        return True
+        return False
 
     @staticmethod
     def on_collision_enemy(arbiter, space: pymunk.Space, data) -> bool:
@@ -236,16 +578,16 @@ class Engine:
         :param arbiter: ???
         :param space: space object.
         :param data: ???
-        :return: True if collision handled, False otherwise.
+        :return: False, so pymunk skips the collision response for the two destroyed objects.
         """
         # Get colliding objects
         shape_1, shape_2 = arbiter.shapes
 
-        # Remove colliding objects from physics space
+        # Keep the colliding shapes from hitting anything else this step; the lifecycle manager removes the bodies
         space.remove(shape_1, shape_2)
 
         # Destroy colliding objects
         shape_1.belonging_object.destroy()
         shape_2.belonging_object.destroy()
 
-        return True
+        return False
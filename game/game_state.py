@@ -0,0 +1,350 @@
+"""
+This module contains the GameState class and the parts it is made of.
+A game state holds everything GameLogic.update() reads in preallocated NumPy arrays, so saving and restoring
+a tick for rollback or what-if simulation copies numbers instead of building objects.
+Every part lists its arrays with the number of rows in use, which is also how the state is packed to bytes.
+"""
+import itertools
+import struct
+import numpy as np
+import pymunk
+from game.entity_store import EntityStore
+from game.kinematic import KinematicProjectiles
+from game.weapon import WEAPONS
+
+
+class BodyState:
+    """
+    Body state class.
+    Position, velocity, angle and angular velocity of a list of bodies, and three flags per ship or projectile:
+    whether it is destroyed, whether its shape is in the physics space and whether its body is.
+    """
+    # Row layout
+    COLUMNS = 6  # x, y, vx, vy, angle, angular velocity
+    DESTROYED = 0b01
+    IN_SPACE = 0b10
+    BODY_IN_SPACE = 0b100
+
+    def __init__(self, capacity: int):
+        self.count = 0
+        self.rows = np.zeros((capacity, self.COLUMNS))
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+
+    def reserve(self, count: int) -> None:
+        """
+        Makes room for a number of bodies.
+        :param count: number of bodies.
+        :return: None
+        """
+        if count > len(self.rows):
+            self.__init__(count * 2)
+        self.count = count
+
+    def fields(self) -> list[tuple[np.ndarray, int]]:
+        """
+        Lists the arrays of the part with their rows in use.
+        :return: (array, rows) pairs.
+        """
+        return [(self.rows, self.count), (self.flags, self.count)]
+
+    def save(self, entities: list) -> None:
+        """
+        Copies the bodies and flags of entities.
+        :param entities: ships or projectiles.
+        :return: None
+        """
+        count = len(entities)
+        self.reserve(count)
+        if not count:
+            return
+        self.rows[:count] = np.fromiter(
+            itertools.chain.from_iterable((*entity.body.position, *entity.body.velocity, entity.body.angle,
+                                           entity.body.angular_velocity) for entity in entities),
+            dtype=np.float64, count=count * self.COLUMNS).reshape(count, self.COLUMNS)
+        self.flags[:count] = np.fromiter(
+            (entity.destroyed * self.DESTROYED | (entity.shape.space is not None) * self.IN_SPACE |
+             (entity.body.space is not None) * self.BODY_IN_SPACE for entity in entities), dtype=np.uint8, count=count)
+
+    def restore(self, entities: list, space) -> None:
+        """
+        Puts the saved bodies and flags back, in the order they were saved in.
+        Bodies are written with the property setters directly, and only the entities whose place in the space
+        changed are added or removed, in one call each.
+        :param entities: ships or projectiles.
+        :param space: space object.
+        :return: None
+        """
+        count = self.count
+        flags = self.flags[:count]
+        set_position, set_velocity = pymunk.Body.position.fset, pymunk.Body.velocity.fset
+        set_angle, set_angular_velocity = pymunk.Body.angle.fset, pymunk.Body.angular_velocity.fset
+        update_position = pymunk.Body.update_position
+        for entity, (x, y, vx, vy, angle, angular_velocity), destroyed in \
+                zip(entities, self.rows[:count].tolist(), (flags & self.DESTROYED).astype(bool).tolist()):
+            body = entity.body
+            set_position(body, (x, y))
+            set_velocity(body, (vx, vy))
+            set_angle(body, angle)
+            set_angular_velocity(body, angular_velocity)
+            # Drop the solver's position bias, which belongs to the tick the body is rewound from
+            update_position(body, 0)
+            entity.destroyed = destroyed
+
+        bodies = [entity.body for entity in entities[:count]]
+        shapes = [entity.shape for entity in entities[:count]]
+        body_in_space = np.fromiter(map(set(space.bodies).__contains__, bodies), dtype=bool, count=count)
+        shape_in_space = np.fromiter(map(set(space.shapes).__contains__, shapes), dtype=bool, count=count)
+        saved_body_in_space = (flags & self.BODY_IN_SPACE).astype(bool)
+        saved_shape_in_space = (flags & self.IN_SPACE).astype(bool)
+        # A shape goes into the space after its body and leaves it before
+        space.remove(*itertools.compress(shapes, (shape_in_space & ~saved_shape_in_space).tolist()))
+        space.remove(*itertools.compress(bodies, (body_in_space & ~saved_body_in_space).tolist()))
+        space.add(*itertools.compress(bodies, (saved_body_in_space & ~body_in_space).tolist()))
+        space.add(*itertools.compress(shapes, (saved_shape_in_space & ~shape_in_space).tolist()))
+
+
+class StoreState:
+    """
+    Store state class.
+    The layout of an entity store: which slot every entity sits in, the slot generations, the free slots and
+    the entities waiting to be reaped. Restoring it gives every entity back its handle.
+    """
+    def __init__(self, capacity: int):
+        self.count = 0
+        self.slots = 0
+        self.free_count = 0
+        self.dying_count = 0
+        self.slot_of = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.index_of = np.zeros(capacity, dtype=np.int64)
+        self.generation = np.zeros(capacity, dtype=np.int64)
+        self.free_slots = np.zeros(capacity, dtype=np.int64)
+        self.dying = np.zeros(capacity, dtype=np.int64)
+
+    def reserve(self, count: int, slots: int, free_count: int, dying_count: int) -> None:
+        """
+        Makes room for a store layout.
+        :param count: number of entities.
+        :param slots: number of slots used so far.
+        :param free_count: number of free slots.
+        :param dying_count: number of entities waiting to be reaped.
+        :return: None
+        """
+        capacity = max(count, slots, free_count, dying_count)
+        if capacity > len(self.slot_of):
+            self.__init__(capacity * 2)
+        self.count, self.slots, self.free_count, self.dying_count = count, slots, free_count, dying_count
+
+    def counts(self) -> tuple[int, int, int, int]:
+        """
+        Returns the sizes of the layout.
+        :return: entities, slots, free slots and entities waiting to be reaped.
+        """
+        return self.count, self.slots, self.free_count, self.dying_count
+
+    def fields(self) -> list[tuple[np.ndarray, int]]:
+        """
+        Lists the arrays of the part with their rows in use.
+        :return: (array, rows) pairs.
+        """
+        return [(self.slot_of, self.count), (self.alive, self.count), (self.index_of, self.slots),
+                (self.generation, self.slots), (self.free_slots, self.free_count), (self.dying, self.dying_count)]
+
+    def save(self, store: EntityStore) -> None:
+        """
+        Copies the layout of a store.
+        :param store: entity store.
+        :return: None
+        """
+        self.reserve(store.count, store.next_slot, len(store.free_slots), len(store.dying))
+        self.slot_of[:self.count] = store.slot_of[:self.count]
+        self.alive[:self.count] = store.alive[:self.count]
+        self.index_of[:self.slots] = store.index_of[:self.slots]
+        self.generation[:self.slots] = store.generation[:self.slots]
+        self.free_slots[:self.free_count] = store.free_slots
+        self.dying[:self.dying_count] = store.dying
+
+    def restore(self, store: EntityStore, objects: list, rows: np.ndarray = None) -> None:
+        """
+        Puts the saved layout back into a store.
+        :param store: entity store.
+        :param objects: entities, in the saved dense order.
+        :param rows: saved body rows of the entities, in the same order, None to read the bodies again.
+        :return: None
+        """
+        store.restore(objects, self.slot_of[:self.count], self.alive[:self.count], self.index_of[:self.slots],
+                      self.generation[:self.slots], self.free_slots[:self.free_count].tolist(),
+                      self.dying[:self.dying_count].tolist(), rows)
+
+
+class ProjectileState:
+    """
+    Projectile state class.
+    A store of pymunk projectiles: its layout, and the kind and body of every projectile in it.
+    The projectiles themselves are not kept; restoring reuses the ones in the store and takes the rest from
+    the projectile pool.
+    """
+    def __init__(self, capacity: int):
+        self.store = StoreState(capacity)
+        self.bodies = BodyState(capacity)
+        self.kinds = np.zeros(capacity, dtype=np.int8)
+
+    def reserve(self, count: int, slots: int, free_count: int, dying_count: int) -> None:
+        """
+        Makes room for a projectile store.
+        :param count: number of projectiles.
+        :param slots: number of slots used so far.
+        :param free_count: number of free slots.
+        :param dying_count: number of projectiles waiting to be reaped.
+        :return: None
+        """
+        self.store.reserve(count, slots, free_count, dying_count)
+        self.bodies.reserve(count)
+        if count > len(self.kinds):
+            self.kinds = np.zeros(len(self.bodies.rows), dtype=np.int8)
+
+    def fields(self) -> list[tuple[np.ndarray, int]]:
+        """
+        Lists the arrays of the part with their rows in use.
+        :return: (array, rows) pairs.
+        """
+        return self.store.fields() + self.bodies.fields() + [(self.kinds, self.bodies.count)]
+
+    def save(self, store: EntityStore) -> None:
+        """
+        Copies a projectile store.
+        :param store: entity store of projectiles.
+        :return: None
+        """
+        self.store.save(store)
+        self.bodies.save(store.objects)
+        self.reserve(*self.store.counts())
+        self.kinds[:len(store)] = store.kinds
+
+
+class ArrayState:
+    """
+    Array state class.
+    The live rows of kinematic projectiles.
+    """
+    def __init__(self, capacity: int):
+        self.count = 0
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+
+    def reserve(self, count: int) -> None:
+        """
+        Makes room for a number of projectiles.
+        :param count: number of projectiles.
+        :return: None
+        """
+        if count > len(self.position):
+            self.__init__(count * 2)
+        self.count = count
+
+    def fields(self) -> list[tuple[np.ndarray, int]]:
+        """
+        Lists the arrays of the part with their rows in use.
+        :return: (array, rows) pairs.
+        """
+        return [(self.position, self.count), (self.velocity, self.count), (self.radius, self.count),
+                (self.kind, self.count)]
+
+    def save(self, projectiles: KinematicProjectiles) -> None:
+        """
+        Copies the live rows of kinematic projectiles.
+        :param projectiles: kinematic projectiles.
+        :return: None
+        """
+        self.reserve(len(projectiles))
+        for (saved, count), live in zip(self.fields(), (projectiles.position, projectiles.velocity,
+                                                        projectiles.radius, projectiles.kind)):
+            saved[:count] = live[:count]
+
+    def restore(self, projectiles: KinematicProjectiles) -> None:
+        """
+        Puts the saved rows back.
+        :param projectiles: kinematic projectiles.
+        :return: None
+        """
+        projectiles.count = self.count
+        for (saved, count), live in zip(self.fields(), (projectiles.position, projectiles.velocity,
+                                                        projectiles.radius, projectiles.kind)):
+            live[:count] = saved[:count]
+
+
+class GameState:
+    """
+    Game state class.
+    The clock, the equipped weapon and the burst state of every weapon in the player's inventory, the player
+    and every enemy of the army (destroyed or not) in army order, the enemy store layout, the pymunk projectile
+    stores and the kinematic and array bullets.
+    The arrays are allocated once for the given capacities and only grow when a save outgrows them.
+    Pymunk's own caches, contact persistence and the broadphase, are not part of the state. No contact outlives
+    the step it starts in, since every collision the game handles destroys both shapes, and the collision
+    handlers skip the response that would depend on the broadphase order.
+    """
+    # Header: clock ticks, equipped weapon, then the sizes of every part: ships, three store layouts and
+    # two kinematic arrays
+    HEADER = struct.Struct('<qB15I')
+
+    def __init__(self, ships: int = 64, projectiles: int = 64, bullets: int = 256):
+        self.ticks = 0
+        self.weapon = 0
+        # Burst count and time since the last shot of every weapon, in WEAPONS order
+        self.weapons = np.zeros((len(WEAPONS), 2))
+        self.ships = BodyState(ships)
+        self.enemies = StoreState(ships)
+        self.projectiles = ProjectileState(projectiles)
+        self.enemy_projectiles = ProjectileState(projectiles)
+        self.kinematic = ArrayState(bullets)
+        self.bullets = ArrayState(bullets)
+
+    def fields(self) -> list[tuple[np.ndarray, int]]:
+        """
+        Lists the arrays of every part with their rows in use, in packing order.
+        :return: (array, rows) pairs.
+        """
+        return [(self.weapons, len(self.weapons))] + self.ships.fields() + self.enemies.fields() + \
+            self.projectiles.fields() + self.enemy_projectiles.fields() + self.kinematic.fields() + self.bullets.fields()
+
+    def tobytes(self) -> bytes:
+        """
+        Packs the state into a compact binary string, sized by what was saved rather than by the capacities.
+        :return: binary state.
+        """
+        header = self.HEADER.pack(self.ticks, self.weapon, self.ships.count, *self.enemies.counts(), *self.projectiles.store.counts(),
+                                  *self.enemy_projectiles.store.counts(), self.kinematic.count, self.bullets.count)
+        return header + b''.join(array[:count].tobytes() for array, count in self.fields())
+
+    def frombytes(self, data: bytes) -> 'GameState':
+        """
+        Unpacks a binary string from tobytes() into this state.
+        :param data: binary state.
+        :return: this state.
+        """
+        self.ticks, self.weapon, ships, *counts = self.HEADER.unpack_from(data)
+        self.ships.reserve(ships)
+        self.enemies.reserve(*counts[0:4])
+        self.projectiles.reserve(*counts[4:8])
+        self.enemy_projectiles.reserve(*counts[8:12])
+        self.kinematic.reserve(counts[12])
+        self.bullets.reserve(counts[13])
+
+        offset = self.HEADER.size
+        for array, count in self.fields():
+            size = array[:count].nbytes
+            array[:count] = np.frombuffer(data, array.dtype, size // array.dtype.itemsize, offset).reshape(
+                array[:count].shape)
+            offset += size
+        return self
+
+    @property
+    def size(self) -> int:
+        """
+        Size of the packed state.
+        :return: size in bytes.
+        """
+        return self.HEADER.size + sum(array[:count].nbytes for array, count in self.fields())
@@ -0,0 +1,177 @@
+"""
+This module contains the FrameGovernor class.
+The frame governor keeps a game within its frame budget when the CPU is busy: the simulation always runs
+every tick, while rendering first skips frames and then falls back to cheaper paths until there is
+headroom again.
+"""
+import time
+from game.game_engine import GameRenderer
+from game.animation import Animator
+from game import settings
+
+
+class FrameGovernor:
+    """
+    Frame governor class.
+    Wraps GameRenderer.render and watches how long each frame spent updating and rendering.
+    Quality levels, from best to cheapest, are: render every frame, skip frames, skip frames without
+    physics debug drawing, and skip frames without debug drawing or animations. A level taking away something
+    that was not asked for in the first place would change nothing, so the governor never uses it.
+    When the average frame goes over budget the governor moves one level down, and it moves back up once the
+    average predicted for the better level fits the budget with headroom. Levels change at most once per cooldown.
+    A render path not taken for a while is only known from stale averages, so after a probe interval the governor
+    moves up anyway to measure it again, and moves back down after the cooldown if it still does not fit.
+    Closing the governor gives the quality it took away back.
+    """
+    # Quality Levels
+    FULL = 0
+    SKIP_FRAMES = 1
+    NO_DEBUG = 2
+    NO_EFFECTS = 3
+    LEVELS = ('full', 'skip_frames', 'no_debug', 'no_effects')
+
+    # Render path of every level; skipping frames renders the rest in full
+    PATHS = (0, 0, 1, 2)
+
+    def __init__(self, renderer: GameRenderer, budget: float = 1 / settings.FRAMES_PER_SECOND,
+                 skip_frames: int = settings.GOVERNOR_SKIP_FRAMES, cooldown: int = settings.GOVERNOR_COOLDOWN):
+        self.renderer = renderer
+        self.budget = budget
+        self.skip_frames = skip_frames
+        self.cooldown = cooldown
+        self.level = self.FULL
+
+        # Quality asked for, which the governor only ever takes away and gives back
+        self.debug = renderer.debug
+        self.effects = Animator().enabled
+        self.levels = [level for level, useful in enumerate((True, True, self.debug, self.effects)) if useful]
+
+        # Moving averages in seconds: update time per frame, and render time of every render path
+        self.update_time = 0.0
+        self.render_time = [None] * len(set(self.PATHS))
+        self.skipped_in_row = 0
+        self.since_change = 0
+
+        # Governor statistics
+        self.frames = 0
+        self.rendered = 0
+        self.skipped = 0
+        self.over_budget = 0
+        self.downgrades = 0
+        self.upgrades = 0
+        self.level_frames = [0] * len(self.LEVELS)
+
+    def render(self, player, enemies, alpha: float, frame_start: float) -> bool:
+        """
+        Renders the frame unless the current level skips it, then adapts the level.
+        :param player: player object.
+        :param enemies: enemy objects.
+        :param alpha: interpolation between the previous and the current physics tick.
+        :param frame_start: perf_counter() value when the frame started updating.
+        :return: True if the frame was rendered, False if it was skipped.
+        """
+        start = time.perf_counter()
+        update_time = start - frame_start
+        rendering = self.level == self.FULL or self.skipped_in_row >= self.skip_frames
+        render_time = 0.0
+        if rendering:
+            self.renderer.render(player, enemies, alpha)
+            render_time = time.perf_counter() - start
+            self.rendered += 1
+            self.skipped_in_row = 0
+        else:
+            self.skipped += 1
+            self.skipped_in_row += 1
+
+        self.frames += 1
+        self.level_frames[self.level] += 1
+        self.__adapt(update_time, render_time if rendering else None)
+        return rendering
+
+    def __adapt(self, update_time: float, render_time: float | None) -> None:
+        """
+        Updates the moving averages and moves one level up or down.
+        :param update_time: time the frame spent updating, in seconds.
+        :param render_time: time the frame spent rendering, None if it was skipped.
+        :return: None
+        """
+        weight = settings.GOVERNOR_SMOOTHING
+        self.update_time += weight * (update_time - self.update_time)
+        if render_time is not None:
+            path = self.PATHS[self.level]
+            previous = self.render_time[path]
+            self.render_time[path] = render_time if previous is None else previous + weight * (render_time - previous)
+
+        frame_time = update_time + (render_time or 0.0)
+        if frame_time > self.budget:
+            self.over_budget += 1
+        self.since_change += 1
+        if self.since_change < self.cooldown:
+            return
+
+        position = self.levels.index(self.level)
+        if self.__predict(self.level) > self.budget and position + 1 < len(self.levels):
+            self.downgrades += 1
+            self.__set_level(self.levels[position + 1])
+        elif position > 0 and (self.__predict(self.levels[position - 1]) < settings.GOVERNOR_HEADROOM * self.budget
+                               or self.since_change >= settings.GOVERNOR_PROBE):
+            self.upgrades += 1
+            self.__set_level(self.levels[position - 1])
+
+    def __predict(self, level: int) -> float:
+        """
+        Predicts the average frame time at a level from the latest averages, counting skipped frames as free.
+        :param level: quality level.
+        :return: frame time in seconds.
+        """
+        render_time = self.render_time[self.PATHS[level]]
+        if render_time is None:
+            return 0.0
+        if level != self.FULL:
+            render_time /= self.skip_frames + 1
+        return self.update_time + render_time
+
+    def __set_level(self, level: int) -> None:
+        """
+        Switches the renderer to the quality of a level.
+        :param level: quality level.
+        :return: None
+        """
+        self.level = level
+        self.since_change = 0
+        self.skipped_in_row = 0
+        self.renderer.debug = self.debug and level < self.NO_DEBUG
+        Animator().enabled = self.effects and level < self.NO_EFFECTS
+        self.renderer.full_redraw = True
+
+    def close(self) -> None:
+        """
+        Gives the renderer and the animator back the quality asked for, whatever level the governor is at.
+        Animations are switched on the Animator singleton, for every renderer in the process.
+        :return: None
+        """
+        self.renderer.debug = self.debug
+        Animator().enabled = self.effects
+        self.renderer.full_redraw = True
+
+    def __enter__(self) -> 'FrameGovernor':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the governor statistics.
+        :return: governor statistics.
+        """
+        return {
+            'governor_level': self.LEVELS[self.level],
+            'governor_frames': self.frames,
+            'governor_rendered': self.rendered,
+            'governor_skipped': self.skipped,
+            'governor_over_budget': self.over_budget,
+            'governor_downgrades': self.downgrades,
+            'governor_upgrades': self.upgrades,
+            **{f'governor_frames_{self.LEVELS[level]}': self.level_frames[level] for level in self.levels},
+        }
@@ -0,0 +1,159 @@
+"""
+This module handles the headless simulation of the game.
+It drives GameLogic with scripted key states under the SDL dummy video driver
+and measures how many ticks per second the engine sustains.
+"""
+import os
+import random
+import time
+import pygame
+from game.world import World
+from game.profiler import FrameProfiler, percentile
+from game import settings
+
+
+class KeyState:
+    """
+    Scripted stand-in for pygame.key.ScancodeWrapper.
+    Only the keys in the pressed set read as held.
+    """
+    def __init__(self, pressed: frozenset[int] = frozenset()):
+        self.pressed = pressed
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+class KeyScript:
+    """
+    Key script class for producing the key state of each tick.
+    """
+    # Script Magic Numbers
+    STRAFE_PERIOD = 60
+    RANDOM_PERIOD = 15
+
+    IDLE = KeyState()
+    FIRE = KeyState(frozenset({pygame.K_SPACE}))
+    STRAFE_LEFT = KeyState(frozenset({pygame.K_a, pygame.K_SPACE}))
+    STRAFE_RIGHT = KeyState(frozenset({pygame.K_d, pygame.K_SPACE}))
+
+    RANDOM_CHOICES = (IDLE, FIRE, STRAFE_LEFT, STRAFE_RIGHT)
+    ARSENAL_CHOICES = RANDOM_CHOICES + (KeyState(frozenset({pygame.K_1, pygame.K_SPACE})),
+                                        KeyState(frozenset({pygame.K_2, pygame.K_SPACE})),
+                                        KeyState(frozenset({pygame.K_3, pygame.K_SPACE})))
+
+    NAMES = ('idle', 'fire', 'strafe', 'random', 'arsenal')
+
+    def __init__(self, name: str = 'strafe', seed: int = 0):
+        if name not in self.NAMES:
+            raise ValueError(f'Unknown key script: {name}')
+        self.name = name
+        self.random = random.Random(seed)
+        self.current = self.IDLE
+
+    def keys(self, tick: int) -> KeyState:
+        """
+        Returns the key state for a given tick.
+        :param tick: tick number.
+        :return: key state.
+        """
+        if self.name == 'idle':
+            return self.IDLE
+        if self.name == 'fire':
+            return self.FIRE
+        if self.name in ('random', 'arsenal'):
+            # Hold a seeded random choice for a few ticks at a time, switching weapons too in the arsenal script
+            if tick % self.RANDOM_PERIOD == 0:
+                choices = self.RANDOM_CHOICES if self.name == 'random' else self.ARSENAL_CHOICES
+                self.current = self.random.choice(choices)
+            return self.current
+        # Sweep left and right around the starting position while firing
+        if (tick // self.STRAFE_PERIOD) % 2 == 0:
+            return self.STRAFE_LEFT
+        return self.STRAFE_RIGHT
+
+
+class HeadlessRunner:
+    """
+    Headless runner class for benchmarking the game loop.
+    Each runner plays its own World, so several can run in one process.
+    """
+    def __init__(self, difficulty: int = settings.HARD, render: bool = False, dirty_rects: bool = False,
+                 seed: int = 0, profile: bool = False, world: World = None):
+        os.environ.setdefault('SDL_VIDEODRIVER', settings.HEADLESS_VIDEO_DRIVER)
+        pygame.init()
+
+        self.world = World(difficulty, seed) if world is None else world
+        self.space = self.world.space
+        self.player = self.world.player
+        self.game_logic = self.world.game_logic
+        self.projectile_pool = self.world.factory.projectile_pool
+
+        self.game_renderer = None
+        if render:
+            screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+            self.game_renderer = self.world.create_renderer(screen, dirty_rects=dirty_rects)
+
+        self.profiler = None
+        if profile:
+            self.profiler = FrameProfiler()
+            self.game_logic.profiler = self.profiler
+            if self.game_renderer:
+                self.game_renderer.profiler = self.profiler
+
+    def run(self, ticks: int = settings.BENCHMARK_TICKS, script: KeyScript = None, on_tick=None) -> dict:
+        """
+        Runs the game loop uncapped for a number of ticks or until game over.
+        :param ticks: maximum number of ticks to run.
+        :param script: key script driving the player.
+        :param on_tick: optional callable taking the tick number, called after each timed tick.
+        :return: benchmark results.
+        """
+        if script is None:
+            script = KeyScript()
+
+        latencies = []
+        peak_enemies = peak_projectiles = peak_bodies = 0
+        game_over = False
+
+        start = time.perf_counter()
+        for tick in range(ticks):
+            tick_start = time.perf_counter()
+            game_over = self.game_logic.update(script.keys(tick))
+            if self.game_renderer and not game_over:
+                self.game_renderer.render(self.player, self.game_logic.enemies)
+            latencies.append(time.perf_counter() - tick_start)
+            if on_tick:
+                on_tick(tick)
+
+            peak_enemies = max(peak_enemies, len(self.game_logic.enemies))
+            peak_projectiles = max(peak_projectiles, len(self.player.weapon.projectiles))
+            peak_bodies = max(peak_bodies, len(self.space.bodies))
+            if game_over:
+                break
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        return {
+            'ticks': len(latencies),
+            'elapsed': elapsed,
+            'ticks_per_second': len(latencies) / elapsed if elapsed else 0.0,
+            'latency_p50_ms': percentile(latencies, 50) * 1000,
+            'latency_p90_ms': percentile(latencies, 90) * 1000,
+            'latency_p99_ms': percentile(latencies, 99) * 1000,
+            'latency_max_ms': latencies[-1] * 1000 if latencies else 0.0,
+            'game_over': game_over,
+            'outcome': self.world.outcome(),
+            'enemies': len(self.game_logic.enemies),
+            'projectiles': len(self.player.weapon.projectiles),
+            'space_bodies': len(self.space.bodies),
+            'space_shapes': len(self.space.shapes),
+            'peak_enemies': peak_enemies,
+            'peak_projectiles': peak_projectiles,
+            'peak_space_bodies': peak_bodies,
+            **self.projectile_pool.stats(),
+            **(self.game_logic.enemy_fire.stats() if self.game_logic.enemy_fire is not None else {}),
+            **(self.game_logic.kinematic_projectiles.stats()
+               if self.game_logic.kinematic_projectiles is not None else {}),
+        }
+
@@ -0,0 +1,238 @@
+"""
+This module contains the KinematicProjectiles class.
+Kinematic projectiles skip pymunk altogether: they are rows of NumPy arrays, moved in one vectorized step
+and hit-tested against the enemy bounding boxes in batch.
+"""
+import numpy as np
+import pygame
+import pymunk
+from game.entity_store import EntityStore
+from game.projectile import Bullet, Rocket, Laser
+from game.playfield import Playfield
+from game.sprite_cache import SpriteCache
+from game.animation import Animator
+from game import settings
+
+
+class KinematicProjectiles:
+    """
+    Kinematic projectiles class.
+    Projectiles fly in straight lines, so a hit test sweeps each one along its displacement relative to every
+    enemy over the step; fast Lasers cannot tunnel through a ship between two ticks.
+    Enemies are approximated by the bounding box of their triangle, grown by the projectile radius.
+    Weapons whose type is in weapons fire into the arrays instead of launching pymunk projectiles.
+    """
+    # Projectile classes by kind, for their radius, impulse and animation, and their static images
+    TYPES = {settings.BULLET_KIND: Bullet, settings.ROCKET_KIND: Rocket, settings.LASER_KIND: Laser}
+    IMAGES = {settings.BULLET_KIND: Bullet.BULLET_IMAGE, settings.ROCKET_KIND: Rocket.ROCKET_IMAGE,
+              settings.LASER_KIND: Laser.LASER_IMAGE}
+
+    def __init__(self, weapons: tuple[type, ...] = (), capacity: int = settings.KINEMATIC_CAPACITY):
+        self.weapons = tuple(weapons)
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.count = 0
+
+        # Kinematic projectile statistics
+        self.launched = 0
+        self.dropped = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Positions of the live projectiles.
+        :return: array of (x, y) rows.
+        """
+        return self.position[:self.count]
+
+    def handles(self, weapon) -> bool:
+        """
+        Checks if a weapon fires kinematic projectiles.
+        :param weapon: weapon object.
+        :return: True if the weapon type was selected for the kinematic backend, False otherwise.
+        """
+        return isinstance(weapon, self.weapons)
+
+    def launch(self, projectile_type: type, x: float, y: float, direction: tuple[int, int]) -> None:
+        """
+        Launches one projectile with the velocity Projectile.launch() would give it.
+        :param projectile_type: concrete projectile class.
+        :param x: x coordinate.
+        :param y: y coordinate.
+        :param direction: direction to launch in.
+        :return: None
+        """
+        velocity = direction[0], direction[1] * projectile_type.IMPULSE
+        self.spawn(np.array(((x, y),)), np.array((velocity,)), projectile_type)
+
+    def spawn(self, positions: np.ndarray, velocities: np.ndarray, projectile_type: type) -> None:
+        """
+        Adds projectiles of one type, dropping the ones beyond the capacity.
+        :param positions: positions of the new projectiles.
+        :param velocities: velocities of the new projectiles.
+        :param projectile_type: concrete projectile class.
+        :return: None
+        """
+        room = self.capacity - self.count
+        if len(positions) > room:
+            self.dropped += len(positions) - room
+            positions, velocities = positions[:room], velocities[:room]
+        end = self.count + len(positions)
+        self.position[self.count:end] = positions
+        self.velocity[self.count:end] = velocities
+        self.radius[self.count:end] = projectile_type.RADIUS
+        self.kind[self.count:end] = projectile_type.KIND
+        self.count = end
+        self.launched += len(positions)
+
+    def integrate(self, timestep: float) -> None:
+        """
+        Moves every projectile by one timestep.
+        :param timestep: timestep in seconds.
+        :return: None
+        """
+        self.position[:self.count] += self.velocity[:self.count] * timestep
+
+    def sweep(self, enemies: EntityStore, timestep: float) -> list[tuple[int, int]]:
+        """
+        Finds the first enemy every projectile hits during the next timestep.
+        :param enemies: entity store of the enemies, synced with their bodies.
+        :param timestep: timestep in seconds.
+        :return: (projectile index, enemy index) pairs, at most one per enemy.
+        """
+        if not self.count or not len(enemies):
+            return []
+
+        # Broadphase: only the enemies whose swept box meets the box around every projectile segment
+        ends = self.position[:self.count] + self.velocity[:self.count] * timestep
+        reach = self.radius[:self.count].max()
+        low = np.minimum(self.position[:self.count], ends).min(axis=0) - reach
+        high = np.maximum(self.position[:self.count], ends).max(axis=0) + reach
+        corners = enemies.positions
+        moved = corners + enemies.velocities * timestep
+        near = enemies.alive[:len(enemies)] & \
+            (np.maximum(corners, moved) + (settings.SHIP_WIDTH, settings.SHIP_HEIGHT) >= low).all(axis=1) & \
+            (np.minimum(corners, moved) <= high).all(axis=1)
+        live = np.flatnonzero(near)
+        if not len(live):
+            return []
+
+        # Slab test of every projectile segment, relative to every enemy, against its grown box
+        start = self.position[:self.count, None, :]
+        motion = (self.velocity[:self.count, None, :] - enemies.velocities[None, live, :]) * timestep
+        radius = self.radius[:self.count, None, None]
+        low = enemies.positions[None, live, :] - radius
+        high = low + (settings.SHIP_WIDTH, settings.SHIP_HEIGHT) + 2 * radius
+        with np.errstate(divide='ignore', invalid='ignore'):
+            first = (low - start) / motion
+            second = (high - start) / motion
+        still = motion == 0
+        inside = (start >= low) & (start <= high)
+        enter = np.where(still, np.where(inside, -np.inf, np.inf), np.minimum(first, second)).max(axis=2)
+        leave = np.where(still, np.where(inside, np.inf, -np.inf), np.maximum(first, second)).min(axis=2)
+        hit = (enter <= leave) & (leave >= 0) & (enter <= 1)
+        if not hit.any():
+            return []
+
+        # Earliest hit of every projectile; an enemy only absorbs the first projectile to reach it
+        enter = np.where(hit, enter, np.inf)
+        projectiles = np.flatnonzero(hit.any(axis=1))
+        targets = enter[projectiles].argmin(axis=1)
+        pairs = []
+        taken = set()
+        for index in np.argsort(enter[projectiles, targets], kind='stable').tolist():
+            enemy = int(live[targets[index]])
+            if enemy not in taken:
+                taken.add(enemy)
+                pairs.append((int(projectiles[index]), enemy))
+        return pairs
+
+    def collide(self, enemies: EntityStore, space: pymunk.Space, timestep: float) -> None:
+        """
+        Destroys every enemy hit during the next timestep together with the projectile that hit it,
+        like Engine.on_collision_enemy does for pymunk projectiles.
+        :param enemies: entity store of the enemies, synced with their bodies.
+        :param space: space object.
+        :param timestep: timestep in seconds.
+        :return: None
+        """
+        pairs = self.sweep(enemies, timestep)
+        if not pairs:
+            return
+        keep = np.ones(self.count, dtype=bool)
+        for projectile, enemy_index in pairs:
+            enemy = enemies.objects[enemy_index]
+            if enemy.shape.space is not None:
+                space.remove(enemy.shape)
+            enemy.destroy()
+            keep[projectile] = False
+        self.hits += len(pairs)
+        self.keep(keep)
+
+    def cull(self, playfield: Playfield) -> None:
+        """
+        Removes the projectiles that left the playfield.
+        :param playfield: playfield object.
+        :return: None
+        """
+        if not self.count:
+            return
+        x, y = self.position[:self.count, 0], self.position[:self.count, 1]
+        inside = (x >= 0) & (x <= playfield.width) & (y >= 0) & (y <= playfield.height)
+        if not inside.all():
+            self.keep(inside)
+
+    def keep(self, keep: np.ndarray) -> None:
+        """
+        Compacts the arrays, keeping the selected projectiles in order.
+        :param keep: boolean mask over the live projectiles.
+        :return: None
+        """
+        kept = int(keep.sum())
+        for array in (self.position, self.velocity, self.radius, self.kind):
+            array[:kept] = array[:self.count][keep]
+        self.count = kept
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> list[pygame.Rect]:
+        """
+        Draws every projectile with one blits call per projectile type.
+        :param screen: screen to draw on.
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: areas of the screen drawn on.
+        """
+        if not self.count:
+            return []
+        animator = Animator()
+        lag = (1.0 - alpha) * settings.PHYSICS_TIMESTEP
+        corners = self.position[:self.count] - self.velocity[:self.count] * lag - 2 * self.radius[:self.count, None]
+        kinds = self.kind[:self.count]
+
+        rects = []
+        for kind in np.unique(kinds).tolist():
+            projectile_type = self.TYPES[kind]
+            size = (projectile_type.RADIUS * 4, projectile_type.RADIUS * 4)
+            if animator.enabled:
+                sprite = animator.frame(projectile_type.ANIMATION, size, 0)
+            else:
+                sprite = SpriteCache().get(self.IMAGES[kind], size)
+            rects.extend(screen.blits([(sprite, corner) for corner in corners[kinds == kind].tolist()]))
+        return rects
+
+    def stats(self) -> dict:
+        """
+        Returns the kinematic projectile statistics.
+        :return: kinematic projectile statistics.
+        """
+        return {
+            'kinematic_projectiles': self.count,
+            'kinematic_launched': self.launched,
+            'kinematic_dropped': self.dropped,
+            'kinematic_hits': self.hits,
+        }
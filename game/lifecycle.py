@@ -0,0 +1,65 @@
+"""
+This module contains the LifecycleManager class.
+Entities are destroyed wherever the game notices, often inside a collision callback in the middle of
+space.step(), but they only leave the physics space at one safe point between two steps, so the space
+holds the live entities and nothing else however long a session runs.
+"""
+import pymunk
+from game.entity_store import EntityStore
+from game.projectile import Projectile
+from game.projectile_pool import ProjectilePool
+
+
+class LifecycleManager:
+    """
+    Lifecycle manager class.
+    Reaps the entity stores of the game and retires every entity taken out of them: a ship's body and shape
+    leave the space, and a projectile goes back to the projectile pool, which takes it out of the space.
+    """
+    def __init__(self, space: pymunk.Space, projectile_pool: ProjectilePool = None):
+        self.space = space
+        self.projectile_pool = projectile_pool
+
+        # Lifecycle statistics
+        self.retired_ships = 0
+        self.retired_projectiles = 0
+
+    def collect(self, store: EntityStore) -> int:
+        """
+        Reaps a store and retires every entity destroyed since the last collection.
+        Must not be called while the space is stepping.
+        :param store: entity store of ships or projectiles.
+        :return: number of entities retired.
+        """
+        reaped = store.reap()
+        for entity in reaped:
+            self.retire(entity)
+        return len(reaped)
+
+    def retire(self, entity) -> None:
+        """
+        Takes an entity out of the physics space.
+        :param entity: ship or projectile.
+        :return: None
+        """
+        if isinstance(entity, Projectile):
+            if self.projectile_pool is None:
+                entity.retire()
+            else:
+                self.projectile_pool.release(entity)
+            self.retired_projectiles += 1
+        else:
+            entity.retire()
+            self.retired_ships += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the lifecycle statistics.
+        :return: lifecycle statistics.
+        """
+        return {
+            'lifecycle_retired_ships': self.retired_ships,
+            'lifecycle_retired_projectiles': self.retired_projectiles,
+            'lifecycle_bodies': len(self.space.bodies),
+            'lifecycle_shapes': len(self.space.shapes),
+        }
@@ -0,0 +1,599 @@
+"""
+This module contains the Message, Snapshot, GameServer and GameClient classes.
+The server plays one World authoritatively and sends every client, over UDP, only what changed since the
+last snapshot that client acknowledged; clients draw the game by interpolating between snapshots.
+"""
+import asyncio
+import bisect
+import struct
+import time
+import zlib
+import numpy as np
+import pygame
+from game.world import World
+from game.player import Player
+from game.enemy import Enemy
+from game.entity_store import EntityStore
+from game.kinematic import KinematicProjectiles
+from game.replay import KEY_STATES, encode_keys
+from game.sprite_cache import SpriteCache
+from game.profiler import percentile
+from game import settings
+
+
+class Message:
+    """
+    Message class.
+    Every datagram starts with its message type; the structs lay out the fixed part of each message.
+    """
+    # Message types
+    HELLO = 1  # client to server: requested role
+    WELCOME = 2  # server to client: granted role
+    INPUT = 3  # client to server: newest snapshot received and key mask
+    SNAPSHOT = 4  # server to client: see Snapshot
+    BYE = 5  # client to server
+
+    # Roles
+    PLAYER = 0
+    SPECTATOR = 1
+    ROLES = (PLAYER, SPECTATOR)
+
+    HELLO_FORMAT = struct.Struct('<BB')
+    WELCOME_FORMAT = struct.Struct('<BB')
+    INPUT_FORMAT = struct.Struct('<BIB')
+    BYE_FORMAT = struct.Struct('<B')
+
+
+class Snapshot:
+    """
+    Snapshot class.
+    Entities with an identity (the player, the enemies, pymunk projectiles) are rows keyed by an id made of
+    their group and their entity store handle, sorted by id. A row holds the kind, then the position and
+    velocity in fixed point. Kinematic and array bullets have no identity, so they are sent whole every tick.
+    A delta against a baseline carries what changed in each row, the rows that appeared and those that are gone.
+    """
+    # Id groups
+    PLAYER = 0
+    ENEMIES = 1
+    PROJECTILES = 2
+    ENEMY_PROJECTILES = 3
+    GROUP_SHIFT = 56
+
+    # Row layout
+    COLUMNS = 5  # kind, x, y, vx, vy
+    ID_TYPE = np.dtype('<u8')
+    ROW_TYPE = np.dtype('<i4')
+
+    # Header: message type, tick, baseline tick (0 for none), flags, baseline rows, changed rows, added rows,
+    # bullet rows; a zlib compressed body follows
+    HEADER = struct.Struct('<BIIBIIII')
+    GAME_OVER = 0b1
+
+    def __init__(self, tick: int, ids: np.ndarray, rows: np.ndarray, bullets: np.ndarray, game_over: bool = False):
+        self.tick = tick
+        self.ids = ids
+        self.rows = rows
+        self.bullets = bullets
+        self.game_over = game_over
+
+    @classmethod
+    def capture(cls, world: World, tick: int) -> 'Snapshot':
+        """
+        Captures the entity state of a world.
+        :param world: world to capture.
+        :param tick: server tick of the snapshot.
+        :return: snapshot.
+        """
+        game_logic = world.game_logic
+        player = world.player
+        ids = [np.array((cls.PLAYER << cls.GROUP_SHIFT,), dtype=cls.ID_TYPE)]
+        states = [np.array(((settings.PLAYER_KIND, *player.body.position, *player.body.velocity),))]
+        for group, store in ((cls.ENEMIES, game_logic.enemies), (cls.PROJECTILES, player.weapon.projectiles)):
+            cls.__store_rows(group, store, ids, states)
+        enemy_fire = game_logic.enemy_fire
+        if enemy_fire is not None:
+            cls.__store_rows(cls.ENEMY_PROJECTILES, enemy_fire.projectiles, ids, states)
+
+        bullets = []
+        for kinematic in (game_logic.kinematic_projectiles, enemy_fire.bullets if enemy_fire is not None else None):
+            if kinematic is not None and len(kinematic):
+                count = len(kinematic)
+                bullets.append(np.column_stack((kinematic.kind[:count], kinematic.position[:count],
+                                                kinematic.velocity[:count])))
+
+        ids = np.concatenate(ids)
+        order = np.argsort(ids)
+        return cls(tick, ids[order], cls.__fixed_point(np.concatenate(states)[order]),
+                   cls.__fixed_point(np.concatenate(bullets) if bullets else np.zeros((0, cls.COLUMNS))),
+                   game_logic.is_game_over())
+
+    @classmethod
+    def __store_rows(cls, group: int, store: EntityStore, ids: list, states: list) -> None:
+        """
+        Appends the ids and states of the live entities of a store.
+        :param group: id group of the store.
+        :param store: entity store.
+        :param ids: id arrays to append to.
+        :param states: state arrays to append to.
+        :return: None
+        """
+        count = len(store)
+        if not count:
+            return
+        store.sync()
+        alive = store.alive[:count]
+        slots = store.slot_of[:count][alive]
+        handles = store.generation[slots] << EntityStore.SLOT_BITS | slots
+        ids.append(handles.astype(cls.ID_TYPE) | np.uint64(group << cls.GROUP_SHIFT))
+        states.append(np.column_stack((store.kinds[alive], store.positions[alive], store.velocities[alive])))
+
+    @classmethod
+    def __fixed_point(cls, states: np.ndarray) -> np.ndarray:
+        """
+        Rounds kinds, positions and velocities to fixed point rows.
+        :param states: float rows.
+        :return: integer rows.
+        """
+        rows = np.rint(states * settings.NET_POSITION_SCALE).astype(cls.ROW_TYPE)
+        rows[:, 0] = states[:, 0]
+        return rows
+
+    @classmethod
+    def empty(cls) -> 'Snapshot':
+        """
+        Returns the snapshot without entities that full snapshots are encoded against.
+        :return: empty snapshot.
+        """
+        rows = np.zeros((0, cls.COLUMNS), dtype=cls.ROW_TYPE)
+        return cls(0, np.zeros(0, dtype=cls.ID_TYPE), rows, rows)
+
+    def positions(self) -> np.ndarray:
+        """
+        Positions of the identified entities.
+        :return: array of (x, y) rows.
+        """
+        return self.rows[:, 1:3] / settings.NET_POSITION_SCALE
+
+    def encode(self, baseline: 'Snapshot' = None) -> bytes:
+        """
+        Encodes the snapshot as a delta against a baseline, or in full without one.
+        The delta marks which baseline rows are gone and which changed, sends the changed ones as differences
+        from the baseline, and the new rows whole; zlib then squeezes out the zeros of unchanged columns.
+        :param baseline: snapshot the client acknowledged.
+        :return: datagram.
+        """
+        if baseline is None:
+            baseline = self.empty()
+        # Baseline rows still present, and where they are now
+        index = np.minimum(np.searchsorted(self.ids, baseline.ids), max(len(self.ids) - 1, 0))
+        kept = self.ids[index] == baseline.ids if len(self.ids) else np.zeros(len(baseline.ids), dtype=bool)
+        current = index[kept]
+        differences = self.rows[current] - baseline.rows[kept]
+        changed = differences.any(axis=1)
+        added = np.ones(len(self.ids), dtype=bool)
+        added[current] = False
+
+        header = self.HEADER.pack(Message.SNAPSHOT, self.tick, baseline.tick, self.GAME_OVER if self.game_over else 0,
+                                  len(baseline.ids), int(changed.sum()), int(added.sum()), len(self.bullets))
+        body = b''.join((np.packbits(kept).tobytes(), np.packbits(changed).tobytes(),
+                         differences[changed].tobytes(), self.ids[added].tobytes(), self.rows[added].tobytes(),
+                         self.bullets.tobytes()))
+        return header + zlib.compress(body, settings.NET_COMPRESSION_LEVEL)
+
+    @classmethod
+    def decode(cls, data: bytes, baselines: dict) -> 'Snapshot':
+        """
+        Decodes a datagram and applies it to its baseline.
+        :param data: datagram.
+        :param baselines: snapshots received so far, by tick.
+        :return: snapshot, or None if its baseline is no longer known.
+        """
+        _, tick, baseline_tick, flags, baseline_rows, changed, added, bullets = cls.HEADER.unpack_from(data)
+        baseline = baselines.get(baseline_tick, cls.empty() if not baseline_tick else None)
+        if baseline is None or len(baseline.ids) != baseline_rows:
+            return None
+
+        body = zlib.decompress(memoryview(data)[cls.HEADER.size:])
+        offset = 0
+
+        def take(dtype: np.dtype, count: int) -> np.ndarray:
+            nonlocal offset
+            array = np.frombuffer(body, dtype, count, offset)
+            offset += array.nbytes
+            return array
+
+        kept = np.unpackbits(take(np.uint8, (baseline_rows + 7) // 8), count=baseline_rows).astype(bool)
+        kept_count = int(kept.sum())
+        changed_rows = np.unpackbits(take(np.uint8, (kept_count + 7) // 8), count=kept_count).astype(bool)
+        differences = take(cls.ROW_TYPE, changed * cls.COLUMNS).reshape(changed, cls.COLUMNS)
+        added_ids = take(cls.ID_TYPE, added)
+        added_rows = take(cls.ROW_TYPE, added * cls.COLUMNS).reshape(added, cls.COLUMNS)
+        bullet_rows = take(cls.ROW_TYPE, bullets * cls.COLUMNS).reshape(bullets, cls.COLUMNS)
+
+        rows = baseline.rows[kept]
+        rows[changed_rows] += differences
+        ids = np.concatenate((baseline.ids[kept], added_ids))
+        rows = np.concatenate((rows, added_rows))
+        order = np.argsort(ids)
+        return cls(tick, ids[order], rows[order], bullet_rows, bool(flags & cls.GAME_OVER))
+
+
+class ClientConnection:
+    """
+    Client connection class.
+    What the server knows about one client: its role, the newest snapshot it acknowledged and its keys.
+    """
+    def __init__(self, address: tuple, role: int):
+        self.address = address
+        self.role = role
+        self.ack = 0
+        self.keys = 0
+        self.last_seen = time.monotonic()
+
+
+class GameServer(asyncio.DatagramProtocol):
+    """
+    Game server class.
+    The first client to ask for the player role flies the ship; everyone else spectates.
+    Clients that acknowledged the same snapshot share one encoded delta, so a spectator costs the server
+    little more than a sendto() per tick. A new round starts when the game is over.
+    """
+    def __init__(self, difficulty: int = settings.HARD, seed: int = 0, world: World = None,
+                 tick_rate: int = settings.FRAMES_PER_SECOND):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.rounds = 0
+        self.world = World(difficulty, seed, enemy_fire=settings.ENEMY_FIRE_PATTERN) if world is None else world
+        self.tick_rate = tick_rate
+        self.tick = 0
+        self.history = {}
+        self.clients = {}
+        self.pilot = None
+        self.transport = None
+
+        # Server statistics
+        self.update_times = []
+        self.send_times = []
+        self.bytes_sent = []
+        self.full_snapshots = 0
+        self.oversize = 0
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, address: tuple) -> None:
+        try:
+            if data[0] == Message.HELLO:
+                _, role = Message.HELLO_FORMAT.unpack(data)
+                self.__join(address, role)
+            elif data[0] == Message.INPUT:
+                client = self.clients.get(address)
+                if client is None:
+                    return
+                _, ack, keys = Message.INPUT_FORMAT.unpack(data)
+                client.ack = max(client.ack, ack)
+                client.keys = keys
+                client.last_seen = time.monotonic()
+            elif data[0] == Message.BYE:
+                self.__leave(address)
+        except (IndexError, struct.error):
+            # Ignore malformed datagrams
+            return
+
+    def __join(self, address: tuple, role: int) -> None:
+        """
+        Adds a client, as a spectator if someone already flies the ship.
+        :param address: client address.
+        :param role: requested role.
+        :return: None
+        """
+        if role == Message.PLAYER and self.pilot not in (None, address):
+            role = Message.SPECTATOR
+        if role == Message.PLAYER:
+            self.pilot = address
+        self.clients[address] = ClientConnection(address, role)
+        self.transport.sendto(Message.WELCOME_FORMAT.pack(Message.WELCOME, role), address)
+
+    def __leave(self, address: tuple) -> None:
+        """
+        Removes a client.
+        :param address: client address.
+        :return: None
+        """
+        self.clients.pop(address, None)
+        if address == self.pilot:
+            self.pilot = None
+
+    async def start(self, host: str = settings.NET_HOST, port: int = settings.NET_PORT) -> tuple:
+        """
+        Binds the server socket.
+        :param host: host to bind to.
+        :param port: port to bind to, 0 for any free port.
+        :return: bound address.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        return self.transport.get_extra_info('sockname')
+
+    def step(self) -> None:
+        """
+        Advances the world by one tick and sends every client its snapshot.
+        :return: None
+        """
+        start = time.perf_counter()
+        pilot = self.clients.get(self.pilot)
+        if self.world.update(KEY_STATES[pilot.keys if pilot is not None else 0]):
+            self.rounds += 1
+            self.world = World(self.difficulty, self.seed + self.rounds, enemy_fire=settings.ENEMY_FIRE_PATTERN)
+        self.tick += 1
+        snapshot = Snapshot.capture(self.world, self.tick)
+        self.history[snapshot.tick] = snapshot
+        self.history.pop(snapshot.tick - settings.NET_SNAPSHOT_HISTORY, None)
+        encoded = time.perf_counter()
+
+        # One delta per distinct baseline
+        deltas = {}
+        sent = 0
+        timeout = time.monotonic() - settings.NET_CLIENT_TIMEOUT
+        for client in list(self.clients.values()):
+            if client.last_seen < timeout:
+                self.__leave(client.address)
+                continue
+            baseline = client.ack if client.ack in self.history else 0
+            data = deltas.get(baseline)
+            if data is None:
+                data = deltas[baseline] = snapshot.encode(self.history.get(baseline))
+            if len(data) > settings.NET_MAX_DATAGRAM:
+                self.oversize += 1
+                continue
+            if not baseline:
+                self.full_snapshots += 1
+            self.transport.sendto(data, client.address)
+            sent += len(data)
+
+        end = time.perf_counter()
+        self.update_times.append(encoded - start)
+        self.send_times.append(end - encoded)
+        self.bytes_sent.append(sent)
+
+    async def serve(self, ticks: int = None, realtime: bool = True, on_tick=None) -> None:
+        """
+        Runs the server loop.
+        :param ticks: number of ticks to run, None to run until cancelled.
+        :param realtime: whether to hold the tick rate, or to run uncapped while still serving the clients.
+        :param on_tick: optional callable taking the tick number, called after each tick.
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while ticks is None or self.tick < ticks:
+            self.step()
+            if on_tick:
+                on_tick(self.tick)
+            if realtime:
+                deadline += 1 / self.tick_rate
+                await asyncio.sleep(max(deadline - loop.time(), 0))
+            else:
+                # The datagram transport reads one datagram per loop iteration, so let every client's get through
+                for _ in range(len(self.clients) + 1):
+                    await asyncio.sleep(0)
+
+    async def run(self, host: str = settings.NET_HOST, port: int = settings.NET_PORT) -> None:
+        """
+        Serves at the tick rate until cancelled.
+        :param host: host to bind to.
+        :param port: port to bind to.
+        :return: None
+        """
+        await self.start(host, port)
+        try:
+            await self.serve()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Closes the server socket.
+        :return: None
+        """
+        if self.transport is not None:
+            self.transport.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the server statistics.
+        :return: server statistics, tick times in milliseconds.
+        """
+        ticks = len(self.update_times)
+        tick_times = sorted(update + send for update, send in zip(self.update_times, self.send_times))
+        return {
+            'ticks': ticks,
+            'clients': len(self.clients),
+            'spectators': sum(client.role == Message.SPECTATOR for client in self.clients.values()),
+            'tick_p50_ms': percentile(tick_times, 50) * 1000,
+            'tick_p99_ms': percentile(tick_times, 99) * 1000,
+            'update_ms': sum(self.update_times) / ticks * 1000 if ticks else 0.0,
+            'send_ms': sum(self.send_times) / ticks * 1000 if ticks else 0.0,
+            'bytes_per_tick': sum(self.bytes_sent) / ticks if ticks else 0.0,
+            'full_snapshots': self.full_snapshots,
+            'oversize': self.oversize,
+        }
+
+
+class GameClient(asyncio.DatagramProtocol):
+    """
+    Game client class.
+    Acknowledges every snapshot with the current keys and keeps the recent snapshots, both as delta baselines
+    and to draw the game settings.NET_INTERPOLATION_TICKS behind the newest one.
+    """
+    # Sprite, size and offset from the body position of every entity kind
+    SPRITES = {
+        settings.PLAYER_KIND: (Player.PLAYER_IMAGE, Player.SPRITE_SIZE,
+                               (-settings.SHIP_WIDTH * 1.5, -settings.SHIP_HEIGHT * 1.5)),
+        settings.ENEMY_KIND: (Enemy.ENEMY_IMAGE, Enemy.SPRITE_SIZE,
+                              (-settings.SHIP_WIDTH * .5, -settings.SHIP_HEIGHT * .5)),
+        **{kind: (KinematicProjectiles.IMAGES[kind], (projectile.RADIUS * 4, projectile.RADIUS * 4),
+                  (-projectile.RADIUS * 2, -projectile.RADIUS * 2))
+           for kind, projectile in KinematicProjectiles.TYPES.items()},
+    }
+
+    def __init__(self, role: int = Message.SPECTATOR):
+        if role not in Message.ROLES:
+            raise ValueError(f'Unknown role: {role}')
+        self.role = role
+        self.transport = None
+        self.snapshots = {}
+        self.latest = None
+        self.received_at = 0.0
+        self.keys = 0
+
+        # Client statistics
+        self.bytes_received = 0
+        self.snapshots_received = 0
+        self.undecodable = 0
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self.transport = transport
+        transport.sendto(Message.HELLO_FORMAT.pack(Message.HELLO, self.role))
+
+    def datagram_received(self, data: bytes, address: tuple) -> None:
+        try:
+            if data[0] == Message.WELCOME:
+                _, self.role = Message.WELCOME_FORMAT.unpack(data)
+            elif data[0] == Message.SNAPSHOT:
+                self.__receive(data)
+        except (IndexError, struct.error, ValueError, zlib.error):
+            # Ignore malformed datagrams
+            return
+
+    def __receive(self, data: bytes) -> None:
+        """
+        Decodes a snapshot, keeps it and acknowledges it.
+        :param data: datagram.
+        :return: None
+        """
+        self.bytes_received += len(data)
+        snapshot = Snapshot.decode(data, self.snapshots)
+        if snapshot is None:
+            self.undecodable += 1
+            return
+        self.snapshots_received += 1
+        self.snapshots[snapshot.tick] = snapshot
+        if self.latest is None or snapshot.tick > self.latest.tick:
+            self.latest = snapshot
+            self.received_at = time.perf_counter()
+            # Baselines older than the server keeps are of no use
+            for tick in [tick for tick in self.snapshots if tick <= snapshot.tick - settings.NET_SNAPSHOT_HISTORY]:
+                del self.snapshots[tick]
+        self.send_input()
+
+    async def connect(self, host: str = settings.NET_HOST, port: int = settings.NET_PORT) -> None:
+        """
+        Opens the client socket and asks the server to join.
+        :param host: server host.
+        :param port: server port.
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, remote_addr=(host, port))
+
+    def send_input(self) -> None:
+        """
+        Sends the newest snapshot received and the current keys.
+        :return: None
+        """
+        ack = self.latest.tick if self.latest is not None else 0
+        self.transport.sendto(Message.INPUT_FORMAT.pack(Message.INPUT, ack, self.keys))
+
+    def render_tick(self) -> float:
+        """
+        Returns the server tick to draw, a fixed delay behind the estimated current server tick.
+        :return: tick, possibly fractional.
+        """
+        elapsed = (time.perf_counter() - self.received_at) / settings.PHYSICS_TIMESTEP
+        return self.latest.tick + min(elapsed, 1.0) - settings.NET_INTERPOLATION_TICKS
+
+    def interpolate(self, tick: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolates the entities between the two snapshots around a tick.
+        Entities without an identity are moved back from the later snapshot along their velocity.
+        :param tick: tick to draw, possibly fractional.
+        :return: kinds and positions of every entity.
+        """
+        ticks = sorted(self.snapshots)
+        after = self.snapshots[ticks[min(bisect.bisect_right(ticks, tick), len(ticks) - 1)]]
+        before = self.snapshots[ticks[max(bisect.bisect_right(ticks, tick) - 1, 0)]]
+        scale = settings.NET_POSITION_SCALE
+
+        positions = after.rows[:, 1:3] / scale
+        if before is not after and len(before.ids):
+            alpha = min(max((tick - before.tick) / (after.tick - before.tick), 0.0), 1.0)
+            index = np.minimum(np.searchsorted(before.ids, after.ids), len(before.ids) - 1)
+            known = before.ids[index] == after.ids
+            previous = before.rows[index[known], 1:3] / scale
+            positions[known] = previous + (positions[known] - previous) * alpha
+
+        lag = max(after.tick - tick, 0.0) * settings.PHYSICS_TIMESTEP
+        bullets = (after.bullets[:, 1:3] - after.bullets[:, 3:5] * lag) / scale
+        return np.concatenate((after.rows[:, 0], after.bullets[:, 0])), np.concatenate((positions, bullets))
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """
+        Draws the interpolated game, one blits call per entity kind.
+        :param screen: screen to draw on.
+        :return: None
+        """
+        screen.fill(settings.SCREEN_COLOR)
+        if self.latest is None:
+            return
+        kinds, positions = self.interpolate(self.render_tick())
+        for kind in np.unique(kinds).tolist():
+            image, size, offset = self.SPRITES[kind]
+            sprite = SpriteCache().get(image, size)
+            screen.blits([(sprite, corner) for corner in (positions[kinds == kind] + offset).tolist()],
+                         doreturn=False)
+
+    async def play(self, screen: pygame.Surface, host: str = settings.NET_HOST, port: int = settings.NET_PORT) -> None:
+        """
+        Joins a server and plays or watches in a window until it is closed.
+        :param screen: screen to draw on.
+        :param host: server host.
+        :param port: server port.
+        :return: None
+        """
+        await self.connect(host, port)
+        try:
+            running = True
+            while running:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                if self.role == Message.PLAYER:
+                    self.keys = encode_keys(pygame.key.get_pressed())
+                self.draw(screen)
+                pygame.display.flip()
+                await asyncio.sleep(1 / settings.FRAMES_PER_SECOND)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Leaves the server and closes the client socket.
+        :return: None
+        """
+        if self.transport is not None:
+            self.transport.sendto(Message.BYE_FORMAT.pack(Message.BYE))
+            self.transport.close()
+
+    def stats(self) -> dict:
+        """
+        Returns the client statistics.
+        :return: client statistics.
+        """
+        return {
+            'role': self.role,
+            'latest_tick': self.latest.tick if self.latest is not None else 0,
+            'bytes_received': self.bytes_received,
+            'snapshots_received': self.snapshots_received,
+            'undecodable': self.undecodable,
+        }
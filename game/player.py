@@ -4,6 +4,7 @@ The Player class extends the Ship class.
 """
 import pygame
 from game.ship import Ship
+from game.animation import Animation
 from game.projectile import Projectile
 from game.weapon import Gun, RocketLauncher, LaserCannon
 from game import settings
@@ -18,27 +19,40 @@ class Player(Ship):
     # Shape Magic Numbers
     VERTICES = [(0, 0), (-settings.SHIP_WIDTH / 2, -settings.SHIP_HEIGHT), (-settings.SHIP_WIDTH, 0)]
     COLOR = (0, 255, 0, 0)
+    KIND = settings.PLAYER_KIND
 
     # Coordinates
     STARTING_X = settings.SCREEN_WIDTH / 2
     STARTING_Y = settings.SCREEN_HEIGHT - settings.PADDING
 
     # Ship Image
-    PLAYER_IMAGE = pygame.image.load('assets/Player/Ship.png')
+    PLAYER_IMAGE = 'assets/Player/Ship.png'
+
+    # Engine Animations
+    ENGINE_IMAGE = 'assets/_Foozle/Main Ship/Main Ship - Engines/PNGs/Main Ship - Engines - Base Engine.png'
+    ENGINE_IDLE = Animation('assets/_Foozle/Main Ship/Main Ship - Engine Effects/PNGs/'
+                            'Main Ship - Engines - Base Engine - Idle.png', overlays=(ENGINE_IMAGE, PLAYER_IMAGE))
+    ENGINE_POWERING = Animation('assets/_Foozle/Main Ship/Main Ship - Engine Effects/PNGs/'
+                                'Main Ship - Engines - Base Engine - Powering.png',
+                                overlays=(ENGINE_IMAGE, PLAYER_IMAGE))
 
     def __init__(self, starting_x: int, starting_y: int):
         super().__init__(starting_x, starting_y, self.VERTICES, self.COLOR)
         self.shape.collision_type = settings.PLAYER_COLLISION_TYPE
+        # Ignores destroy(), for benchmarks that must not end early
+        self.invulnerable = False
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
         """
         Draws the player.
         :param screen: screen object to draw on.
-        :return: None
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: area of the screen drawn on.
         """
-        adjusted_x = self.body.position.x - settings.SHIP_WIDTH*1.5
-        adjusted_y = self.body.position.y - settings.SHIP_HEIGHT*1.5
-        super().draw(screen, self.PLAYER_IMAGE, adjusted_x, adjusted_y)
+        x, y = self.interpolated_position(alpha)
+        adjusted_x = x - settings.SHIP_WIDTH*1.5
+        adjusted_y = y - settings.SHIP_HEIGHT*1.5
+        return super().draw(screen, self.PLAYER_IMAGE, adjusted_x, adjusted_y)
 
     def player_key(self, keys: pygame.key.ScancodeWrapper) -> None:
         """
@@ -66,3 +80,11 @@ class Player(Ship):
             super().equip_weapon(RocketLauncher)
         if keys[pygame.K_3]:
             super().equip_weapon(LaserCannon)
+
+    def destroy(self) -> None:
+        """
+        Destroys the player unless it is invulnerable.
+        :return: None
+        """
+        if not self.invulnerable:
+            super().destroy()
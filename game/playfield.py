@@ -0,0 +1,40 @@
+"""
+This module contains the Playfield class.
+The playfield is the area enemies move in and objects are kept inside of.
+It defaults to the screen; stress scenarios use a larger, virtual one.
+"""
+from game import settings
+
+
+class Playfield:
+    """
+    Playfield class.
+    Files (y) and ranks (x) follow the same spacing as settings.SCREEN_FILE and settings.SCREEN_RANK.
+    """
+    def __init__(self, width: int = settings.SCREEN_WIDTH, height: int = settings.SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+
+        self.total_files = height // settings.SCREEN_FILE_DIFF
+        self.total_ranks = width // settings.SCREEN_RANK_DIFF
+
+        # Enemies turn down once they pass these
+        self.left_edge = settings.PADDING
+        self.right_edge = width - settings.PADDING - settings.SHIP_WIDTH
+
+    def file_y(self, index: int) -> int:
+        """
+        Returns the y coordinate of a file.
+        Negative indices are above the top of the playfield.
+        :param index: file index.
+        :return: y coordinate.
+        """
+        return settings.SCREEN_FILE[0] + index * settings.SCREEN_FILE_DIFF
+
+    def rank_x(self, index: int) -> int:
+        """
+        Returns the x coordinate of a rank.
+        :param index: rank index.
+        :return: x coordinate.
+        """
+        return settings.SCREEN_RANK[0] + index * settings.SCREEN_RANK_DIFF
@@ -0,0 +1,136 @@
+"""
+This module contains the FrameProfiler class.
+The frame profiler keeps the recent duration of every frame phase in preallocated ring buffers,
+draws their percentiles on screen and exports them when the game ends.
+"""
+import csv
+import json
+import time
+from array import array
+import pygame
+from game import settings
+
+
+class FrameProfiler:
+    """
+    Frame profiler class.
+    GameLogic and GameRenderer only time their phases while a profiler is attached to them.
+    """
+    # Phases
+    UPDATE_POSITIONS = 'update_positions'
+    DESTROY_OUT_OF_BOUNDS = 'destroy_out_of_bounds'
+    REMOVE_DESTROYED = 'remove_destroyed'
+    SPACE_STEP = 'space_step'
+    RENDER = 'render'
+    DISPLAY_FLIP = 'display_flip'
+    PHASES = (UPDATE_POSITIONS, DESTROY_OUT_OF_BOUNDS, REMOVE_DESTROYED, SPACE_STEP, RENDER, DISPLAY_FLIP)
+
+    # Overlay Magic Numbers
+    OVERLAY_COLOR = (255, 255, 0)
+    OVERLAY_POSITION = (10, 10)
+
+    def __init__(self, history: int = settings.PROFILER_HISTORY):
+        self.history = history
+        self.samples = {phase: array('d', bytes(8 * history)) for phase in self.PHASES}
+        self.cursors = dict.fromkeys(self.PHASES, 0)
+        self.totals = dict.fromkeys(self.PHASES, 0)
+        self.entity_counts = {}
+
+        # Overlay text is only re-rendered every few frames
+        self.font = None
+        self.overlay_lines = []
+        self.overlay_age = settings.PROFILER_OVERLAY_REFRESH
+
+    def lap(self, phase: str, start: float) -> float:
+        """
+        Records the time elapsed since start as one sample of a phase.
+        :param phase: phase name.
+        :param start: perf_counter() value at the start of the phase.
+        :return: perf_counter() value now, to start the next phase with.
+        """
+        now = time.perf_counter()
+        cursor = self.cursors[phase]
+        self.samples[phase][cursor] = now - start
+        self.cursors[phase] = (cursor + 1) % self.history
+        self.totals[phase] += 1
+        return now
+
+    def count(self, **entity_counts: int) -> None:
+        """
+        Records the latest entity counts.
+        :param entity_counts: counts by entity name.
+        :return: None
+        """
+        self.entity_counts.update(entity_counts)
+
+    def summary(self) -> dict:
+        """
+        Returns statistics in milliseconds for every phase over the recorded history.
+        :return: statistics by phase.
+        """
+        summary = {}
+        for phase in self.PHASES:
+            filled = min(self.totals[phase], self.history)
+            values = sorted(self.samples[phase][:filled])
+            summary[phase] = {
+                'samples': self.totals[phase],
+                'mean_ms': sum(values) / filled * 1000 if filled else 0.0,
+                'p50_ms': percentile(values, 50) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000 if values else 0.0,
+            }
+        return summary
+
+    def draw_overlay(self, screen: pygame.Surface) -> pygame.Rect:
+        """
+        Draws p50/p99 per phase and the entity counts in a corner of the screen.
+        :param screen: screen to draw on.
+        :return: area of the screen drawn on.
+        """
+        if self.font is None:
+            self.font = pygame.font.Font(None, settings.PROFILER_FONT_SIZE)
+
+        self.overlay_age += 1
+        if self.overlay_age >= settings.PROFILER_OVERLAY_REFRESH:
+            self.overlay_age = 0
+            text = [f'{phase:<22} p50 {stats["p50_ms"]:6.3f} ms  p99 {stats["p99_ms"]:6.3f} ms'
+                    for phase, stats in self.summary().items()]
+            text.append('  '.join(f'{name} {count}' for name, count in self.entity_counts.items()))
+            self.overlay_lines = [self.font.render(line, True, self.OVERLAY_COLOR) for line in text]
+
+        x, y = self.OVERLAY_POSITION
+        area = pygame.Rect(x, y, 0, 0)
+        for line in self.overlay_lines:
+            area.union_ip(screen.blit(line, (x, y)))
+            y += line.get_height()
+        return area
+
+    def export(self, path: str) -> None:
+        """
+        Writes the summary to a JSON file, or to a CSV file if the path ends in .csv.
+        :param path: file path.
+        :return: None
+        """
+        summary = self.summary()
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['phase', 'samples', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms'])
+                for phase, stats in summary.items():
+                    writer.writerow([phase, *stats.values()])
+        else:
+            with open(path, 'w') as file:
+                json.dump({'phases': summary, 'entity_counts': self.entity_counts}, file, indent=2)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Returns the nearest-rank percentile of an already sorted list.
+    :param sorted_values: values sorted in ascending order.
+    :param q: percentile between 0 and 100.
+    :return: percentile value, 0 if the list is empty.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
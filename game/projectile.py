@@ -7,6 +7,9 @@ import pygame
 import pymunk
 from abc import ABC
 from game.singleton import SpaceSingleton
+from game.sprite_cache import SpriteCache
+from game.animation import Animation, Animator
+from game.clock import interpolated_position
 from game import settings
 
 
@@ -17,11 +20,26 @@ class Projectile(ABC):
     SHOOT_UP = (0, -1)
     SHOOT_DOWN = (0, 1)
 
-    def __init__(self, x: int, y: int, direction: tuple[int, int], radius: float = 5, impulse: int = 1000):
+    # Collision Filters
+    PLAYER_FILTER = pymunk.ShapeFilter(categories=settings.PLAYER_PROJECTILE_CATEGORY,
+                                       mask=settings.PLAYER_PROJECTILE_MASK)
+    ENEMY_FILTER = pymunk.ShapeFilter(categories=settings.ENEMY_PROJECTILE_CATEGORY,
+                                      mask=settings.ENEMY_PROJECTILE_MASK)
+    NO_FILTER = pymunk.ShapeFilter()
+
+    # Sprite-sheet animation, drawn instead of the static image while animations are enabled
+    ANIMATION = None
+
+    def __init__(self, x: int, y: int, direction: tuple[int, int], radius: float = 5, impulse: int = 1000,
+                 space: pymunk.Space = None, enemy_fire: bool = False, collision_filtering: bool = True):
         self.body = None
         self.shape = None
-        self.space = SpaceSingleton()
+        self.space = SpaceSingleton() if space is None else space
         self.destroyed = False
+        # Entity store the projectile is a view into, and its handle there
+        self.store = None
+        self.entity = None
+        self.animation_phase = Animator().next_phase()
 
         self.PROJECTILE_MASS = 1
         self.PROJECTILE_RADIUS = radius
@@ -33,23 +51,82 @@ class Projectile(ABC):
         self.CENTER_OF_GRAVITY = (0, 0)
 
         self.body = pymunk.Body(self.PROJECTILE_MASS, self.PROJECTILE_MOMENT)
-        self.body.position = x, y
         self.shape = pymunk.Circle(self.body, self.PROJECTILE_RADIUS)
         self.shape.elasticity = self.PROJECTILE_ELASTICITY
         self.shape.friction = self.PROJECTILE_FRICTION
-        self.body.apply_impulse_at_local_point((direction[0], direction[1]*impulse), self.CENTER_OF_GRAVITY)
         self.shape.color = pygame.color.THECOLORS['white']
         self.shape.collision_type = settings.PROJECTILE_COLLISION_TYPE
-        self.space.add(self.body, self.shape)
         self.shape.belonging_object = self
+        self.launch(x, y, direction, enemy_fire, collision_filtering)
+
+    def launch(self, x: int, y: int, direction: tuple[int, int], enemy_fire: bool = False,
+               collision_filtering: bool = True) -> None:
+        """
+        Puts the projectile in the physics space at a given position and sends it flying.
+        Also used to reuse a retired projectile.
+        :param x: x coordinate.
+        :param y: y coordinate.
+        :param direction: direction to launch in.
+        :param enemy_fire: whether an enemy fired the projectile, which decides what it can hit.
+        :param collision_filtering: whether to give the projectile its collision category, or collide with anything.
+        :return: None
+        """
+        self.destroyed = False
+        if collision_filtering:
+            self.shape.filter = self.ENEMY_FILTER if enemy_fire else self.PLAYER_FILTER
+        else:
+            self.shape.filter = self.NO_FILTER
+        self.body.position = x, y
+        self.body.velocity = 0, 0
+        self.body.angle = 0
+        self.body.angular_velocity = 0
+        # Drop the solver's position bias left over from the last collision of a reused body
+        pymunk.Body.update_position(self.body, 0)
+        self.body.apply_impulse_at_local_point((direction[0], direction[1]*self.IMPULSE_CONSTANT),
+                                               self.CENTER_OF_GRAVITY)
+        if self.body.space is None:
+            self.space.add(self.body)
+        if self.shape.space is None:
+            self.space.add(self.shape)
+
+    def retire(self) -> None:
+        """
+        Takes the projectile body and shape out of the physics space.
+        :return: None
+        """
+        if self.shape.space is not None:
+            self.space.remove(self.shape)
+        if self.body.space is not None:
+            self.space.remove(self.body)
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def interpolated_position(self, alpha: float = 1.0) -> tuple[float, float]:
+        """
+        Returns the position of the projectile between the previous and the current physics tick.
+        :param alpha: fraction of the way from the previous tick (0) to the current one (1).
+        :return: x and y coordinates.
+        """
+        return interpolated_position(self.body, alpha)
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
         """
         Draws the projectile.
         :param screen: screen to draw on.
-        :return: None
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: area of the screen drawn on.
         """
-        pass
+        return pygame.Rect(self.interpolated_position(alpha), (0, 0))
+
+    def sprite(self, image: str, size: tuple[float, float]) -> pygame.Surface:
+        """
+        Returns the current animation frame of the projectile, or its static image.
+        :param image: path of the static image.
+        :param size: target size in pixels.
+        :return: image to draw.
+        """
+        animator = Animator()
+        if animator.enabled and self.ANIMATION is not None:
+            return animator.frame(self.ANIMATION, size, self.animation_phase)
+        return SpriteCache().get(image, size)
 
     def destroy(self) -> None:
         """
@@ -57,6 +134,8 @@ class Projectile(ABC):
         :return: None
         """
         self.destroyed = True
+        if self.store is not None:
+            self.store.kill(self.entity)
 
 
 class Bullet(Projectile):
@@ -64,21 +143,28 @@ class Bullet(Projectile):
     Bullet class.
     """
     # Projectile Image
-    BULLET_IMAGE = pygame.image.load('assets/Weapons/Bullet.png')
-
-    def __init__(self, x: int, y: int, direction: tuple[int, int]):
-        super().__init__(x, y, direction, radius=5, impulse=1000)
+    BULLET_IMAGE = 'assets/Weapons/Bullet.png'
+    ANIMATION = Animation('assets/_Foozle/Main ship weapons/PNGs/Main ship weapon - Projectile - Big Space Gun.png')
+    RADIUS = 5
+    IMPULSE = 1000
+    KIND = settings.BULLET_KIND
+
+    def __init__(self, x: int, y: int, direction: tuple[int, int], space: pymunk.Space = None,
+                 enemy_fire: bool = False, collision_filtering: bool = True):
+        super().__init__(x, y, direction, radius=self.RADIUS, impulse=self.IMPULSE, space=space, enemy_fire=enemy_fire,
+                         collision_filtering=collision_filtering)
         self.shape.color = pygame.color.THECOLORS['blue']
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
         """
         Draws the projectile.
         :param screen: screen to draw on.
-        :return: None
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: area of the screen drawn on.
         """
-        x, y = self.body.position
-        scaled_image = pygame.transform.scale(self.BULLET_IMAGE, (self.PROJECTILE_RADIUS*4, self.PROJECTILE_RADIUS*4))
-        screen.blit(scaled_image, (x - self.PROJECTILE_RADIUS*2, y - self.PROJECTILE_RADIUS*2))
+        x, y = self.interpolated_position(alpha)
+        scaled_image = self.sprite(self.BULLET_IMAGE, (self.PROJECTILE_RADIUS*4, self.PROJECTILE_RADIUS*4))
+        return screen.blit(scaled_image, (x - self.PROJECTILE_RADIUS*2, y - self.PROJECTILE_RADIUS*2))
 
 
 class Rocket(Projectile):
@@ -86,22 +172,29 @@ class Rocket(Projectile):
     Bullet class.
     """
     # Projectile Image
-    ROCKET_IMAGE = pygame.image.load('assets/Weapons/Rocket.png')
-
-    def __init__(self, x: int, y: int, direction: tuple[int, int]):
-        super().__init__(x, y, direction, radius=25, impulse=500)
+    ROCKET_IMAGE = 'assets/Weapons/Rocket.png'
+    ANIMATION = Animation('assets/_Foozle/Main ship weapons/PNGs/Main ship weapon - Projectile - Rocket.png')
+    RADIUS = 25
+    IMPULSE = 500
+    KIND = settings.ROCKET_KIND
+
+    def __init__(self, x: int, y: int, direction: tuple[int, int], space: pymunk.Space = None,
+                 enemy_fire: bool = False, collision_filtering: bool = True):
+        super().__init__(x, y, direction, radius=self.RADIUS, impulse=self.IMPULSE, space=space, enemy_fire=enemy_fire,
+                         collision_filtering=collision_filtering)
         self.shape.color = pygame.color.THECOLORS['green']
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
         """
         Draws the projectile.
         :param screen: screen to draw on.
-        :return: None
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: area of the screen drawn on.
         """
-        x, y = self.body.position
-        scaled_image = pygame.transform.scale(self.ROCKET_IMAGE,
-                                              (self.PROJECTILE_RADIUS * 4, self.PROJECTILE_RADIUS * 4))
-        screen.blit(scaled_image, (x - self.PROJECTILE_RADIUS * 2, y - self.PROJECTILE_RADIUS * 2))
+        x, y = self.interpolated_position(alpha)
+        scaled_image = self.sprite(self.ROCKET_IMAGE,
+                                         (self.PROJECTILE_RADIUS * 4, self.PROJECTILE_RADIUS * 4))
+        return screen.blit(scaled_image, (x - self.PROJECTILE_RADIUS * 2, y - self.PROJECTILE_RADIUS * 2))
 
 
 class Laser(Projectile):
@@ -109,19 +202,30 @@ class Laser(Projectile):
     Bullet class.
     """
     # Projectile Image
-    LASER_IMAGE = pygame.image.load('assets/Weapons/Laser.png')
-
-    def __init__(self, x: int, y: int, direction: tuple[int, int]):
-        super().__init__(x, y, direction, radius=10, impulse=2000)
+    LASER_IMAGE = 'assets/Weapons/Laser.png'
+    ANIMATION = Animation('assets/_Foozle/Main ship weapons/PNGs/Main ship weapon - Projectile - Zapper.png')
+    RADIUS = 10
+    IMPULSE = 2000
+    KIND = settings.LASER_KIND
+
+    def __init__(self, x: int, y: int, direction: tuple[int, int], space: pymunk.Space = None,
+                 enemy_fire: bool = False, collision_filtering: bool = True):
+        super().__init__(x, y, direction, radius=self.RADIUS, impulse=self.IMPULSE, space=space, enemy_fire=enemy_fire,
+                         collision_filtering=collision_filtering)
         self.shape.color = pygame.color.THECOLORS['red']
 
-    def draw(self, screen: pygame.Surface) -> None:
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> pygame.Rect:
         """
         Draws the projectile.
         :param screen: screen to draw on.
-        :return: None
+        :param alpha: interpolation between the previous and the current physics tick.
+        :return: area of the screen drawn on.
         """
-        x, y = self.body.position
-        scaled_image = pygame.transform.scale(self.LASER_IMAGE,
-                                              (self.PROJECTILE_RADIUS * 4, self.PROJECTILE_RADIUS * 4))
-        screen.blit(scaled_image, (x - self.PROJECTILE_RADIUS * 2, y - self.PROJECTILE_RADIUS * 2))
+        x, y = self.interpolated_position(alpha)
+        scaled_image = self.sprite(self.LASER_IMAGE,
+                                         (self.PROJECTILE_RADIUS * 4, self.PROJECTILE_RADIUS * 4))
+        return screen.blit(scaled_image, (x - self.PROJECTILE_RADIUS * 2, y - self.PROJECTILE_RADIUS * 2))
+
+
+# Projectile classes by entity kind
+PROJECTILES = {settings.BULLET_KIND: Bullet, settings.ROCKET_KIND: Rocket, settings.LASER_KIND: Laser}
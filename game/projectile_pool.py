@@ -0,0 +1,69 @@
+"""
+This module contains the ProjectilePool class.
+The pool recycles projectiles, their bodies and their shapes instead of building new ones per shot.
+"""
+import pymunk
+from game.projectile import Projectile
+
+
+class ProjectilePool:
+    """
+    Projectile pool class.
+    Keeps a free list per projectile type; released projectiles are taken out of the physics space.
+    Launched projectiles get their collision category unless collision filtering is off.
+    """
+    def __init__(self, space: pymunk.Space, collision_filtering: bool = True):
+        self.space = space
+        self.collision_filtering = collision_filtering
+        self.free = {}
+
+        # Pool statistics
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+
+    def acquire(self, projectile_type: type, x: int, y: int, direction: tuple[int, int],
+                enemy_fire: bool = False) -> Projectile:
+        """
+        Returns a launched projectile, reusing a released one when available.
+        :param projectile_type: concrete projectile class.
+        :param x: x coordinate.
+        :param y: y coordinate.
+        :param direction: direction to launch in.
+        :param enemy_fire: whether an enemy fired the projectile.
+        :return: projectile instance.
+        """
+        free = self.free.get(projectile_type)
+        if free:
+            self.hits += 1
+            projectile = free.pop()
+            projectile.launch(x, y, direction, enemy_fire, self.collision_filtering)
+            return projectile
+
+        self.misses += 1
+        return projectile_type(x, y, direction, space=self.space, enemy_fire=enemy_fire,
+                               collision_filtering=self.collision_filtering)
+
+    def release(self, projectile: Projectile) -> None:
+        """
+        Takes a projectile out of the physics space and keeps it for reuse.
+        :param projectile: projectile to release.
+        :return: None
+        """
+        projectile.retire()
+        self.free.setdefault(type(projectile), []).append(projectile)
+        self.releases += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the pool hit and miss statistics.
+        :return: pool statistics.
+        """
+        requests = self.hits + self.misses
+        return {
+            'pool_hits': self.hits,
+            'pool_misses': self.misses,
+            'pool_releases': self.releases,
+            'pool_hit_rate': self.hits / requests if requests else 0.0,
+            'pool_free': sum(len(free) for free in self.free.values()),
+        }
@@ -0,0 +1,227 @@
+"""
+This module contains the FrameRecorder class.
+The frame recorder writes gameplay video to disk, as a PNG sequence or a raw RGB stream, without stalling
+the game loop: the main thread only copies the screen into a free buffer of a bounded ring, and a worker
+thread converts, encodes and writes the frames.
+Every recording has an index with the frame number, simulation tick, time and stream offset of each frame.
+"""
+import collections
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+import numpy as np
+import pygame
+from game.profiler import percentile
+from game import settings
+
+
+class FrameRecorder:
+    """
+    Frame recorder class.
+    Buffers hold the raw 32-bit pixels of the screen, so capturing a frame is a single memory copy;
+    picking the RGB channels out of them is left to the worker.
+    PNG files are encoded with zlib rather than pygame.image.save, which holds the GIL for the whole
+    encode and would stall the game loop behind the worker.
+    When no buffer is free the drop policy decides: drop the new frame, drop the oldest frame still waiting
+    to be written, or block the game loop until the writer catches up.
+    """
+    # Formats
+    PNG = 'png'
+    RAW = 'raw'
+    FORMATS = (PNG, RAW)
+
+    # Drop Policies
+    DROP_NEWEST = 'newest'
+    DROP_OLDEST = 'oldest'
+    BLOCK = 'block'
+    POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+    # Files
+    INDEX_FILE = 'index.bin'
+    RAW_FILE = 'frames.rgb'
+    PNG_FILE = 'frame_{:06d}.png'
+
+    # PNG: signature, and an 8-bit RGB header without interlacing
+    PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+    PNG_HEADER = struct.Struct('>IIBBBBB')
+
+    # Index: magic, version, format, width, height, then one record per written frame
+    MAGIC = b'GGRV'
+    VERSION = 1
+    INDEX_HEADER = struct.Struct('<4sHBII')
+    INDEX_RECORD = struct.Struct('<qqdQ')  # frame number, tick, seconds since the start, offset in the stream
+
+    def __init__(self, path: str, size: tuple[int, int], frame_format: str = settings.RECORDER_FORMAT,
+                 policy: str = settings.RECORDER_POLICY, buffers: int = settings.RECORDER_BUFFERS,
+                 factor: int = settings.RECORDER_FACTOR):
+        if frame_format not in self.FORMATS:
+            raise ValueError(f'Unknown frame format: {frame_format}')
+        if policy not in self.POLICIES:
+            raise ValueError(f'Unknown drop policy: {policy}')
+        self.path = path
+        self.frame_format = frame_format
+        self.policy = policy
+        self.factor = factor
+        width, height = size
+        self.width, self.height = -(-width // factor), -(-height // factor)
+        # Zeroed up front, so the first frames do not pay for faulting the pages in
+        self.buffers = [np.empty((self.height, self.width), dtype=np.uint32) for _ in range(buffers)]
+        for buffer in self.buffers:
+            buffer.fill(0)
+        # PNG scanlines start with their filter type, 0 for none; raw scanlines are bare RGB
+        filter_type = 1 if frame_format == self.PNG else 0
+        self.scanlines = np.zeros((self.height, filter_type + self.width * 3), dtype=np.uint8)
+        self.rgb = self.scanlines[:, filter_type:].reshape(self.height, self.width, 3)
+        self.channels = None
+
+        os.makedirs(path, exist_ok=True)
+        self.index = open(os.path.join(path, self.INDEX_FILE), 'wb')
+        self.index.write(self.INDEX_HEADER.pack(self.MAGIC, self.VERSION, self.FORMATS.index(frame_format),
+                                                self.width, self.height))
+        self.stream = open(os.path.join(path, self.RAW_FILE), 'wb') if frame_format == self.RAW else None
+        self.offset = 0
+        self.start = time.perf_counter()
+
+        # Free buffers, and (buffer, frame number, tick, time) of the frames waiting to be written
+        self.free = collections.deque(range(buffers))
+        self.pending = collections.deque()
+        self.condition = threading.Condition()
+        self.closing = False
+        self.worker = threading.Thread(target=self.__write_frames, name='frame-recorder', daemon=True)
+        self.worker.start()
+
+        # Frame recorder statistics
+        self.frames = 0
+        self.written = 0
+        self.dropped = 0
+        self.peak_depth = 0
+        self.costs = array('d', bytes(8 * settings.RECORDER_HISTORY))
+        self.total_cost = 0.0
+
+    def capture(self, screen: pygame.Surface, tick: int) -> bool:
+        """
+        Queues the screen as the next frame, right after it was rendered.
+        :param screen: screen to capture.
+        :param tick: simulation tick of the frame.
+        :return: True if the frame was queued, False if it was dropped.
+        """
+        start = time.perf_counter()
+        frame = self.frames
+        self.frames += 1
+        with self.condition:
+            if not self.free:
+                if self.policy == self.DROP_OLDEST and self.pending:
+                    self.free.append(self.pending.popleft()[0])
+                    self.dropped += 1
+                elif self.policy == self.BLOCK:
+                    self.condition.wait_for(lambda: self.free)
+            slot = self.free.popleft() if self.free else None
+        if slot is None:
+            self.dropped += 1
+            self.__cost(start)
+            return False
+
+        if self.channels is None:
+            # Byte of every RGB channel within a little-endian pixel
+            self.channels = [shift // 8 for shift in screen.get_shifts()[:3]]
+        pixels = pygame.surfarray.pixels2d(screen)
+        try:
+            # Rows of the transposed view are contiguous, so a full-size frame is one memory copy
+            self.buffers[slot][:] = pixels.T[::self.factor, ::self.factor]
+        finally:
+            del pixels
+
+        with self.condition:
+            self.pending.append((slot, frame, tick, start - self.start))
+            self.peak_depth = max(self.peak_depth, len(self.pending))
+            self.condition.notify_all()
+        self.__cost(start)
+        return True
+
+    def close(self) -> None:
+        """
+        Writes the frames still waiting, stops the worker and closes the files.
+        :return: None
+        """
+        if self.closing:
+            return
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.worker.join()
+        self.index.close()
+        if self.stream is not None:
+            self.stream.close()
+
+    def __cost(self, start: float) -> None:
+        """
+        Records the main-thread cost of one captured frame.
+        :param start: perf_counter() value at the start of the capture.
+        :return: None
+        """
+        cost = time.perf_counter() - start
+        self.costs[(self.frames - 1) % len(self.costs)] = cost
+        self.total_cost += cost
+
+    def __write_frames(self) -> None:
+        """
+        Worker loop writing the queued frames in order until the recorder closes.
+        :return: None
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closing)
+                if not self.pending:
+                    return
+                slot, frame, tick, seconds = self.pending.popleft()
+
+            # Pick the RGB channels out of the 32-bit pixels, one plane at a time
+            pixels = self.buffers[slot].view(np.uint8).reshape(self.height, self.width, 4)
+            for channel, byte in enumerate(self.channels):
+                self.rgb[..., channel] = pixels[..., byte]
+            with self.condition:
+                self.free.append(slot)
+                self.condition.notify_all()
+
+            if self.stream is not None:
+                self.stream.write(self.scanlines.data)
+            else:
+                with open(os.path.join(self.path, self.PNG_FILE.format(frame)), 'wb') as file:
+                    file.write(self.__encode_png())
+            self.index.write(self.INDEX_RECORD.pack(frame, tick, seconds, self.offset))
+            if self.stream is not None:
+                self.offset += self.rgb.nbytes
+            self.written += 1
+
+    def __encode_png(self) -> bytes:
+        """
+        Encodes the converted frame as a PNG file.
+        :return: PNG file contents.
+        """
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+        header = self.PNG_HEADER.pack(self.width, self.height, 8, 2, 0, 0, 0)
+        data = zlib.compress(self.scanlines.data, settings.RECORDER_PNG_LEVEL)
+        return self.PNG_SIGNATURE + chunk(b'IHDR', header) + chunk(b'IDAT', data) + chunk(b'IEND', b'')
+
+    def stats(self) -> dict:
+        """
+        Returns the frame recorder statistics.
+        :return: frame recorder statistics.
+        """
+        filled = min(self.frames, len(self.costs))
+        costs = sorted(self.costs[:filled])
+        return {
+            'recorder_frames': self.frames,
+            'recorder_written': self.written,
+            'recorder_dropped': self.dropped,
+            'recorder_queue_depth': len(self.pending),
+            'recorder_peak_queue_depth': self.peak_depth,
+            'recorder_capture_mean_ms': self.total_cost / self.frames * 1000 if self.frames else 0.0,
+            'recorder_capture_p99_ms': percentile(costs, 99) * 1000,
+            'recorder_capture_max_ms': costs[-1] * 1000 if costs else 0.0,
+        }
@@ -0,0 +1,170 @@
+"""
+This module handles input recording and replay.
+A recording holds the seed, the difficulty and one byte of key state per tick,
+followed by a digest of the final game state to detect divergence on replay.
+"""
+import hashlib
+import struct
+import zlib
+import pygame
+from game.headless import KeyState
+from game.world import World
+from game import settings
+
+
+# Keys read by Player.player_key, one bit each
+TRACKED_KEYS = (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d,
+                pygame.K_SPACE, pygame.K_1, pygame.K_2, pygame.K_3)
+
+# Key state of every possible tick byte
+KEY_STATES = [KeyState(frozenset(key for bit, key in enumerate(TRACKED_KEYS) if mask >> bit & 1))
+              for mask in range(1 << len(TRACKED_KEYS))]
+
+
+def encode_keys(keys) -> int:
+    """
+    Packs the tracked keys of a key state into one byte.
+    :param keys: user input.
+    :return: key mask.
+    """
+    mask = 0
+    for bit, key in enumerate(TRACKED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def state_digest(world: World) -> bytes:
+    """
+    Hashes the final entity state of a world.
+    Positions and velocities are rounded to a thousandth of a pixel.
+    :param world: world to hash.
+    :return: digest.
+    """
+    digest = hashlib.blake2b(digest_size=Recording.DIGEST_SIZE)
+    digest.update(struct.pack('<q?', world.clock.ticks, world.player.destroyed))
+    ships = [world.player, *world.enemies, *world.player.weapon.projectiles]
+    for ship in ships:
+        body = ship.body
+        digest.update(struct.pack('<4d', round(body.position.x, 3), round(body.position.y, 3),
+                                  round(body.velocity.x, 3), round(body.velocity.y, 3)))
+    if world.game_logic.kinematic_projectiles is not None:
+        digest.update(world.game_logic.kinematic_projectiles.positions.round(3).tobytes())
+    if world.game_logic.enemy_fire is not None:
+        digest.update(world.game_logic.enemy_fire.positions().round(3).tobytes())
+    return digest.digest()
+
+
+def state_summary(world: World) -> tuple[int, int, int]:
+    """
+    Returns the entity counts of a world, to report where a replay diverged.
+    :param world: world to summarize.
+    :return: ticks, enemies left and live projectiles.
+    """
+    return world.clock.ticks, len(world.enemies), len(world.player.weapon.projectiles)
+
+
+class Recording:
+    """
+    Recording class.
+    Collects the key state of every tick and saves or loads it in the compact binary format.
+    """
+    # Format Magic Numbers
+    MAGIC = b'GGRP'
+    VERSION = 1
+    DIGEST_SIZE = 16
+    HEADER = struct.Struct('<4sHqhdI')  # magic, version, seed, difficulty, timestep, compressed size
+    FOOTER = struct.Struct(f'<qqq{DIGEST_SIZE}s')  # ticks, enemies, projectiles, digest
+
+    def __init__(self, seed: int = 0, difficulty: int = 0, timestep: float = 0.0):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.timestep = timestep
+        self.masks = bytearray()
+        self.summary = None
+        self.digest = None
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def record(self, keys) -> None:
+        """
+        Records the key state of one tick.
+        :param keys: user input.
+        :return: None
+        """
+        self.masks.append(encode_keys(keys))
+
+    def keys(self, tick: int) -> KeyState:
+        """
+        Returns the recorded key state of a tick.
+        Lets a recording drive HeadlessRunner like a key script.
+        :param tick: tick number.
+        :return: key state.
+        """
+        return KEY_STATES[self.masks[tick]]
+
+    def finish(self, world: World) -> None:
+        """
+        Stores the final state of the recorded world.
+        :param world: recorded world.
+        :return: None
+        """
+        self.summary = state_summary(world)
+        self.digest = state_digest(world)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the recording to a file.
+        :param path: file path.
+        :return: None
+        """
+        masks = zlib.compress(bytes(self.masks))
+        with open(path, 'wb') as file:
+            file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.difficulty, self.timestep,
+                                        len(masks)))
+            file.write(masks)
+            file.write(self.FOOTER.pack(*self.summary, self.digest))
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        """
+        Reads a recording from a file.
+        :param path: file path.
+        :return: recording.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, seed, difficulty, timestep, size = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f'{path} is not a version {cls.VERSION} recording')
+        if timestep != settings.PHYSICS_TIMESTEP:
+            raise ValueError(f'{path} was recorded with a {timestep:.6g} s physics timestep, '
+                             f'but this game steps {settings.PHYSICS_TIMESTEP:.6g} s')
+
+        recording = cls(seed, difficulty, timestep)
+        recording.masks = bytearray(zlib.decompress(data[cls.HEADER.size:cls.HEADER.size + size]))
+        *summary, recording.digest = cls.FOOTER.unpack_from(data, cls.HEADER.size + size)
+        recording.summary = tuple(summary)
+        return recording
+
+    def create_world(self) -> World:
+        """
+        Creates a world set up like the recorded one.
+        :return: world object.
+        """
+        return World(self.difficulty, self.seed, enemy_fire=settings.ENEMY_FIRE_PATTERN)
+
+    def divergence(self, world: World) -> list[str]:
+        """
+        Compares the final state of a replayed world with the recorded one.
+        :param world: replayed world.
+        :return: descriptions of the differences, empty if the replay matches.
+        """
+        differences = []
+        for name, recorded, replayed in zip(('ticks', 'enemies', 'projectiles'), self.summary, state_summary(world)):
+            if recorded != replayed:
+                differences.append(f'{name}: recorded {recorded}, replayed {replayed}')
+        if state_digest(world) != self.digest:
+            differences.append('entity positions or velocities differ')
+        return differences
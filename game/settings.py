@@ -16,8 +16,53 @@ GRAVITY_Y = 0
 UPDATES_PER_SECOND = 60.0
 FRAMES_PER_SECOND = 60
 
+# Fixed Timestep
+PHYSICS_TIMESTEP = 1.0 / UPDATES_PER_SECOND
+MAX_STEPS_PER_FRAME = 5
+
+# Animation
+ANIMATION_FRAME_TICKS = 6
+ANIMATION_PHASES = 4
+
+# Texture Atlas
+ATLAS_CACHE_PATH = '.cache/atlas.bin'
+ATLAS_WIDTH = 1024
+
+# Frame Profiler
+PROFILER_HISTORY = 600
+PROFILER_OVERLAY_REFRESH = 30
+PROFILER_FONT_SIZE = 20
+
+# Frame Budget Governor
+FRAME_GOVERNOR = True
+GOVERNOR_SKIP_FRAMES = 1  # frames skipped after every rendered one below full quality
+GOVERNOR_COOLDOWN = 30  # frames between two quality changes
+GOVERNOR_SMOOTHING = 0.1  # weight of the newest frame in the moving averages
+GOVERNOR_HEADROOM = 0.75  # fraction of the budget the better level must fit in to move back up
+GOVERNOR_PROBE = 600  # frames at a lower level before trying the better one again
+GOVERNOR_SWEEP_ENEMIES = 500
+GOVERNOR_SWEEP_FRAMES = 600
+GOVERNOR_SWEEP_LOADS = (0.0, 5.0, 10.0)
+
+# Frame Capture
+CAPTURE_LUMA = (77, 150, 29)  # BT.601 weights in 256ths
+CAPTURE_FACTORS = (1, 2, 4)
+CAPTURE_FRAMES = 300
+
+# Frame Recorder
+RECORDER_FORMAT = 'raw'
+RECORDER_POLICY = 'oldest'  # frame dropped when the writer falls behind: 'newest', 'oldest' or 'block'
+RECORDER_BUFFERS = 8
+RECORDER_FACTOR = 4  # downsampling factor; smaller ones copy too much to keep captures well under a millisecond
+RECORDER_HISTORY = 600  # capture costs kept for percentiles
+RECORDER_PNG_LEVEL = 1  # zlib level of PNG frames, favouring speed
+
 PADDING = 25
 
+# Dirty-rect rendering falls back to a full flip above this fraction of the screen
+DIRTY_RECT_RENDERING = True
+DIRTY_RECT_MAX_AREA = 0.3
+
 # Files (y)
 TOTAL_FILES = SCREEN_HEIGHT // (SHIP_HEIGHT + PADDING)
 SCREEN_FILE_DIFF = SHIP_HEIGHT + PADDING
@@ -33,15 +78,28 @@ for i in range(1, TOTAL_RANKS):
     SCREEN_RANK.append(SCREEN_RANK[i - 1] + SCREEN_RANK_DIFF)
 
 
+# Allowed distance in pixels between a position and a file
+FILE_TOLERANCE = 5
+
+
+def file_index(y_position) -> int:
+    """
+    Returns the index of the file the y_position is in, or -1 if it is in none.
+    Allows for a 5 pixel error.
+    """
+    index = round((y_position - SCREEN_FILE[0]) / SCREEN_FILE_DIFF)
+    if 0 <= index < TOTAL_FILES and abs(y_position - SCREEN_FILE[index]) <= FILE_TOLERANCE:
+        return index
+    return -1
+
+
 def is_even_file(y_position) -> bool:
     """
     Returns True if the y_position is in an even y.
     Allows for a 5 pixel error.
     """
-    for file in SCREEN_FILE[::2]:
-        if abs(y_position - file) <= 5:
-            return True
-    return False
+    index = file_index(y_position)
+    return index >= 0 and index % 2 == 0
 
 
 def is_odd_file(y_position) -> bool:
@@ -49,19 +107,99 @@ def is_odd_file(y_position) -> bool:
     Returns True if the y_position is in an odd y.
     Allows for a 5 pixel error.
     """
-    for file in SCREEN_FILE[1::2]:
-        if abs(y_position - file) <= 5:
-            return True
-    return False
+    index = file_index(y_position)
+    return index >= 0 and index % 2 == 1
+
 
+# Stress Scenarios
+STRESS_FILES = TOTAL_FILES // 2  # Keep the rows near the player free
+STRESS_TICKS = 300
+STRESS_COUNTS = (100, 250, 500, 1000, 2000, 4000)
 
 # Game Difficulty
 EASY = 1
 MEDIUM = 2
 HARD = 3
 
+# Enemy Fire (pattern name from game.bullet_pattern.PATTERNS, None for no enemy fire)
+ENEMY_FIRE_PATTERN = 'aimed'
+ENEMY_FIRE_BACKEND = 'array'
+ENEMY_FIRE_PERIOD = 180  # ticks between two shots of one enemy
+ENEMY_BULLET_SPEED = 250.0
+ENEMY_BULLET_CAPACITY = 10000
+BULLET_SWEEP_COUNTS = (250, 1000, 2500, 5000, 10000)
+BULLET_SWEEP_TICKS = 600
+
+# Kinematic Projectiles (weapon names from game.weapon.WEAPONS that skip pymunk)
+KINEMATIC_WEAPONS = ()
+KINEMATIC_CAPACITY = 4096
+KINEMATIC_SWEEP_ENEMIES = 2000
+
+# Network
+NET_HOST = '127.0.0.1'
+NET_PORT = 47000
+NET_POSITION_SCALE = 8  # snapshot positions and velocities are sent in eighths of a pixel
+NET_SNAPSHOT_HISTORY = 64  # ticks of snapshots kept as delta baselines
+NET_INTERPOLATION_TICKS = 3  # clients draw this many ticks behind the newest snapshot
+NET_CLIENT_TIMEOUT = 5.0  # seconds of silence before a client is dropped
+NET_MAX_DATAGRAM = 65507
+NET_COMPRESSION_LEVEL = 1
+NET_SWEEP_SPECTATORS = (0, 1, 2, 4, 8, 16, 32, 64)
+NET_SWEEP_TICKS = 600
+
+# Game State Snapshots
+STATE_SWEEP_WARMUP = 120  # ticks played before saving, so projectiles and bullets are in flight
+STATE_SWEEP_REPEATS = 100
+STATE_SWEEP_ROLLBACK = 30  # ticks replayed after a restore to check it matches
+
+# Soak Run
+SOAK_TICKS = 50000
+SOAK_SAMPLE_TICKS = 1000  # ticks between samples
+SOAK_WARMUP_TICKS = 5000  # ticks before the memory baseline, once pools and caches have filled up
+SOAK_RSS_GROWTH_MB = 16.0  # resident memory the run may gain after warm-up
+
+# Vector Environment
+ENV_MAX_TICKS = 3000  # ticks before an episode is cut short
+ENV_FRAME_SKIP = 1  # ticks an action is held for
+ENV_ENEMY_ROWS = 64  # observation rows for enemies
+ENV_PROJECTILE_ROWS = 128  # observation rows for projectiles and enemy bullets
+ENV_VELOCITY_SCALE = 1000.0  # velocities are observed in thousands of pixels per second
+ENV_KILL_REWARD = 1.0
+ENV_WIN_REWARD = 10.0
+ENV_LOSS_REWARD = -10.0
+ENV_SWEEP_ENVS = (1, 4, 16, 64)
+ENV_SWEEP_STEPS = 500
+
+# Entity Kinds
+PLAYER_KIND = 0
+ENEMY_KIND = 1
+BULLET_KIND = 2
+ROCKET_KIND = 3
+LASER_KIND = 4
+
 # Collision Types
 DEFAULT_COLLISION_TYPE = 0
 PLAYER_COLLISION_TYPE = 1
 PROJECTILE_COLLISION_TYPE = 2
 ENEMY_COLLISION_TYPE = 3
+
+# Collision Categories
+PLAYER_CATEGORY = 0b0001
+ENEMY_CATEGORY = 0b0010
+PLAYER_PROJECTILE_CATEGORY = 0b0100
+ENEMY_PROJECTILE_CATEGORY = 0b1000
+
+# Collision Masks (categories each category collides with)
+PLAYER_MASK = ENEMY_CATEGORY | ENEMY_PROJECTILE_CATEGORY
+ENEMY_MASK = PLAYER_CATEGORY | PLAYER_PROJECTILE_CATEGORY
+PLAYER_PROJECTILE_MASK = ENEMY_CATEGORY
+ENEMY_PROJECTILE_MASK = PLAYER_CATEGORY
+
+# Spatial Hash Broadphase (cell size matches a ship, cell count grows with the number of shapes)
+SPATIAL_HASH_DIM = SHIP_WIDTH
+SPATIAL_HASH_COUNT = 1000
+SPATIAL_HASH_CELLS_PER_SHAPE = 10
+
+# Headless Simulation
+HEADLESS_VIDEO_DRIVER = 'dummy'
+BENCHMARK_TICKS = 3000
@@ -6,6 +6,10 @@ The ship class is shared by the player and the enemy.
 import pygame
 import pymunk
 import pymunk.pygame_util
+from game.sprite_cache import SpriteCache
+from game.animation import Animation, Animator
+from game.clock import interpolated_position
+from game.weapon import WeaponInventory
 from game import settings
 
 
@@ -26,6 +30,16 @@ class Ship:
     THRUST_RIGHT = (1*THRUST_CONSTANT, 0)  # Thrust vector pointing right
     THRUST_NONE = (0, 0)  # No thrust
 
+    # Whether projectiles fired by the ship belong to the enemy side
+    ENEMY_FIRE = False
+
+    # Size of the ship images and animation frames
+    SPRITE_SIZE = (settings.SHIP_WIDTH*2, settings.SHIP_HEIGHT*2)
+
+    # Engine Animations, with the ship baked into every frame
+    ENGINE_IDLE = None
+    ENGINE_POWERING = None
+
     def __init__(self, x: int, y: int,
                  vertices: list[tuple[float, float]],
                  color: tuple[int, int, int, int] = (255, 0, 255, 0)):
@@ -38,6 +52,14 @@ class Ship:
         self.shape.belonging_object = self
         self.destroyed = False
         self.weapon = None
+        self.inventory = None
+        self.projectile_pool = None
+        self.kinematic_projectiles = None
+        self.clock = None
+        # Entity store the ship is a view into, and its handle there
+        self.store = None
+        self.entity = None
+        self.animation_phase = Animator().next_phase()
 
     def move(self, thrust_direction: tuple[int, int]) -> None:
         """
@@ -48,26 +70,51 @@ class Ship:
         # self.body.apply_force_at_local_point(thrust_direction, self.SHIP_CENTER_OF_GRAVITY)
         self.body.velocity = thrust_direction
 
-    def draw(self, screen: pygame.Surface, image: pygame.Surface, x: int, y: int) -> None:
+    def interpolated_position(self, alpha: float = 1.0) -> tuple[float, float]:
+        """
+        Returns the position of the ship between the previous and the current physics tick.
+        :param alpha: fraction of the way from the previous tick (0) to the current one (1).
+        :return: x and y coordinates.
+        """
+        return interpolated_position(self.body, alpha)
+
+    def draw(self, screen: pygame.Surface, image: str, x: int, y: int) -> pygame.Rect:
         """
         Draws the ship on the screen.
         :param screen: screen to draw on.
-        :param image: image to draw.
+        :param image: path of the image to draw.
         :param x: x coordinate of the ship.
         :param y: y coordinate of the ship.
-        :return: None
+        :return: area of the screen drawn on.
         """
-        scaled_image = pygame.transform.scale(image, (settings.SHIP_WIDTH*2, settings.SHIP_HEIGHT*2))
+        size = self.SPRITE_SIZE
 
-        screen.blit(scaled_image, (x, y))
+        animator = Animator()
+        if animator.enabled and self.ENGINE_IDLE is not None:
+            scaled_image = animator.frame(self.engine_animation(), size, self.animation_phase)
+        else:
+            scaled_image = SpriteCache().get(image, size)
+        return screen.blit(scaled_image, (x, y))
+
+    def engine_animation(self) -> Animation:
+        """
+        Returns the engine animation matching the thrust of the ship.
+        :return: animation.
+        """
+        return self.ENGINE_IDLE if self.body.velocity == self.THRUST_NONE else self.ENGINE_POWERING
 
     def equip_weapon(self, weapon) -> None:
         """
-        Adds a weapon to the ship.
-        :param weapon: weapon to add.
+        Switches the ship to a weapon from its inventory.
+        A ship without an inventory gets one with its own projectile registry.
+        :param weapon: weapon class to switch to.
         :return: None
         """
-        self.weapon = weapon(self)
+        if type(self.weapon) is weapon:
+            return
+        if self.inventory is None:
+            self.inventory = WeaponInventory(self)
+        self.weapon = self.inventory.get(weapon)
 
     def shoot(self, direction: tuple[int, int]) -> None:
         """
@@ -80,10 +127,23 @@ class Ship:
     def destroy(self) -> None:
         """
         Destroys the ship.
+        The ship stays in the physics space until the lifecycle manager retires it after the step.
         :return: None
         """
         self.body.position = -100, -100
         self.destroyed = True
+        if self.store is not None:
+            self.store.kill(self.entity)
+
+    def retire(self) -> None:
+        """
+        Takes the ship body and shape out of the physics space.
+        :return: None
+        """
+        if self.shape.space is not None:
+            self.shape.space.remove(self.shape)
+        if self.body.space is not None:
+            self.body.space.remove(self.body)
 
 
 class TriangleShape(pymunk.Poly):
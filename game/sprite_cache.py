@@ -0,0 +1,109 @@
+"""
+This module contains the SpriteCache class.
+The sprite cache holds pre-scaled copies of images so draw calls only blit.
+"""
+import pygame
+from game.singleton import SingletonMeta
+from game.assets import AssetManager
+
+
+class SpriteCache(metaclass=SingletonMeta):
+    """
+    Sprite cache singleton class.
+    Keyed by (image path, target size), so a new scale simply misses the cache.
+    Emptied whenever the display format changes.
+    """
+    def __init__(self):
+        self.sprites = {}
+        self.frames = {}
+        self.display_format = None
+
+    def get(self, image: str, size: tuple[float, float]) -> pygame.Surface:
+        """
+        Returns the image scaled to a given size, scaling it only on the first request.
+        :param image: source image path, loaded through the AssetManager.
+        :param size: target size in pixels.
+        :return: scaled image.
+        """
+        key = (image, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.__prepare(AssetManager().get(image), size)
+            self.sprites[key] = sprite
+        return sprite
+
+    def get_frames(self, sheet: str, size: tuple[float, float], flip: bool = False,
+                   overlays: tuple[str, ...] = ()) -> list[pygame.Surface]:
+        """
+        Returns the frames of a horizontal sprite sheet of square frames, each scaled to a given size.
+        The sheet is sliced only on the first request.
+        :param sheet: sprite sheet path, loaded through the AssetManager.
+        :param size: target size of every frame in pixels.
+        :param flip: whether to flip the frames vertically.
+        :param overlays: paths of images composited on top of every frame, so drawing a frame takes one blit.
+        :return: scaled frames.
+        """
+        key = (sheet, size, flip, overlays)
+        frames = self.frames.get(key)
+        if frames is None:
+            image = AssetManager().get(sheet)
+            side = image.get_height()
+            frames = []
+            for index in range(image.get_width() // side):
+                frame = pygame.transform.scale(image.subsurface((index * side, 0, side, side)), size)
+                if flip:
+                    frame = pygame.transform.flip(frame, False, True)
+                for overlay in overlays:
+                    frame.blit(pygame.transform.scale(AssetManager().get(overlay), size), (0, 0))
+                frames.append(self.__prepare(frame, size))
+            self.frames[key] = frames
+        return frames
+
+    def install(self, atlas) -> None:
+        """
+        Fills the cache with the sprites and animation frames of a texture atlas.
+        The atlas is converted to the display format in one go, so it has to be installed after the display is set.
+        :param atlas: texture atlas.
+        :return: None
+        """
+        surface = atlas.surface
+        screen = pygame.display.get_surface() if pygame.display.get_init() else None
+        if screen is not None:
+            surface = surface.convert_alpha()
+            self.display_format = (screen.get_bitsize(), screen.get_masks(), screen.get_flags())
+        for key, rect in atlas.sprites.items():
+            self.sprites[key] = surface.subsurface(rect)
+        for key, rects in atlas.frames.items():
+            self.frames[key] = [surface.subsurface(rect) for rect in rects]
+
+    def validate(self, screen: pygame.Surface) -> None:
+        """
+        Empties the cache if the format of the screen differs from the one the sprites were converted to.
+        Meant to be called once per frame.
+        :param screen: screen the sprites are drawn on.
+        :return: None
+        """
+        display_format = (screen.get_bitsize(), screen.get_masks(), screen.get_flags())
+        if display_format != self.display_format:
+            self.invalidate()
+            self.display_format = display_format
+
+    def invalidate(self) -> None:
+        """
+        Empties the cache.
+        :return: None
+        """
+        self.sprites.clear()
+        self.frames.clear()
+
+    def __prepare(self, image: pygame.Surface, size: tuple[float, float]) -> pygame.Surface:
+        """
+        Scales an image and converts it to the display format when a display exists.
+        :param image: source image.
+        :param size: target size in pixels.
+        :return: prepared image.
+        """
+        scaled_image = pygame.transform.scale(image, size)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            scaled_image = scaled_image.convert_alpha()
+        return scaled_image
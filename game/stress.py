@@ -0,0 +1,168 @@
+"""
+This module handles stress scenarios.
+A stress scenario spawns armies far larger than settings.SCREEN_FILE allows,
+and the sweep measures how each part of a tick scales with the number of enemies.
+The sweeps of other features live in the game.benchmarks package.
+"""
+import csv
+import pymunk
+from game.game_engine import GameObjectFactory
+from game.enemy import Enemy
+from game.ship import Ship
+from game.playfield import Playfield
+from game.profiler import FrameProfiler
+from game.headless import HeadlessRunner, KeyScript
+from game.world import World
+from game import settings
+
+
+class StressScenario:
+    """
+    Stress scenario class.
+    Fills the files of a playfield with enemies and stages the rest in rows above it,
+    from where they fly down into the formation.
+    """
+    # Formations
+    GRID = 'grid'
+    STAGGERED = 'staggered'
+    DENSE = 'dense'
+    FORMATIONS = (GRID, STAGGERED, DENSE)
+
+    def __init__(self, enemies: int, formation: str = GRID, files: int = settings.STRESS_FILES,
+                 playfield: Playfield = None):
+        if formation not in self.FORMATIONS:
+            raise ValueError(f'Unknown formation: {formation}')
+        self.enemies = enemies
+        self.formation = formation
+        self.playfield = Playfield() if playfield is None else playfield
+        self.files = min(files, self.playfield.total_files)
+
+    def row(self, file: int) -> list[int]:
+        """
+        Returns the x coordinates of the enemies of one row.
+        :param file: file index, negative for staging rows.
+        :return: x coordinates.
+        """
+        if self.formation == self.DENSE:
+            return list(range(settings.PADDING, self.playfield.right_edge + 1, settings.SHIP_WIDTH))
+        ranks = range(self.playfield.total_ranks)
+        if self.formation == self.STAGGERED:
+            # Like GameObjectFactory.create_enemy_army: odd files start one rank in
+            ranks = ranks[file % 2::2]
+        return [self.playfield.rank_x(rank) for rank in ranks]
+
+    def positions(self) -> list[tuple[int, int]]:
+        """
+        Returns the starting position of every enemy, on-field files first.
+        :return: x and y coordinates.
+        """
+        positions = []
+        file = 0
+        while len(positions) < self.enemies:
+            y = self.playfield.file_y(file)
+            positions.extend((x, y) for x in self.row(file))
+            # After the last file, stage rows above the top of the playfield
+            file = file + 1 if 0 <= file < self.files - 1 else min(file, 0) - 1
+        return positions[:self.enemies]
+
+    def spawn(self, factory: GameObjectFactory) -> list[Enemy]:
+        """
+        Creates the enemies of the scenario.
+        Staged enemies start flying down towards the formation.
+        :param factory: factory creating the enemies.
+        :return: list of enemies.
+        """
+        enemies = []
+        for x, y in self.positions():
+            enemy = factory.create_enemy(x, y)
+            if y < settings.SCREEN_FILE[0]:
+                enemy.body.velocity = Ship.THRUST_DOWN
+            enemies.append(enemy)
+        return enemies
+
+
+def count_collision_pairs(space: pymunk.Space) -> int:
+    """
+    Counts the shape pairs pymunk is currently resolving.
+    :param space: space object.
+    :return: number of colliding pairs.
+    """
+    arbiters = [0]
+
+    def count(arbiter: pymunk.Arbiter) -> None:
+        arbiters[0] += 1
+
+    for body in space.bodies:
+        body.each_arbiter(count)
+    # Every pair is seen from both of its bodies
+    return arbiters[0] // 2
+
+
+class StressSweep:
+    """
+    Stress sweep class.
+    Plays one headless game per army size and records how long each phase of a tick takes.
+    """
+    def __init__(self, formation: str = StressScenario.GRID, playfield: Playfield = None,
+                 ticks: int = settings.STRESS_TICKS, render: bool = False,
+                 collision_filtering: bool = True, spatial_hash: bool = True):
+        self.formation = formation
+        self.playfield = Playfield() if playfield is None else playfield
+        self.ticks = ticks
+        self.render = render
+        self.collision_filtering = collision_filtering
+        self.spatial_hash = spatial_hash
+
+    def measure(self, enemies: int) -> dict:
+        """
+        Measures one army size.
+        :param enemies: number of enemies.
+        :return: tick and phase timings in milliseconds.
+        """
+        scenario = StressScenario(enemies, self.formation, playfield=self.playfield)
+        world = World(seed=enemies, playfield=self.playfield, scenario=scenario, enemy_fire=None,
+                      collision_filtering=self.collision_filtering, spatial_hash=self.spatial_hash)
+        runner = HeadlessRunner(world=world, render=self.render, profile=True)
+
+        # Count collision pairs outside of the timed part of every tick
+        pairs = []
+        results = runner.run(self.ticks, KeyScript('fire'), lambda tick: pairs.append(count_collision_pairs(world.space)))
+        phases = runner.profiler.summary()
+
+        entity_loops = sum(phases[phase]['mean_ms'] for phase in (FrameProfiler.UPDATE_POSITIONS,
+                                                                   FrameProfiler.DESTROY_OUT_OF_BOUNDS,
+                                                                   FrameProfiler.REMOVE_DESTROYED))
+        rendering = phases[FrameProfiler.RENDER]['mean_ms'] + phases[FrameProfiler.DISPLAY_FLIP]['mean_ms']
+        return {
+            'enemies': enemies,
+            'ticks': results['ticks'],
+            'tick_p50_ms': results['latency_p50_ms'],
+            'tick_p99_ms': results['latency_p99_ms'],
+            'entity_loops_ms': entity_loops,
+            'space_step_ms': phases[FrameProfiler.SPACE_STEP]['mean_ms'],
+            'collision_pairs': sum(pairs) / len(pairs) if pairs else 0.0,
+            'render_ms': rendering,
+            'tick_us_per_enemy': results['latency_p50_ms'] * 1000 / enemies if enemies else 0.0,
+            'enemies_left': results['enemies'],
+        }
+
+    def run(self, counts: list[int]) -> list[dict]:
+        """
+        Measures every army size.
+        :param counts: numbers of enemies.
+        :return: one row of timings per army size.
+        """
+        return [self.measure(enemies) for enemies in counts]
+
+    @staticmethod
+    def export(rows: list[dict], path: str) -> None:
+        """
+        Writes sweep rows to a CSV file.
+        :param rows: sweep rows.
+        :param path: file path.
+        :return: None
+        """
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
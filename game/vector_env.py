@@ -0,0 +1,372 @@
+"""
+This module contains the GameEnv, EnvBuffers and VectorEnv classes.
+A vector environment steps several independent games in lock-step for training agents, without a window
+or pygame.key.get_pressed: an action is a key mask of replay.TRACKED_KEYS, fed to Player.player_key.
+Observations, rewards and done flags of every game are written into one shared-memory NumPy buffer,
+so the games can run in this process or in worker processes without pickling a single array.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from game.world import World
+from game.bullet_pattern import BulletPattern
+from game.replay import KEY_STATES
+from game import settings
+
+
+class GameEnv:
+    """
+    Game environment class.
+    One World behind a Gym-style reset() and step(). Resetting restores the state saved when the world was
+    created, so an episode starts without building a new world. Enemies fire like in the game unless
+    enemy_fire says otherwise.
+    The observation is an entity feature tensor: one row per entity of (kind, x, y, vx, vy, present),
+    the player first, then the enemies, then every projectile and enemy bullet. Rows beyond the entities
+    are zero, and entities beyond the rows are left out.
+    """
+    # Observation Magic Numbers
+    FEATURES = 6
+    ROWS = 1 + settings.ENV_ENEMY_ROWS + settings.ENV_PROJECTILE_ROWS
+
+    # Actions are key masks
+    ACTIONS = len(KEY_STATES)
+
+    def __init__(self, seed: int = 0, difficulty: int = settings.HARD, max_ticks: int = settings.ENV_MAX_TICKS,
+                 frame_skip: int = settings.ENV_FRAME_SKIP, observation: np.ndarray = None,
+                 enemy_fire: str | BulletPattern = settings.ENEMY_FIRE_PATTERN, **options):
+        self.world = World(difficulty, seed, enemy_fire=enemy_fire, **options)
+        self.initial = self.world.game_logic.save_state()
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.observation = np.zeros((self.ROWS, self.FEATURES), dtype=np.float32) if observation is None \
+            else observation
+        playfield = self.world.playfield
+        self.scale = np.array((1 / playfield.width, 1 / playfield.height,
+                               1 / settings.ENV_VELOCITY_SCALE, 1 / settings.ENV_VELOCITY_SCALE), dtype=np.float32)
+        self.ticks = 0
+        self.enemies = self.__enemies_left()
+
+    def reset(self) -> np.ndarray:
+        """
+        Starts a new episode.
+        :return: first observation.
+        """
+        self.world.game_logic.restore_state(self.initial)
+        self.ticks = 0
+        self.enemies = self.__enemies_left()
+        return self.observe()
+
+    def step(self, action: int) -> tuple[np.ndarray, float, bool]:
+        """
+        Holds the keys of an action for frame_skip ticks.
+        The reward is settings.ENV_KILL_REWARD per enemy destroyed, plus the win or loss reward when the game ends.
+        Enemies count as destroyed in the step that killed them, before they are reaped at the next tick.
+        :param action: key mask.
+        :return: observation, reward and whether the episode is over.
+        """
+        game_logic = self.world.game_logic
+        keys = KEY_STATES[action]
+        for _ in range(self.frame_skip):
+            game_logic.update(keys)
+            self.ticks += 1
+            if game_logic.is_game_over():
+                break
+
+        enemies = self.__enemies_left()
+        reward = (self.enemies - enemies) * settings.ENV_KILL_REWARD
+        self.enemies = enemies
+        lost = self.world.player.destroyed
+        won = not lost and not enemies
+        if won:
+            reward += settings.ENV_WIN_REWARD
+        elif lost:
+            reward += settings.ENV_LOSS_REWARD
+        done = won or lost or self.ticks >= self.max_ticks
+        return self.observe(), reward, done
+
+    def observe(self) -> np.ndarray:
+        """
+        Writes the entity features of the current tick into the observation.
+        :return: observation.
+        """
+        observation = self.observation
+        observation[:] = 0
+        game_logic = self.world.game_logic
+        player = self.world.player
+        observation[0] = (player.KIND, *player.body.position, *player.body.velocity, not player.destroyed)
+
+        enemies = game_logic.enemies
+        enemies.sync()
+        self.__fill(1, settings.ENV_ENEMY_ROWS, enemies.kinds, enemies.positions, enemies.velocities,
+                    enemies.alive[:len(enemies)])
+
+        row = 1 + settings.ENV_ENEMY_ROWS
+        end = self.ROWS
+        projectiles = player.weapon.projectiles
+        projectiles.sync()
+        row += self.__fill(row, end - row, projectiles.kinds, projectiles.positions, projectiles.velocities,
+                           projectiles.alive[:len(projectiles)])
+        for arrays in self.__bullets():
+            row += self.__fill(row, end - row, *arrays)
+
+        observation[:, 1:5] *= self.scale
+        return observation
+
+    def __enemies_left(self) -> int:
+        """
+        Counts the enemies not destroyed yet, leaving out those killed but not reaped.
+        :return: number of enemies.
+        """
+        enemies = self.world.game_logic.enemies
+        return int(enemies.alive[:len(enemies)].sum())
+
+    def __bullets(self) -> list[tuple[np.ndarray, ...]]:
+        """
+        Lists the kinematic projectiles and enemy bullets.
+        :return: kinds, positions, velocities and present flags of every group.
+        """
+        game_logic = self.world.game_logic
+        groups = []
+        for projectiles in (game_logic.kinematic_projectiles,
+                            game_logic.enemy_fire.bullets if game_logic.enemy_fire is not None else None):
+            if projectiles is not None and len(projectiles):
+                count = len(projectiles)
+                groups.append((projectiles.kind[:count], projectiles.position[:count],
+                               projectiles.velocity[:count], np.ones(count, dtype=bool)))
+        if game_logic.enemy_fire is not None and len(game_logic.enemy_fire.projectiles):
+            projectiles = game_logic.enemy_fire.projectiles
+            projectiles.sync()
+            groups.append((projectiles.kinds, projectiles.positions, projectiles.velocities,
+                           projectiles.alive[:len(projectiles)]))
+        return groups
+
+    def __fill(self, row: int, rows: int, kinds: np.ndarray, positions: np.ndarray, velocities: np.ndarray,
+               present: np.ndarray) -> int:
+        """
+        Writes a group of entities into the observation.
+        :param row: first row to write.
+        :param rows: rows left for the group.
+        :param kinds: kinds of the entities.
+        :param positions: positions of the entities.
+        :param velocities: velocities of the entities.
+        :param present: whether each entity is still in the game.
+        :return: number of rows written.
+        """
+        count = min(len(kinds), rows)
+        if count <= 0:
+            return 0
+        end = row + count
+        observation = self.observation
+        observation[row:end, 0] = kinds[:count]
+        observation[row:end, 1:3] = positions[:count]
+        observation[row:end, 3:5] = velocities[:count]
+        observation[row:end, 5] = present[:count]
+        return count
+
+
+class EnvBuffers:
+    """
+    Environment buffers class.
+    The actions, observations, rewards and done flags of a number of games, laid out in one block of
+    shared memory. The creating process owns the block; processes attaching by name only map it.
+    """
+    def __init__(self, envs: int, name: str = None):
+        self.envs = envs
+        self.owner = name is None
+        layout = [('actions', (envs,), np.uint8),
+                  ('observations', (envs, GameEnv.ROWS, GameEnv.FEATURES), np.float32),
+                  ('rewards', (envs,), np.float32),
+                  ('dones', (envs,), np.bool_)]
+        size = sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, shape, dtype in layout)
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+        offset = 0
+        for field, shape, dtype in layout:
+            array = np.ndarray(shape, dtype, self.memory.buf, offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+        if self.owner:
+            self.actions[:] = 0
+            self.observations[:] = 0
+            self.rewards[:] = 0
+            self.dones[:] = False
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block, to attach to it from another process.
+        :return: name.
+        """
+        return self.memory.name
+
+    def close(self) -> None:
+        """
+        Unmaps the block, and frees it if this process created it.
+        :return: None
+        """
+        # Drop the views before the mapping goes away
+        self.actions = self.observations = self.rewards = self.dones = None
+        try:
+            self.memory.close()
+        except BufferError:
+            # Observations still held by the caller keep the mapping until they are gone
+            pass
+        if self.owner:
+            self.memory.unlink()
+
+
+def step_games(games: list[GameEnv], buffers: EnvBuffers, first: int) -> None:
+    """
+    Steps a range of games with their actions from the buffers, resetting every game whose episode ended.
+    :param games: games, the first of them at index first of the buffers.
+    :param buffers: environment buffers.
+    :param first: index of the first game.
+    :return: None
+    """
+    actions = buffers.actions.tolist()
+    for index, game in enumerate(games, first):
+        _, reward, done = game.step(actions[index])
+        buffers.rewards[index] = reward
+        buffers.dones[index] = done
+        if done:
+            game.reset()
+
+
+def reset_games(games: list[GameEnv], buffers: EnvBuffers, first: int) -> None:
+    """
+    Resets a range of games.
+    :param games: games, the first of them at index first of the buffers.
+    :param buffers: environment buffers.
+    :param first: index of the first game.
+    :return: None
+    """
+    for index, game in enumerate(games, first):
+        game.reset()
+        buffers.rewards[index] = 0
+        buffers.dones[index] = False
+
+
+def run_worker(connection, name: str, envs: int, first: int, last: int, seed: int, options: dict) -> None:
+    """
+    Runs the games of one worker process until told to close.
+    Module-level so worker processes can unpickle it.
+    :param connection: pipe end receiving commands and acknowledging them.
+    :param name: name of the shared environment buffers.
+    :param envs: number of games in the buffers.
+    :param first: index of the first game of the worker.
+    :param last: index after the last game of the worker.
+    :param seed: seed of the first game of the vector environment.
+    :param options: GameEnv options.
+    :return: None
+    """
+    buffers = EnvBuffers(envs, name)
+    games = [GameEnv(seed + index, observation=buffers.observations[index], **options)
+             for index in range(first, last)]
+    try:
+        while True:
+            command = connection.recv()
+            if command == VectorEnv.STEP:
+                step_games(games, buffers, first)
+            elif command == VectorEnv.RESET:
+                reset_games(games, buffers, first)
+            else:
+                break
+            connection.send(command)
+    finally:
+        del games
+        buffers.close()
+        connection.close()
+
+
+class VectorEnv:
+    """
+    Vector environment class.
+    Steps a number of games in lock-step, in this process when workers is 0, or split over worker processes.
+    step() returns views of the shared buffers, overwritten by the next step. A game whose episode ended
+    is reset right away: its done flag is set and its observation is the first of the next episode.
+    """
+    # Worker Commands
+    STEP = 'step'
+    RESET = 'reset'
+    CLOSE = 'close'
+
+    def __init__(self, envs: int, workers: int = 0, seed: int = 0, **options):
+        self.envs = envs
+        self.buffers = EnvBuffers(envs)
+        self.games = []
+        self.workers = []
+        self.connections = []
+        if not workers:
+            self.games = [GameEnv(seed + index, observation=self.buffers.observations[index], **options)
+                          for index in range(envs)]
+            return
+
+        bounds = np.linspace(0, envs, min(workers, envs) + 1).astype(int).tolist()
+        for first, last in zip(bounds, bounds[1:]):
+            connection, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=run_worker, daemon=True,
+                                             args=(child, self.buffers.name, envs, first, last, seed, options))
+            worker.start()
+            child.close()
+            self.workers.append(worker)
+            self.connections.append(connection)
+
+    def __enter__(self) -> 'VectorEnv':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def reset(self) -> np.ndarray:
+        """
+        Starts a new episode in every game.
+        :return: observations.
+        """
+        if self.games:
+            reset_games(self.games, self.buffers, 0)
+        else:
+            self.__command(self.RESET)
+        return self.buffers.observations
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Steps every game with its action.
+        :param actions: one key mask per game.
+        :return: observations, rewards and done flags.
+        """
+        self.buffers.actions[:] = actions
+        if self.games:
+            step_games(self.games, self.buffers, 0)
+        else:
+            self.__command(self.STEP)
+        return self.buffers.observations, self.buffers.rewards, self.buffers.dones
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and frees the shared buffers.
+        :return: None
+        """
+        if self.buffers is None:
+            return
+        for connection in self.connections:
+            connection.send(self.CLOSE)
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.games = []
+        self.buffers.close()
+        self.buffers = None
+
+    def __command(self, command: str) -> None:
+        """
+        Sends a command to every worker and waits until all of them carried it out.
+        :param command: worker command.
+        :return: None
+        """
+        for connection in self.connections:
+            connection.send(command)
+        for connection in self.connections:
+            connection.recv()
@@ -1,8 +1,9 @@
 """
-This module contains the Weapon class and its decorators.
+This module contains the Weapon class and its decorators, and the WeaponInventory class.
 Concrete decorators are: Gun, RocketLauncher, and LaserCannon.
 """
 from game.projectile import *
+from game.entity_store import EntityStore
 import time
 
 
@@ -14,9 +15,13 @@ class Weapon:
     BURST = 1
     BURST_COOLDOWN = .1
 
-    def __init__(self, ship):
+    # Projectile class fired by the weapon
+    PROJECTILE = Bullet
+
+    def __init__(self, ship, projectiles: EntityStore = None):
         self.ship = ship
-        self.projectiles = []
+        # Projectile registry, shared by every weapon of an inventory
+        self.projectiles = EntityStore() if projectiles is None else projectiles
 
         self.burst_count = 0
         self.time_since_last_shot = 0
@@ -31,12 +36,21 @@ class Weapon:
         if self.burst_count < self.BURST:
             self.launch_projectile(direction)
             self.burst_count += 1
-            self.time_since_last_shot = time.time()
+            self.time_since_last_shot = self.now()
         else:
-            if time.time() - self.time_since_last_shot >= self.BURST_COOLDOWN:
+            if self.now() - self.time_since_last_shot >= self.BURST_COOLDOWN:
                 self.time_since_last_shot = 0
                 self.burst_count = 0
 
+    def now(self) -> float:
+        """
+        Returns the current time, from the ship's simulation clock when it has one.
+        :return: time in seconds.
+        """
+        if self.ship.clock is None:
+            return time.time()
+        return self.ship.clock.time
+
     def launch_projectile(self, direction: tuple[int, int]) -> None:
         """
         Launches a projectile in a given direction.
@@ -45,7 +59,12 @@ class Weapon:
         """
         adjusted_position = self.ship.body.position.x + self.ship.vertices[1][0], \
                             self.ship.body.position.y + self.ship.vertices[1][1] - 25
-        self.projectiles.append(self.get_projectile_instance(adjusted_position[0], adjusted_position[1], direction))
+        kinematic = self.ship.kinematic_projectiles
+        if kinematic is not None and kinematic.handles(self):
+            kinematic.launch(self.PROJECTILE, adjusted_position[0], adjusted_position[1], direction)
+            return
+        projectile = self.get_projectile_instance(adjusted_position[0], adjusted_position[1], direction)
+        self.projectiles.add(projectile, projectile.KIND)
 
     def get_projectile_instance(self, x: int, y: int, direction: tuple[int, int]) -> None:
         """
@@ -58,6 +77,19 @@ class Weapon:
         """
         pass
 
+    def create_projectile(self, projectile_type: type, x: int, y: int, direction: tuple[int, int]) -> Projectile:
+        """
+        Creates a projectile, taking it from the ship's projectile pool when it has one.
+        :param projectile_type: concrete projectile class.
+        :param x: x coordinate.
+        :param y: y coordinate.
+        :param direction: direction to launch in.
+        :return: projectile instance.
+        """
+        if self.ship.projectile_pool is None:
+            return projectile_type(x, y, direction, enemy_fire=self.ship.ENEMY_FIRE)
+        return self.ship.projectile_pool.acquire(projectile_type, x, y, direction, self.ship.ENEMY_FIRE)
+
 
 class Gun(Weapon):
     """
@@ -66,6 +98,7 @@ class Gun(Weapon):
     # Gun Magic Numbers
     BURST = 3
     BURST_COOLDOWN = 0.5
+    PROJECTILE = Bullet
 
     def get_projectile_instance(self, x: int, y: int, direction: tuple[int, int]) -> Bullet:
         """
@@ -75,7 +108,7 @@ class Gun(Weapon):
         :param direction: direction to launch in.
         :return: Bullet instance.
         """
-        return Bullet(x, y, direction)
+        return self.create_projectile(self.PROJECTILE, x, y, direction)
 
 
 class RocketLauncher(Weapon):
@@ -85,6 +118,7 @@ class RocketLauncher(Weapon):
     # Rocket Launcher Magic Numbers
     BURST = 1
     BURST_COOLDOWN = 1
+    PROJECTILE = Rocket
 
     def get_projectile_instance(self, x: int, y: int, direction: tuple[int, int]) -> Rocket:
         """
@@ -94,7 +128,7 @@ class RocketLauncher(Weapon):
         :param direction: direction to launch in.
         :return: Rocket instance.
         """
-        return Rocket(x, y, direction)
+        return self.create_projectile(self.PROJECTILE, x, y, direction)
 
 
 class LaserCannon(Weapon):
@@ -104,6 +138,7 @@ class LaserCannon(Weapon):
     # Laser Cannon Magic Numbers
     BURST = 10
     BURST_COOLDOWN = 2
+    PROJECTILE = Laser
 
     def get_projectile_instance(self, x: int, y: int, direction: tuple[int, int]) -> Laser:
         """
@@ -113,4 +148,35 @@ class LaserCannon(Weapon):
         :param direction: direction to launch in.
         :return: Laser instance.
         """
-        return Laser(x, y, direction)
+        return self.create_projectile(self.PROJECTILE, x, y, direction)
+
+
+# Weapons by name
+WEAPONS = {'gun': Gun, 'rocket': RocketLauncher, 'laser': LaserCannon}
+
+
+class WeaponInventory:
+    """
+    Weapon inventory class.
+    Holds one weapon of each type a ship carries, created once and kept with its burst state,
+    so switching weapons is a dictionary lookup.
+    Every weapon fires into the same projectile registry, so projectiles in flight stay tracked
+    whichever weapon is equipped.
+    """
+    def __init__(self, ship, weapons: tuple[type, ...] = (), projectiles: EntityStore = None):
+        self.ship = ship
+        self.projectiles = EntityStore() if projectiles is None else projectiles
+        self.weapons = {}
+        for weapon_type in weapons:
+            self.get(weapon_type)
+
+    def get(self, weapon_type: type) -> Weapon:
+        """
+        Returns the weapon of a type, creating it the first time.
+        :param weapon_type: concrete weapon class.
+        :return: weapon instance.
+        """
+        weapon = self.weapons.get(weapon_type)
+        if weapon is None:
+            weapon = self.weapons[weapon_type] = weapon_type(self.ship, self.projectiles)
+        return weapon
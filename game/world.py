@@ -0,0 +1,120 @@
+"""
+This module contains the World class.
+A world is one self-contained game session with its own physics space,
+so several games can run in the same process without SpaceSingleton.
+"""
+import pygame
+import pymunk
+import pymunk.pygame_util
+from game.game_engine import GameObjectFactory, GameLogic, GameRenderer, Engine
+from game.player import Player
+from game.entity_store import EntityStore
+from game.enemy_fire import EnemyFireController
+from game.bullet_pattern import BulletPattern, PATTERNS
+from game.kinematic import KinematicProjectiles
+from game.weapon import WEAPONS
+from game.clock import SimulationClock
+from game.playfield import Playfield
+from game import settings
+
+
+class World:
+    """
+    World class.
+    Owns the physics space, the game object factory, the game logic and, through the factory's
+    projectile pool, everything the player's weapons fire.
+    A stress scenario, when given, spawns the enemies instead of create_enemy_army.
+    Collision filtering and the spatial hash broadphase can be turned off to measure what they save.
+    Enemies fire a bullet pattern, given by name or as a pattern object, when enemy_fire is set. Worlds hold their
+    fire by default so headless workloads stay as they were; the game passes settings.ENEMY_FIRE_PATTERN.
+    The player's weapons named in kinematic_weapons fire kinematic projectiles instead of pymunk ones.
+    The world itself has no randomness: a game is fully determined by its input, so the seed only names the
+    game for the key script driving it and for replay recordings.
+    """
+    def __init__(self, difficulty: int = settings.HARD, seed: int = 0, playfield: Playfield = None,
+                 scenario=None, collision_filtering: bool = True, spatial_hash: bool = True,
+                 enemy_fire: str | BulletPattern = None,
+                 enemy_fire_backend: str = settings.ENEMY_FIRE_BACKEND,
+                 kinematic_weapons: tuple[str, ...] = settings.KINEMATIC_WEAPONS):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.playfield = Playfield() if playfield is None else playfield
+
+        # Create physics space
+        self.space = pymunk.Space()
+        self.space.gravity = settings.GRAVITY_X, settings.GRAVITY_Y
+
+        # Create simulation clock
+        self.clock = SimulationClock()
+
+        # Kinematic projectile backend
+        kinematic = None
+        if kinematic_weapons:
+            kinematic = KinematicProjectiles(tuple(WEAPONS[name] for name in kinematic_weapons))
+
+        # Create game objects
+        self.factory = GameObjectFactory(self.space, clock=self.clock, collision_filtering=collision_filtering,
+                                         kinematic_projectiles=kinematic)
+        self.player = self.factory.create_player(Player.STARTING_X, Player.STARTING_Y)
+        if scenario is None:
+            enemies = self.factory.create_enemy_army(difficulty)
+        else:
+            enemies = scenario.spawn(self.factory)
+
+        # Replace the default bounding box tree with a spatial hash sized for ships
+        if spatial_hash:
+            cells = max(settings.SPATIAL_HASH_COUNT, settings.SPATIAL_HASH_CELLS_PER_SHAPE * len(self.space.shapes))
+            self.space.use_spatial_hash(settings.SPATIAL_HASH_DIM, cells)
+
+        # Enemy fire
+        controller = None
+        if enemy_fire is not None:
+            pattern = PATTERNS[enemy_fire]() if isinstance(enemy_fire, str) else enemy_fire
+            controller = EnemyFireController(pattern, enemy_fire_backend, self.factory.projectile_pool)
+
+        # Game director
+        self.game_logic = GameLogic(self.space, self.player, enemies, self.factory.projectile_pool, self.clock,
+                                    self.playfield, controller, kinematic)
+
+        # Create collision handler
+        Engine.register_collision_handlers(self.space)
+
+    @property
+    def enemies(self) -> EntityStore:
+        """
+        Enemies still in the game.
+        :return: entity store of the enemies.
+        """
+        return self.game_logic.enemies
+
+    def update(self, keys) -> bool:
+        """
+        Advances the world by one fixed physics tick.
+        :param keys: user input.
+        :return: True if game over, False otherwise.
+        """
+        return self.game_logic.update(keys)
+
+    def outcome(self) -> str:
+        """
+        Returns how the game ended so far.
+        :return: 'loss' if the player was destroyed, 'win' if no enemies are left, 'running' otherwise.
+        """
+        if self.player.destroyed:
+            return 'loss'
+        if not self.game_logic.enemies:
+            return 'win'
+        return 'running'
+
+    def create_renderer(self, screen: pygame.Surface, debug: bool = False, dirty_rects: bool = False) -> GameRenderer:
+        """
+        Creates a renderer drawing this world on a screen.
+        :param screen: screen to draw on.
+        :param debug: whether to draw physics debug information.
+        :param dirty_rects: whether to use dirty-rect updates.
+        :return: renderer object.
+        """
+        draw_options = pymunk.pygame_util.DrawOptions(screen)
+        return GameRenderer(screen, self.space, draw_options, debug=debug, dirty_rects=dirty_rects,
+                            enemy_fire=self.game_logic.enemy_fire,
+                            kinematic_projectiles=self.game_logic.kinematic_projectiles)
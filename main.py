@@ -2,63 +2,189 @@
 Galaga game
 """
 
-import pymunk.pygame_util
-from game.game_engine import *
-from game.singleton import SpaceSingleton
+import argparse
+import asyncio
+import time
+import pygame
+from game.world import World
+from game.clock import FixedTimestep
+from game.headless import HeadlessRunner
+from game.replay import Recording
+from game.profiler import FrameProfiler
+from game.assets import AssetManager
+from game.game_engine import GameRenderer
+from game.sprite_cache import SpriteCache
+from game.atlas import TextureAtlas
+from game.network import Message, GameServer, GameClient
+from game.governor import FrameGovernor
+from game.recorder import FrameRecorder
 from game import settings
+from benchmark import print_row
 
 
+# Parse command line
+parser = argparse.ArgumentParser(description='Galaga game')
+parser.add_argument('--difficulty', type=int, default=settings.HARD, help='number of files in the enemy army')
+parser.add_argument('--seed', type=int, default=0, help='seed of the game')
+parser.add_argument('--record', metavar='PATH', help='record the input of this session to a file')
+parser.add_argument('--replay', metavar='PATH', help='replay a recorded session')
+parser.add_argument('--headless', action='store_true', help='replay without a window, as fast as possible')
+parser.add_argument('--profile', action='store_true', help='time every frame phase and show them on screen (F3)')
+parser.add_argument('--profile-out', metavar='PATH', help='export the frame profile to a .json or .csv file at exit')
+parser.add_argument('--serve', action='store_true', help='run a headless game server for network players')
+parser.add_argument('--connect', metavar='HOST', help='join a game server')
+parser.add_argument('--spectate', action='store_true', help='watch instead of flying the ship when joining')
+parser.add_argument('--port', type=int, default=settings.NET_PORT, help='game server port')
+parser.add_argument('--video', metavar='DIR', help='record the rendered frames of this session to a directory')
+parser.add_argument('--video-format', choices=FrameRecorder.FORMATS, default=settings.RECORDER_FORMAT,
+                    help='PNG sequence or raw RGB stream, both with an index')
+parser.add_argument('--video-factor', type=int, default=settings.RECORDER_FACTOR,
+                    help='record every n-th pixel of every n-th row, 1 for full resolution')
+parser.add_argument('--no-governor', action='store_true', help='render every frame even when over the frame budget')
+args = parser.parse_args()
+if args.headless and not args.replay:
+    parser.error('--headless needs --replay')
+if args.spectate and not args.connect:
+    parser.error('--spectate needs --connect')
+recording = Recording.load(args.replay) if args.replay else None
+
+# Replay headless and report
+if args.headless:
+    runner = HeadlessRunner(recording.difficulty, seed=recording.seed)
+    results = runner.run(len(recording), recording)
+    print(f"Replayed {results['ticks']} ticks at {results['ticks_per_second']:.0f} ticks/s, "
+          f"p50 {results['latency_p50_ms']:.3f} ms, p99 {results['latency_p99_ms']:.3f} ms")
+    differences = recording.divergence(runner.world)
+    print('\n'.join(differences) if differences else 'Replay matches the recording')
+    raise SystemExit(1 if differences else 0)
+
+# Serve the game to network players
+if args.serve:
+    print(f'Serving on {settings.NET_HOST}:{args.port}')
+    try:
+        asyncio.run(GameServer(args.difficulty, args.seed).run(settings.NET_HOST, args.port))
+    except KeyboardInterrupt:
+        pass
+    raise SystemExit(0)
+
 # Initialize pygame
 pygame.init()
 clock = pygame.time.Clock()
 
-# Create physics space
-space = SpaceSingleton()
-space.gravity = settings.GRAVITY_X, settings.GRAVITY_Y
+# Load the images the texture atlas does not cover in the background while the game starts
+AssetManager().preload([GameRenderer.GAME_OVER_IMAGE])
 
-# Create game objects
-game_object_factory = GameObjectFactory(space)
-player = game_object_factory.create_player(Player.STARTING_X, Player.STARTING_Y)
-enemies = game_object_factory.create_enemy_army(settings.HARD)
+# Play or watch a game served over the network
+if args.connect:
+    screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
+    client = GameClient(Message.SPECTATOR if args.spectate else Message.PLAYER)
+    asyncio.run(client.play(screen, args.connect, args.port))
+    pygame.quit()
+    raise SystemExit(0)
+
+# Create game world
+if recording:
+    world = recording.create_world()
+else:
+    world = World(args.difficulty, args.seed, enemy_fire=settings.ENEMY_FIRE_PATTERN)
+    if args.record:
+        recording = Recording(args.seed, args.difficulty, world.clock.timestep)
+timestep = FixedTimestep()
 
 # Create screen
 screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
 
-# Draw options
-draw_options = pymunk.pygame_util.DrawOptions(screen)
+# Map the prescaled sprites from the atlas cache, building it if the assets changed
+SpriteCache().install(TextureAtlas.cached(GameRenderer.SPRITES, GameRenderer.ANIMATIONS))
+
+# Game director
+game_renderer = world.create_renderer(screen, debug=False, dirty_rects=settings.DIRTY_RECT_RENDERING)
 
-# Game directors
-game_logic = GameLogic(space, player, enemies)
-game_renderer = GameRenderer(screen, space, draw_options, debug=False)
+# Frame budget governor
+governor = None
+if settings.FRAME_GOVERNOR and not args.no_governor:
+    governor = FrameGovernor(game_renderer)
 
-# Create collision handler
-player_collision_handler = space.add_collision_handler(settings.PLAYER_COLLISION_TYPE, settings.ENEMY_COLLISION_TYPE)
-enemies_collision_handler = space.add_collision_handler(settings.ENEMY_COLLISION_TYPE, settings.PROJECTILE_COLLISION_TYPE)
-player_collision_handler.begin = Engine.on_collision_player
-enemies_collision_handler.begin = Engine.on_collision_enemy
+# Video recorder
+recorder = None
+if args.video:
+    recorder = FrameRecorder(args.video, screen.get_size(), args.video_format, factor=args.video_factor)
+
+# Frame profiler
+profiler = FrameProfiler()
+if args.profile or args.profile_out:
+    world.game_logic.profiler = game_renderer.profiler = profiler
 
 # Game loop
 running = True
 game_over = False
+frame_time = settings.PHYSICS_TIMESTEP
+tick = 0
 while running:
+    frame_start = time.perf_counter()
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            # Toggle the frame profiler
+            attached = None if game_renderer.profiler else profiler
+            world.game_logic.profiler = game_renderer.profiler = attached
+            game_renderer.full_redraw = True
 
     # Handle user input
     keys = pygame.key.get_pressed()
 
-    # Update game state
-    game_over = game_logic.update(keys)
+    # Update game state with as many fixed ticks as the last frame took, until the game is over
+    for step in range(timestep.add(frame_time)):
+        game_over = world.game_logic.is_game_over()
+        if game_over or (args.replay and tick == len(recording)):
+            # Nothing is recorded after the game is over, so a replay ends there too
+            running = running and not args.replay
+            break
+        if args.replay:
+            keys = recording.keys(tick)
+        elif args.record:
+            recording.record(keys)
+        world.update(keys)
+        tick += 1
 
     # Render game
     if game_over:
         game_renderer.render_game_over()
     else:
-        game_renderer.render(player, enemies)
+        if governor is not None:
+            rendered = governor.render(world.player, world.enemies, timestep.alpha, frame_start)
+        else:
+            game_renderer.render(world.player, world.enemies, timestep.alpha)
+            rendered = True
+        if recorder is not None and rendered:
+            recorder.capture(screen, world.clock.ticks)
 
     # Clock
-    clock.tick(settings.FRAMES_PER_SECOND)
+    frame_time = clock.tick(settings.FRAMES_PER_SECOND) / 1000
+
+# Save or check the recording
+if args.replay:
+    differences = recording.divergence(world)
+    print('\n'.join(differences) if differences else 'Replay matches the recording')
+elif args.record:
+    recording.finish(world)
+    recording.save(args.record)
+
+# Export the frame profile
+if args.profile_out:
+    profiler.export(args.profile_out)
+
+# Finish the video
+if recorder is not None:
+    recorder.close()
+    print_row(recorder.stats())
+
+# Give back the quality the governor took away, and report how often it stepped in
+if governor is not None:
+    governor.close()
+    if args.profile or args.profile_out:
+        print_row(governor.stats())
 
 # Clean up
 pygame.quit()